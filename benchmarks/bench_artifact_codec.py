@@ -0,0 +1,92 @@
+"""
+중간 산출물 코덱 벤치마크 (형식별 저장/읽기 시간 + 디스크 크기)
+
+- 이전 방식: save_json (indent=2, 순수 파이썬 인코더) / read_json
+- save_artifact: json / msgpack × none / gzip / zstd (설치된 패키지만)
+- 모든 형식이 원본 dict를 그대로 복원하는지, 헤더 없는 기존 JSON 파일도 read_artifact로 읽히는지 확인
+
+실행: python -m benchmarks.bench_artifact_codec
+"""
+
+import gc
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_merge import make_chunk
+from src.utils import io_utils
+from src.utils.io_utils import artifact_format, read_artifact, read_json, save_artifact, save_json
+
+
+def make_document(num_pages: int, seed: int = 0) -> dict:
+    """bench_merge 청크에 실제 OCR처럼 토큰마다 다른 좌표/신뢰도를 넣은 문서 (압축률이 과장되지 않도록)"""
+    rng = random.Random(seed)
+    doc = make_chunk(0, num_pages)
+    for page in doc["pages"]:
+        for token in page["tokens"]:
+            x, y = rng.random(), rng.random()
+            token["layout"] = {
+                "textAnchor": {"textSegments": [{"startIndex": str(rng.randrange(len(doc["text"]))),
+                                                 "endIndex": str(rng.randrange(len(doc["text"])))}]},
+                "confidence": rng.random(),
+                "boundingPoly": {"normalizedVertices": [
+                    {"x": x, "y": y}, {"x": x + 0.05, "y": y}, {"x": x + 0.05, "y": y + 0.02}, {"x": x, "y": y + 0.02},
+                ]},
+            }
+    return doc
+
+
+def _best_of(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        # 이전 반복에서 만든 트리를 정리해 GC 시점에 따른 편차를 줄임
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _variants():
+    formats = ["json"] + (["msgpack"] if io_utils.msgpack is not None else [])
+    compressions = ["none", "gzip"] + (["zstd"] if io_utils.zstandard is not None else [])
+    return [(fmt, compression) for fmt in formats for compression in compressions]
+
+
+def main(num_pages: int = 60, repeat: int = 5):
+    # 청크 결과 6개를 이어 붙인 크기의 문서 (토큰 트리 포함)
+    doc = make_document(num_pages)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.json")
+        save_time, _ = _best_of(lambda: save_json(doc, legacy_path), repeat)
+        load_time, loaded = _best_of(lambda: read_json(legacy_path), repeat)
+        assert loaded == doc
+        assert read_artifact(legacy_path) == doc, "기존 JSON 파일 자동 판별 실패"
+        rows.append(("json (indent=2, 이전)", save_time, load_time, os.path.getsize(legacy_path)))
+
+        for fmt, compression in _variants():
+            path = os.path.join(tmp, f"{fmt}_{compression}.bin")
+            save_time, size = _best_of(lambda: save_artifact(doc, path, fmt, compression), repeat)
+            load_time, loaded = _best_of(lambda: read_artifact(path), repeat)
+            assert loaded == doc, f"{fmt}/{compression} 복원 불일치"
+            assert artifact_format(path) == {"format": fmt, "compression": compression}
+            rows.append((f"{fmt} + {compression}", save_time, load_time, size))
+
+    base_save, base_load, base_size = rows[0][1:]
+    print("\n" + "=" * 80)
+    print(f"📊 산출물 코덱 비교 ({num_pages}페이지 OCR 결과, 최선 {repeat}회)")
+    print("=" * 80)
+    print(f"  ✅ 모든 형식 왕복 복원 + 기존 JSON 자동 판별 확인")
+    print(f"  {'형식':<22}{'저장':>10}{'읽기':>10}{'크기':>12}{'저장 배율':>10}{'읽기 배율':>10}{'크기 비율':>10}")
+    for name, save_time, load_time, size in rows:
+        print(
+            f"  {name:<22}{save_time * 1000:8.1f}ms{load_time * 1000:8.1f}ms{size / 1024 ** 2:10.2f}MB"
+            f"{base_save / save_time:9.1f}x{base_load / load_time:9.1f}x{size / base_size:9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+청크 OCR 병렬 처리 벤치마크 (가짜 클라이언트 사용)
+
+실행: python -m benchmarks.bench_chunk_concurrency
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.fake_docai import FakeDocumentProcessorServiceClient, make_blank_pdf
+from src.docs_analysis.document_ai.processor import process_pdf_ocr_in_chunks
+
+
+def main(num_pages: int = 150, pages_per_chunk: int = 15, latency: float = 0.5, failure_rate: float = 0.2):
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_blank_pdf(os.path.join(tmp, "deck.pdf"), num_pages)
+
+        rows = []
+        for workers in (1, 2, 4, 8):
+            client = FakeDocumentProcessorServiceClient(latency=latency, failure_rate=failure_rate, seed=workers)
+            started = time.perf_counter()
+            results = process_pdf_ocr_in_chunks(
+                file_path=pdf_path,
+                output_dir=os.path.join(tmp, f"chunks_{workers}"),
+                pages_per_chunk=pages_per_chunk,
+                max_workers=workers,
+                max_retries=5,
+                client=client,
+                dedup_pages=False,  # 빈 페이지는 모두 같은 페이지로 묶이므로 끔
+                use_cache=False,  # 앞 실행의 캐시로 API 호출이 생략되면 동시성을 잴 수 없음
+            )
+            elapsed = time.perf_counter() - started
+
+            order = [r["chunk_info"]["chunk_index"] for r in results]
+            assert order == sorted(order), "청크 순서가 뒤바뀜"
+            rows.append((workers, elapsed, client.calls, client.failures, client.max_in_flight))
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 / {pages_per_chunk}페이지 청크 / 요청 지연 {latency}s / 실패율 {failure_rate:.0%}")
+    print("=" * 80)
+    print(f"{'workers':>8} {'time(s)':>9} {'calls':>6} {'fails':>6} {'max in-flight':>14}")
+    for workers, elapsed, calls, fails, peak in rows:
+        print(f"{workers:>8} {elapsed:>9.2f} {calls:>6} {fails:>6} {peak:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Document AI 클라이언트 재사용 벤치마크 (로컬 대역 사용)
+
+- before: 호출마다 클라이언트 생성 (채널/인증/TLS 준비 비용을 setup_cost로 흉내냄)
+- after : ClientRegistry에서 공유 클라이언트를 꺼내 사용 (여러 스레드 동시 호출)
+
+실행: python -m benchmarks.bench_docai_client
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_docai import FakeDocumentProcessorServiceClient, make_blank_pdf
+from src.docs_analysis.document_ai.clients import ClientRegistry
+from src.docs_analysis.document_ai.processor import process_document
+
+
+def _run(pdf_path: str, out_dir: str, calls: int, workers: int, client_for_call) -> float:
+    def _one(i: int):
+        process_document(
+            file_path=pdf_path,
+            processor_type="OCR",
+            output_path=os.path.join(out_dir, f"out_{i}.json"),
+            enable_enhancement=False,
+            client=client_for_call(),
+            use_cache=False,
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_one, range(calls)))
+    return (time.perf_counter() - started) / calls * workers
+
+
+def main(calls: int = 40, workers: int = 4, setup_cost: float = 0.15, latency: float = 0.05):
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_blank_pdf(os.path.join(tmp, "deck.pdf"), 3)
+
+        before = _run(
+            pdf_path, tmp, calls, workers,
+            lambda: FakeDocumentProcessorServiceClient(latency=latency, setup_cost=setup_cost),
+        )
+
+        created = []
+
+        def _client_factory(endpoint, channel):
+            client = FakeDocumentProcessorServiceClient(latency=latency, setup_cost=setup_cost)
+            created.append(client)
+            return client
+
+        registry = ClientRegistry(channel_factory=lambda endpoint: object(), client_factory=_client_factory)
+        after = _run(pdf_path, tmp, calls, workers, lambda: registry.get("OCR"))
+
+    print("\n" + "=" * 80)
+    print(f"📊 호출 {calls}회 / 스레드 {workers}개 / 요청 지연 {latency * 1000:.0f}ms / 클라이언트 준비 {setup_cost * 1000:.0f}ms")
+    print("=" * 80)
+    print(f"  before (호출마다 생성): 호출당 {before * 1000:7.1f} ms")
+    print(f"  after  (공유 레지스트리): 호출당 {after * 1000:7.1f} ms  (생성된 클라이언트 {len(created)}개)")
+    print(f"  호출당 오버헤드 감소: {(before - after) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+LayoutLMv3 CPU 백엔드 벤치마크 (eager fp32 / int8 동적 양자화 / torch.compile)
+
+짧은 슬라이드와 긴 페이지가 섞인 덱을 백엔드마다 run_batched_inference로 추론해
+- pages/s (웜업 이후; compile은 첫 실행의 컴파일 시간을 따로 표시)
+- eager fp32 대비 라벨 일치율 (단어 단위 예측이 같은 비율)
+을 비교해 정확도를 유지하면서 가장 빠른 백엔드를 고를 수 있게 한다 (무작위 초기화 LayoutLMv3).
+
+실행: python -m benchmarks.bench_layoutlm_backends [small|base]
+"""
+
+import copy
+import random
+import sys
+import time
+
+from benchmarks.layoutlm_fixtures import make_model, make_pages, make_processor
+from src.docs_analysis.layoutlm.backends import BACKENDS, apply_backend
+from src.docs_analysis.layoutlm.inference import run_batched_inference
+from src.docs_analysis.layoutlm.preprocess import encode_pages, get_labels
+
+
+def _word_labels(page_results):
+    """페이지별 {단어 인덱스: 라벨} (단어 첫 토큰 기준)"""
+    pages = []
+    for results in page_results:
+        labels = {}
+        for result in results:
+            labels.setdefault(result["word_index"], result["label"])
+        pages.append(labels)
+    return pages
+
+
+def _agreement(reference, current, word_counts):
+    """모든 단어 중 두 백엔드의 라벨이 같은 비율 ("O"로 빠진 단어 포함)"""
+    same = sum(
+        ref.get(word, "O") == cur.get(word, "O")
+        for ref, cur, count in zip(reference, current, word_counts)
+        for word in range(count)
+    )
+    return same / max(sum(word_counts), 1)
+
+
+def main(size: str = "small", batch_size: int = 8, num_pages: int = 24, repeat: int = 2):
+    rng = random.Random(0)
+    word_counts = [rng.randrange(10, 120) if rng.random() < 0.8 else rng.randrange(250, 700) for _ in range(num_pages)]
+
+    processor = make_processor()
+    labels = get_labels("ir_deck")
+    base_model = make_model(len(labels), len(processor.tokenizer), size)
+    images, page_tokens, page_boxes, _ = make_pages(word_counts)
+    encoding = encode_pages(processor, images, page_tokens, page_boxes)
+
+    rows = []
+    reference = None
+    for backend in BACKENDS:
+        started = time.perf_counter()
+        model = apply_backend(copy.deepcopy(base_model), backend)
+        # 웜업 (compile은 여기서 컴파일)
+        run_batched_inference(encoding, labels, batch_size=batch_size, model=model)
+        warmup = time.perf_counter() - started
+
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            page_results, _ = run_batched_inference(encoding, labels, batch_size=batch_size, model=model)
+            best = min(best, time.perf_counter() - started)
+
+        current = _word_labels(page_results)
+        if reference is None:
+            reference = current
+        rows.append((backend, warmup, best, _agreement(reference, current, word_counts)))
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 덱 (윈도우 {encoding['input_ids'].shape[0]}개) / 모델 {size}, 배치 {batch_size}, "
+          f"최선 {repeat}회")
+    print("=" * 80)
+    print(f"  {'backend':<9}{'warmup(s)':>10}{'time(s)':>9}{'pages/s':>9}{'speedup':>9}{'labels=fp32':>13}")
+    for backend, warmup, elapsed, agreement in rows:
+        print(f"  {backend:<9}{warmup:>10.1f}{elapsed:>9.2f}{num_pages / elapsed:>9.2f}"
+              f"{rows[0][2] / elapsed:>8.2f}x{agreement:>13.1%}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,92 @@
+"""
+동적 패딩 + 길이 버킷 배치 벤치마크
+
+대부분 짧은 슬라이드이고 일부만 긴 표/공고문 페이지인 덱을
+- fixed    : 이전처럼 모든 배치를 max_length(512)까지 패딩한 채 페이지 순서대로 추론
+- dynamic  : 페이지 순서대로 묶되 배치마다 가장 긴 윈도우 길이까지만 잘라 추론
+- bucketed : 길이 버킷 순으로 묶고 동적 패딩 (run_batched_inference 기본값)
+으로 추론해 처리량과 fixed 대비 라벨 일치율을 비교한다 (무작위 초기화 LayoutLMv3).
+
+실행: python -m benchmarks.bench_layoutlm_batching [small|base]
+"""
+
+import random
+import sys
+import time
+
+import torch
+
+from benchmarks.layoutlm_fixtures import make_model, make_pages, make_processor
+from src.docs_analysis.layoutlm.inference import (
+    MODEL_INPUT_KEYS, predict_labels, reconcile_windows, run_batched_inference
+)
+from src.docs_analysis.layoutlm.preprocess import encode_pages, get_labels
+
+
+def run_fixed(model, encoding, labels, batch_size):
+    """이전 run_batched_inference (max_length 패딩 그대로, 페이지 순서)"""
+    tensors = {k: encoding[k] for k in MODEL_INPUT_KEYS}
+    num_windows = tensors["input_ids"].shape[0]
+    predictions = torch.cat([
+        predict_labels(model, {k: v[start:start + batch_size] for k, v in tensors.items()})
+        for start in range(0, num_windows, batch_size)
+    ])
+    num_pages = int(encoding["window_page"].max()) + 1
+    return reconcile_windows(
+        tensors["input_ids"], predictions, encoding["word_ids"], encoding["window_page"], num_pages, labels
+    )
+
+
+def _labels(page_results):
+    return [[(r["word_index"], r["position"], r["label"]) for r in results] for results in page_results]
+
+
+def main(size: str = "small", batch_size: int = 8, num_pages: int = 40):
+    rng = random.Random(0)
+    # 짧은 슬라이드 85% + 중간 길이 10% + 512토큰을 넘는 페이지 5%
+    word_counts = []
+    for _ in range(num_pages):
+        roll = rng.random()
+        if roll < 0.85:
+            word_counts.append(rng.randrange(8, 90))
+        elif roll < 0.95:
+            word_counts.append(rng.randrange(150, 300))
+        else:
+            word_counts.append(rng.randrange(400, 700))
+
+    processor = make_processor()
+    labels = get_labels("ir_deck")
+    model = make_model(len(labels), len(processor.tokenizer), size)
+    images, page_tokens, page_boxes, _ = make_pages(word_counts)
+    encoding = encode_pages(processor, images, page_tokens, page_boxes)
+    lengths = encoding["attention_mask"].sum(dim=1)
+
+    # 워밍업
+    run_fixed(model, {k: v[:batch_size] for k, v in encoding.items()}, labels, batch_size)
+
+    rows = []
+    started = time.perf_counter()
+    reference = _labels(run_fixed(model, encoding, labels, batch_size))
+    rows.append(("fixed", time.perf_counter() - started, 1.0))
+
+    for name, bucketing in (("dynamic", False), ("bucketed", True)):
+        started = time.perf_counter()
+        page_results, _ = run_batched_inference(encoding, labels, batch_size=batch_size, model=model,
+                                                bucketing=bucketing)
+        elapsed = time.perf_counter() - started
+        current = _labels(page_results)
+        same = sum(a == b for ref, cur in zip(reference, current) for a, b in zip(ref, cur))
+        total = max(sum(len(ref) for ref in reference), 1)
+        rows.append((name, elapsed, same / total))
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 덱 (윈도우 {len(lengths)}개, 토큰 길이 중앙값 {int(lengths.median())} / "
+          f"최대 {int(lengths.max())}) / 모델 {size}, 배치 {batch_size}")
+    print("=" * 80)
+    print(f"  {'mode':<10}{'time(s)':>9}{'pages/s':>9}{'speedup':>9}{'labels=fixed':>14}")
+    for name, elapsed, agreement in rows:
+        print(f"  {name:<10}{elapsed:>9.2f}{num_pages / elapsed:>9.2f}{rows[0][1] / elapsed:>8.1f}x{agreement:>14.1%}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
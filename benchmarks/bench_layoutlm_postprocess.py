@@ -0,0 +1,129 @@
+"""
+LayoutLM 추론 후처리 마이크로벤치마크 (decode_predictions / aggregate_page_entities)
+
+100페이지 × 512토큰 예측 결과를
+- 이전 방식: (batch, seq) 위치마다 .item() + tokenizer.decode([id]), 결과를 한 줄씩 순회하며 BIO 묶기
+- 현재 방식: 마스크/gather 텐서 연산 + 고유 id batch_decode, 전체 페이지 라벨 배열로 엔티티 구간 계산
+으로 처리해 결과가 완전히 같은지 확인하고 시간을 비교한다.
+
+실행: python -m benchmarks.bench_layoutlm_postprocess
+"""
+
+import time
+
+import torch
+
+from benchmarks.layoutlm_fixtures import make_processor
+from src.docs_analysis.layoutlm.inference import aggregate_entities, aggregate_page_entities, decode_predictions
+from src.docs_analysis.layoutlm.preprocess import get_labels
+
+
+def legacy_decode_predictions(inputs, predictions, label_list, tokenizer=None):
+    """이전 run_inference 후처리 (위치마다 파이썬 루프)"""
+    attention_mask = inputs.get("attention_mask", torch.ones_like(inputs["input_ids"]))
+    input_ids = inputs["input_ids"]
+    batch_size, seq_len = input_ids.shape
+    batch_results = []
+    for batch_idx in range(batch_size):
+        doc_results = []
+        for seq_idx in range(seq_len):
+            if attention_mask[batch_idx, seq_idx] == 0:
+                continue
+            token_id = input_ids[batch_idx, seq_idx].item()
+            pred_idx = predictions[batch_idx, seq_idx].item()
+            if pred_idx >= len(label_list):
+                continue
+            label = label_list[pred_idx]
+            if label != "O":
+                result = {"token_id": token_id, "label": label, "position": seq_idx}
+                if tokenizer is not None:
+                    result["token_text"] = tokenizer.decode([token_id])
+                doc_results.append(result)
+        batch_results.append(doc_results)
+    return batch_results
+
+
+def legacy_aggregate_entities(results, tokenizer=None):
+    """이전 aggregate_entities (결과를 한 줄씩 순회)"""
+    entities = []
+    current_entity = None
+    for result in results:
+        label = result["label"]
+        if label.startswith("B-"):
+            if current_entity is not None:
+                entities.append(current_entity)
+            current_entity = {
+                "entity_type": label[2:],
+                "tokens": [result["token_text"]] if "token_text" in result else [],
+                "token_ids": [result["token_id"]],
+                "start_position": result["position"],
+            }
+        elif label.startswith("I-") and current_entity is not None:
+            if current_entity["entity_type"] == label[2:]:
+                if "token_text" in result:
+                    current_entity["tokens"].append(result["token_text"])
+                current_entity["token_ids"].append(result["token_id"])
+    if current_entity is not None:
+        entities.append(current_entity)
+    for entity in entities:
+        if tokenizer and entity["tokens"]:
+            entity["text"] = tokenizer.convert_tokens_to_string(entity["tokens"])
+        else:
+            entity["text"] = " ".join(entity["tokens"])
+    return entities
+
+
+def make_predictions(num_pages: int, seq_len: int, vocab_size: int, num_labels: int, entity_ratio: float, seed: int = 0):
+    """페이지마다 길이가 다른(뒤쪽 패딩) 입력과, entity_ratio 비율로 "O"가 아닌 예측 (범위 밖 인덱스 일부 포함)"""
+    g = torch.Generator().manual_seed(seed)
+    input_ids = torch.randint(5, vocab_size, (num_pages, seq_len), generator=g)
+    lengths = torch.randint(seq_len // 8, seq_len + 1, (num_pages,), generator=g)
+    attention_mask = (torch.arange(seq_len)[None, :] < lengths[:, None]).long()
+    predictions = torch.randint(1, num_labels + 2, (num_pages, seq_len), generator=g)
+    predictions[torch.rand(num_pages, seq_len, generator=g) > entity_ratio] = 0
+    return {"input_ids": input_ids, "attention_mask": attention_mask}, predictions
+
+
+def _best_of(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(num_pages: int = 100, seq_len: int = 512, entity_ratio: float = 0.3, repeat: int = 3):
+    tokenizer = make_processor().tokenizer
+    labels = get_labels("ir_deck")
+    inputs, predictions = make_predictions(num_pages, seq_len, len(tokenizer), len(labels), entity_ratio)
+
+    legacy_time, legacy_results = _best_of(lambda: legacy_decode_predictions(inputs, predictions, labels, tokenizer), repeat)
+    new_time, new_results = _best_of(lambda: decode_predictions(inputs, predictions, labels, tokenizer), repeat)
+    assert new_results == legacy_results, "decode_predictions 결과 불일치"
+
+    legacy_agg_time, legacy_entities = _best_of(
+        lambda: [legacy_aggregate_entities(r, tokenizer) for r in legacy_results], repeat)
+    new_agg_time, new_entities = _best_of(lambda: aggregate_page_entities(new_results, tokenizer), repeat)
+    assert new_entities == legacy_entities, "aggregate_page_entities 결과 불일치"
+    assert [aggregate_entities(r, tokenizer) for r in new_results] == legacy_entities, "aggregate_entities 결과 불일치"
+
+    # 토크나이저 없이 (token_text 없음)
+    plain = decode_predictions(inputs, predictions, labels)
+    assert plain == legacy_decode_predictions(inputs, predictions, labels)
+    assert [aggregate_entities(r) for r in plain] == [legacy_aggregate_entities(r) for r in plain]
+
+    num_tokens = sum(len(r) for r in new_results)
+    num_entities = sum(len(e) for e in new_entities)
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 × {seq_len}토큰 후처리 (엔티티 토큰 {num_tokens}개 → 엔티티 {num_entities}개, 최선 {repeat}회)")
+    print("=" * 80)
+    print(f"  ✅ 이전 구현과 결과 동일 (토크나이저 유/무)")
+    print(f"  {'단계':<22}{'이전':>10}{'현재':>10}{'배율':>8}")
+    print(f"  {'decode_predictions':<22}{legacy_time * 1000:8.1f}ms{new_time * 1000:8.1f}ms{legacy_time / new_time:7.1f}x")
+    print(f"  {'aggregate(페이지 일괄)':<22}{legacy_agg_time * 1000:8.1f}ms{new_agg_time * 1000:8.1f}ms"
+          f"{legacy_agg_time / new_agg_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+LayoutLM 페이지 래스터화 벤치마크 (poppler 필요)
+
+슬라이드 크기 100페이지 PDF를
+- legacy   : 이전처럼 convert_from_path(pdf) 기본 200 DPI로 전체 페이지를 한꺼번에 렌더링 후 이미지 프로세서로 축소
+- streaming: raster.iter_page_pixels로 모델 입력 크기에 맞춰 묶음 단위 렌더링 후 바로 정규화
+- cached   : 페이지 캐시를 한 번 채운 뒤 다시 실행 (렌더링/정규화 없이 메모리 맵으로 로드)
+으로 처리해 시간, 페이지당 처리 시간, 최대 메모리(RSS), pixel_values 차이를 비교한다.
+모드마다 새 프로세스에서 실행해 최대 RSS가 서로 섞이지 않게 한다.
+
+실행: python -m benchmarks.bench_layoutlm_raster [페이지 수]
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def make_pdf(path: str, num_pages: int):
+    """16:9 슬라이드(10in × 5.625in, 72 DPI 기준 720×405pt) PDF 생성"""
+    from PIL import Image, ImageDraw
+
+    pages = []
+    for idx in range(num_pages):
+        page = Image.new("RGB", (1000, 562), "white")
+        draw = ImageDraw.Draw(page)
+        draw.rectangle([40, 40, 960, 110], fill=(30, 60, 120))
+        for row in range(12):
+            draw.text((60, 140 + row * 32), f"page {idx + 1} line {row + 1} revenue growth market team", fill="black")
+        pages.append(page)
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=100.0)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(mode: str, pdf_path: str, num_pages: int, cache_dir: str):
+    from transformers import LayoutLMv3ImageProcessor
+
+    from src.docs_analysis.layoutlm.page_cache import PageCache
+    from src.docs_analysis.layoutlm.raster import iter_page_pixels
+
+    image_processor = LayoutLMv3ImageProcessor(apply_ocr=False)
+    cache = None
+    if mode == "cached":
+        cache = PageCache(cache_dir, max_bytes=1024 ** 3)
+        for _ in iter_page_pixels(pdf_path, num_pages, image_processor, cache=cache):
+            pass
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    page_ms = []
+
+    if mode == "legacy":
+        from pdf2image import convert_from_path
+
+        images = convert_from_path(pdf_path)
+        page_ms = [(time.perf_counter() - started) * 1000 / len(images)] * len(images)
+        pixel_values = image_processor(images, return_tensors="np")["pixel_values"]
+    else:
+        chunks = []
+        for _, pixels, timings in iter_page_pixels(pdf_path, num_pages, image_processor, cache=cache):
+            chunks.append(pixels.numpy())
+            page_ms.extend(timings)
+        pixel_values = np.concatenate(chunks)
+
+    elapsed = time.perf_counter() - started
+    return elapsed, float(np.mean(page_ms)), _peak_rss_mb() - baseline, pixel_values
+
+
+def main(num_pages: int = 100):
+    ctx = multiprocessing.get_context("spawn")
+    rows = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "deck.pdf")
+        make_pdf(pdf_path, num_pages)
+        for mode in ("legacy", "streaming", "cached"):
+            with ctx.Pool(1) as pool:
+                rows[mode] = pool.apply(_run, (mode, pdf_path, num_pages, os.path.join(tmp, "cache")))
+
+    diff = np.abs(rows["legacy"][3] - rows["streaming"][3])
+    assert np.array_equal(rows["streaming"][3], rows["cached"][3]), "캐시 pixel_values 불일치"
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 슬라이드 PDF → LayoutLMv3 pixel_values (코어 {os.cpu_count()}개)")
+    print("=" * 80)
+    print(f"  {'mode':<11}{'time(s)':>9}{'ms/page':>9}{'peak RSS(MB)':>14}")
+    for mode, (elapsed, ms_per_page, rss_mb, _) in rows.items():
+        print(f"  {mode:<11}{elapsed:>9.2f}{ms_per_page:>9.1f}{rss_mb:>14.1f}")
+    print(f"  pixel_values 차이 (legacy vs streaming, 정규화 값): 평균 {diff.mean():.4f}, 최대 {diff.max():.4f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
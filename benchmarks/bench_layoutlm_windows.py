@@ -0,0 +1,78 @@
+"""
+슬라이딩 윈도우 인코딩 벤치마크 (긴 페이지 엔티티 재현율 + 처리량)
+
+짧은 슬라이드 사이에 512토큰을 넘는 공고문/표 페이지가 섞인 덱을
+- truncate: 이전처럼 max_length에서 잘라냄
+- windows : stride 토큰씩 겹치는 윈도우로 나눠 전부 인코딩, 단어별 라벨로 합침
+으로 인코딩해 비교한다.
+
+- 재현율: 오라클 모델(ENTITY_WORD 토큰만 엔티티로 예측)로 엔티티 단어 중 라벨을 받은 비율
+- 처리량: 무작위 초기화 LayoutLMv3로 추론 시간 (윈도우는 모든 페이지에서 모아 같은 배치로 실행)
+
+실행: python -m benchmarks.bench_layoutlm_windows [small|base]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.layoutlm_fixtures import OracleModel, make_model, make_pages, make_processor
+from src.docs_analysis.layoutlm.inference import aggregate_entities, run_batched_inference
+from src.docs_analysis.layoutlm.preprocess import encode_pages, get_labels
+
+
+def _recall(page_results, page_tokens, pages):
+    """pages에 속한 엔티티 단어 중 엔티티 라벨을 받은 비율"""
+    found = total = 0
+    for idx in pages:
+        labeled = {r["word_index"] for r in page_results[idx] if r["label"].startswith("B-")}
+        entity_words = [i for i, w in enumerate(page_tokens[idx]) if w == "EBITDAQ"]
+        total += len(entity_words)
+        found += sum(1 for i in entity_words if i in labeled)
+    return found / total if total else 1.0
+
+
+def main(size: str = "small", batch_size: int = 8, stride: int = 128):
+    rng = random.Random(0)
+    # 짧은 슬라이드 12장 + 긴 페이지 4장
+    word_counts = [rng.randrange(20, 150) for _ in range(12)] + [rng.randrange(600, 1400) for _ in range(4)]
+    rng.shuffle(word_counts)
+    long_pages = [i for i, c in enumerate(word_counts) if c >= 600]
+
+    processor = make_processor()
+    tokenizer = processor.tokenizer
+    labels = get_labels("ir_deck")
+    entity_label = next(i for i, label in enumerate(labels) if label.startswith("B-"))
+    oracle = OracleModel(tokenizer, len(labels), entity_label)
+    model = make_model(len(labels), len(tokenizer), size)
+
+    images, page_tokens, page_boxes, num_entities = make_pages(word_counts)
+
+    rows = []
+    for name, variant_stride in (("truncate", None), ("windows", stride)):
+        encoding = encode_pages(processor, images, page_tokens, page_boxes, stride=variant_stride)
+        num_windows = encoding["input_ids"].shape[0]
+
+        oracle_results, _ = run_batched_inference(encoding, labels, batch_size=batch_size, model=oracle)
+        recall_all = _recall(oracle_results, page_tokens, range(len(word_counts)))
+        recall_long = _recall(oracle_results, page_tokens, long_pages)
+        entities = sum(len(aggregate_entities(r, tokenizer)) for r in oracle_results)
+
+        started = time.perf_counter()
+        run_batched_inference(encoding, labels, batch_size=batch_size, model=model)
+        elapsed = time.perf_counter() - started
+
+        rows.append((name, num_windows, recall_all, recall_long, entities, elapsed))
+
+    print("\n" + "=" * 80)
+    print(f"📊 {len(word_counts)}페이지 덱 (긴 페이지 {len(long_pages)}장, 엔티티 단어 {num_entities}개) / "
+          f"모델 {size}, 배치 {batch_size}, stride {stride}")
+    print("=" * 80)
+    print(f"  {'mode':<10}{'windows':>8}{'recall':>9}{'recall(long)':>14}{'entities':>10}{'time(s)':>9}{'pages/s':>9}")
+    for name, num_windows, recall_all, recall_long, entities, elapsed in rows:
+        print(f"  {name:<10}{num_windows:>8}{recall_all:>9.1%}{recall_long:>14.1%}{entities:>10}"
+              f"{elapsed:>9.2f}{len(word_counts) / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
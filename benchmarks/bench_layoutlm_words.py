@@ -0,0 +1,143 @@
+"""
+LayoutLM 단어/bbox 추출 벤치마크 (extract_page_words)
+
+200페이지 OCR 결과(블록/paragraph 트리, 좌표 없는 블록·paragraph, 픽셀/정규화 좌표,
+공백뿐인 세그먼트 포함)로 만든 토큰 테이블에서 모든 페이지의 단어와 bbox를
+- 이전 방식: 블록/행마다 파이썬 루프, 행마다 bbox 리스트 생성 후 단어마다 추가
+- 현재 방식: 페이지 행 전체에 대한 배열 연산으로 행 선택/bbox 정규화
+으로 추출해 결과가 완전히 같은지 확인하고 시간을 비교한다.
+
+실행: python -m benchmarks.bench_layoutlm_words [페이지 수]
+"""
+
+import random
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from benchmarks.layoutlm_fixtures import FILLER_WORDS
+from src.docs_analysis.document_ai.token_table import TokenTable
+from src.docs_analysis.layoutlm.preprocess import extract_page_words
+
+
+def legacy_extract_page_words(token_table: TokenTable, page_idx: int) -> Tuple[List[str], List[List[int]]]:
+    """이전 extract_page_words (블록/행 단위 파이썬 루프)"""
+    rows = token_table.page_rows(page_idx)
+    full_text = token_table.text
+    block_ids = token_table.block[rows]
+    para_ids = token_table.paragraph[rows]
+    starts = token_table.start[rows]
+    ends = token_table.end[rows]
+    bboxes = token_table.bbox[rows]
+    has_bbox = ~np.isnan(bboxes[:, 0])
+
+    page_tokens: List[str] = []
+    page_boxes: List[List[int]] = []
+
+    row = 0
+    n_rows = len(block_ids)
+    while row < n_rows:
+        block_end = row
+        while block_end < n_rows and block_ids[block_end] == block_ids[row]:
+            block_end += 1
+
+        if has_bbox[row]:
+            para_rows = [r for r in range(row, block_end) if para_ids[r] != -1]
+            unit_rows = para_rows or [r for r in range(row, block_end) if para_ids[r] == -1]
+
+            for r in unit_rows:
+                if not has_bbox[r]:
+                    continue
+
+                text = full_text[int(starts[r]):int(ends[r])].strip()
+                if not text or text.isspace():
+                    continue
+
+                norm_bbox = [int(v * 1000) for v in bboxes[r].tolist()]
+                for word in text.split():
+                    if word.strip():
+                        page_tokens.append(word)
+                        page_boxes.append(norm_bbox)
+
+        row = block_end
+
+    return page_tokens, page_boxes
+
+
+def make_ocr_document(num_pages: int, blocks_per_page: int = 30, seed: int = 0) -> dict:
+    """Document AI 결과 흉내 (페이지마다 블록 트리, 일부 블록만 paragraph, 좌표 누락/형식 혼합)"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    offset = 0
+
+    def _segment(num_words: int) -> dict:
+        nonlocal offset
+        words = [rng.choice(FILLER_WORDS) for _ in range(num_words)]
+        # 단어 사이 공백 종류를 섞고 가끔 공백뿐인 세그먼트를 만듦
+        text = rng.choice([" ", "  ", "\n", "　"]).join(words) if num_words else rng.choice(["", "  \n"])
+        start = offset
+        parts.append(text + "\n")
+        offset += len(text) + 1
+        return {"startIndex": str(start), "endIndex": str(start + len(text))}
+
+    def _layout(width: float, height: float, num_words: int) -> dict:
+        layout = {"textAnchor": {"textSegments": [_segment(num_words)]}}
+        roll = rng.random()
+        if roll < 0.9:
+            x, y = rng.uniform(0, 0.9), rng.uniform(0, 0.95)
+            w, h = rng.uniform(0.02, 0.1), rng.uniform(0.01, 0.05)
+            if roll < 0.6:
+                vertices = [{"x": x, "y": y}, {"x": x + w, "y": y}, {"x": x + w, "y": y + h}, {"x": x, "y": y + h}]
+                layout["boundingPoly"] = {"normalizedVertices": vertices}
+            else:
+                vertices = [{"x": round(x * width), "y": round(y * height)},
+                            {"x": round((x + w) * width), "y": round((y + h) * height)}]
+                layout["boundingPoly"] = {"vertices": vertices}
+        return layout
+
+    pages = []
+    for page_idx in range(num_pages):
+        width, height = 960, 540
+        blocks = []
+        for _ in range(rng.randrange(blocks_per_page // 2, blocks_per_page * 3 // 2)):
+            block = {"layout": _layout(width, height, rng.randrange(0, 12))}
+            if rng.random() < 0.5:
+                block["paragraphs"] = [
+                    {"layout": _layout(width, height, rng.randrange(0, 8))} for _ in range(rng.randrange(1, 5))
+                ]
+            blocks.append(block)
+        pages.append({"pageNumber": page_idx + 1, "dimension": {"width": width, "height": height}, "blocks": blocks})
+    return {"text": "".join(parts), "pages": pages}
+
+
+def _best_of(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(num_pages: int = 200, repeat: int = 5):
+    table = TokenTable.from_document(make_ocr_document(num_pages))
+    pages = range(table.num_pages)
+
+    legacy_time, legacy = _best_of(lambda: [legacy_extract_page_words(table, p) for p in pages], repeat)
+    new_time, current = _best_of(lambda: [extract_page_words(table, p) for p in pages], repeat)
+    assert current == legacy, "extract_page_words 결과 불일치"
+
+    num_words = sum(len(tokens) for tokens, _ in legacy)
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 OCR 토큰 테이블 ({len(table.block)}행 → 단어 {num_words}개, 최선 {repeat}회)")
+    print("=" * 80)
+    print(f"  ✅ 이전 구현과 결과 동일")
+    print(f"  {'방식':<26}{'시간':>10}{'배율':>8}")
+    print(f"  {'이전 (행 루프)':<26}{legacy_time * 1000:8.1f}ms{1.0:7.1f}x")
+    print(f"  {'현재 (배열 연산)':<26}{new_time * 1000:8.1f}ms{legacy_time / new_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
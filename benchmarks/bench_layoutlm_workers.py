@@ -0,0 +1,82 @@
+"""
+멀티 프로세스 LayoutLM 추론 확장성 벤치마크
+
+같은 덱을
+- 단일 프로세스 run_batched_inference (기준)
+- run_sharded_inference 워커 1/2/4/8개 (워커당 스레드 = 코어 수 / 워커 수)
+로 추론해 pages/s, 기준 대비 배율, 라벨 일치율, 워커 풀 시작(모델 로딩) 시간을 비교한다.
+워커 풀 시작 시간은 처리량에 넣지 않는다 (풀은 프로세스당 한 번 띄워 재사용).
+코어 수보다 워커가 많으면 코어를 나눠 쓰므로 빨라지지 않는다.
+
+실행: python -m benchmarks.bench_layoutlm_workers [small|base] [워커 수 목록, 기본 1,2,4,8]
+"""
+
+import functools
+import os
+import random
+import sys
+import time
+
+from benchmarks.layoutlm_fixtures import make_model, make_pages, make_processor
+from src.docs_analysis.layoutlm.config import available_cpus
+from src.docs_analysis.layoutlm.inference import run_batched_inference
+from src.docs_analysis.layoutlm.parallel import pool_startup_ms, run_sharded_inference, shutdown_worker_pool
+from src.docs_analysis.layoutlm.preprocess import encode_pages, get_labels
+
+
+def _labels(page_results):
+    return [[(r["word_index"], r["label"]) for r in results] for results in page_results]
+
+
+def _agreement(reference, current):
+    same = sum(a == b for ref, cur in zip(reference, current) for a, b in zip(ref, cur))
+    return same / max(sum(len(ref) for ref in reference), 1)
+
+
+def main(size: str = "small", batch_size: int = 4, num_pages: int = 32, workers=(1, 2, 4, 8)):
+    rng = random.Random(0)
+    word_counts = [rng.randrange(40, 200) if rng.random() < 0.8 else rng.randrange(300, 700) for _ in range(num_pages)]
+
+    processor = make_processor()
+    labels = get_labels("ir_deck")
+    model_factory = functools.partial(make_model, len(labels), len(processor.tokenizer), size)
+    images, page_tokens, page_boxes, _ = make_pages(word_counts)
+    encoding = encode_pages(processor, images, page_tokens, page_boxes)
+
+    model = model_factory()
+    run_batched_inference(encoding, labels, batch_size=batch_size, model=model)  # 웜업
+    started = time.perf_counter()
+    reference, _ = run_batched_inference(encoding, labels, batch_size=batch_size, model=model)
+    baseline = time.perf_counter() - started
+    reference = _labels(reference)
+
+    rows = [("in-process", available_cpus(), 0.0, baseline, 1.0)]
+    for num_workers in workers:
+        # 워커 풀 시작 + 웜업 (첫 배치의 지연 초기화 제외)
+        run_sharded_inference(encoding, labels, batch_size=batch_size, num_workers=num_workers,
+                              model_factory=model_factory)
+        startup_ms = pool_startup_ms()
+
+        started = time.perf_counter()
+        page_results, _ = run_sharded_inference(encoding, labels, batch_size=batch_size, num_workers=num_workers,
+                                                model_factory=model_factory)
+        elapsed = time.perf_counter() - started
+        threads = max(1, available_cpus() // num_workers)
+        rows.append((f"{num_workers} workers", threads, startup_ms / 1000, elapsed,
+                     _agreement(reference, _labels(page_results))))
+    shutdown_worker_pool()
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 덱 (윈도우 {encoding['input_ids'].shape[0]}개) / 모델 {size}, 배치 {batch_size}, "
+          f"사용 가능 코어 {available_cpus()}개 (전체 {os.cpu_count()}개)")
+    print("=" * 80)
+    print(f"  {'mode':<12}{'threads':>8}{'startup(s)':>11}{'time(s)':>9}{'pages/s':>9}{'speedup':>9}{'labels':>9}")
+    for name, threads, startup, elapsed, agreement in rows:
+        print(f"  {name:<12}{threads:>8}{startup:>11.1f}{elapsed:>9.2f}{num_pages / elapsed:>9.2f}"
+              f"{baseline / elapsed:>8.2f}x{agreement:>9.1%}")
+
+
+if __name__ == "__main__":
+    size = sys.argv[1] if len(sys.argv) > 1 else "small"
+    counts = tuple(int(n) for n in sys.argv[2].split(",")) if len(sys.argv) > 2 else (1, 2, 4, 8)
+    main(size, workers=counts)
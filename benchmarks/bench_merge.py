@@ -0,0 +1,127 @@
+"""
+스트리밍 청크 병합 검증/벤치마크 (500페이지 합성 문서)
+
+- 병합 후 모든 블록의 textAnchor로 잘라낸 텍스트가 청크 원본과 같은지 확인
+- extracted_numbers 위치가 병합 텍스트의 해당 숫자를 가리키는지 확인
+- 청크 결과를 모두 메모리에 두고 병합(이전 방식)할 때와
+  경로를 넘겨 한 청크씩 병합할 때의 최대 메모리 비교 (tracemalloc)
+- 병합 결과 전체 로드 vs 지연 로딩 Document로 metadata + 3페이지만 읽기 / 전체 페이지 순회(토큰 테이블 생성)
+
+실행: python -m benchmarks.bench_merge
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.docs_analysis.document_ai.document import load_document
+from src.docs_analysis.document_ai.processor import extract_numbers, merge_chunk_results
+from src.docs_analysis.document_ai.token_table import TokenTable, token_table_path
+from src.utils.io_utils import read_artifact, save_artifact
+
+
+def make_chunk(chunk_idx: int, num_pages: int, symbols_per_block: int = 40) -> dict:
+    """심볼/토큰 트리를 포함한 청크 결과 흉내 (페이지당 블록 6개)"""
+    text = ""
+    pages = []
+    for p in range(num_pages):
+        blocks, tokens = [], []
+        for b in range(6):
+            line = f"[c{chunk_idx} p{p} b{b}] 매출 {chunk_idx * 100 + p}.{b}억원 성장률 {b}%\n"
+            start, end = len(text), len(text) + len(line)
+            text += line
+            layout = {
+                "textAnchor": {"textSegments": [{"startIndex": str(start), "endIndex": str(end)}]},
+                "boundingPoly": {"normalizedVertices": [{"x": 0.1, "y": 0.1 * b}, {"x": 0.9, "y": 0.1 * b + 0.05}]},
+            }
+            blocks.append({"layout": layout})
+            for s in range(symbols_per_block):
+                tokens.append({"layout": {**layout, "confidence": 0.99}, "detectedBreak": {"type": "SPACE"}})
+        pages.append({"pageNumber": p + 1, "dimension": {"width": 960, "height": 540}, "blocks": blocks, "tokens": tokens})
+    return extract_numbers({"text": text, "pages": pages})
+
+
+def _measure(fn):
+    """소요 시간(추적 없이)과 최대 메모리(tracemalloc)를 따로 측정"""
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main(total_pages: int = 500, pages_per_chunk: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        chunk_paths, expected = [], []
+        for c in range((total_pages + pages_per_chunk - 1) // pages_per_chunk):
+            chunk = make_chunk(c, min(pages_per_chunk, total_pages - c * pages_per_chunk))
+            for page in chunk["pages"]:
+                expected.append([chunk["text"][int(b["layout"]["textAnchor"]["textSegments"][0]["startIndex"]):
+                                              int(b["layout"]["textAnchor"]["textSegments"][0]["endIndex"])]
+                                 for b in page["blocks"]])
+            path = os.path.join(tmp, f"chunk_{c + 1}_ocr.json")
+            save_artifact(chunk, path)
+            chunk_paths.append(path)
+
+        def _in_memory():
+            # 이전 방식: 모든 청크를 메모리에 올려 병합
+            chunks = [read_artifact(p) for p in chunk_paths]
+            return merge_chunk_results(chunks, os.path.join(tmp, "merged_memory.pkas"))
+
+        output_path = os.path.join(tmp, "merged_stream.pkas")
+
+        def _streaming():
+            # 스트리밍 방식: 경로를 넘겨 한 청크씩 병합
+            return merge_chunk_results(chunk_paths, output_path, keep_pages=False)
+
+        memory_time, memory_peak, _ = _measure(_in_memory)
+        stream_time, stream_peak, header = _measure(_streaming)
+
+        merged = read_artifact(output_path)
+        full_text = merged["text"]
+        assert len(merged["pages"]) == total_pages
+        for page, blocks in zip(merged["pages"], expected):
+            got = [full_text[int(b["layout"]["textAnchor"]["textSegments"][0]["startIndex"]):
+                             int(b["layout"]["textAnchor"]["textSegments"][0]["endIndex"])] for b in page["blocks"]]
+            assert got == blocks, "textAnchor 재배치 오류"
+            for token in page["tokens"][:3]:
+                seg = token["layout"]["textAnchor"]["textSegments"][0]
+                assert full_text[int(seg["startIndex"]):int(seg["endIndex"])] in blocks
+        for item in merged["extracted_numbers"]["currency"]:
+            assert full_text.startswith(item["text"], item["position"]), "숫자 위치 재배치 오류"
+        table = TokenTable.load(token_table_path(output_path))
+        assert table.num_pages == total_pages and table.block_texts(total_pages - 1) == [b.strip() for b in expected[-1]]
+        size_mb = os.path.getsize(output_path) / 1024 ** 2
+
+        def _page_three():
+            doc = load_document(output_path)
+            return doc["metadata"], doc.page(2)
+
+        def _iterate_pages():
+            return TokenTable.from_document(load_document(output_path))
+
+        full_time, full_peak, _ = _measure(lambda: read_artifact(output_path))
+        page_time, page_peak, (metadata, page) = _measure(_page_three)
+        iter_time, iter_peak, lazy_table = _measure(_iterate_pages)
+        assert metadata["total_pages"] == total_pages and page == merged["pages"][2]
+        assert lazy_table.num_pages == total_pages and lazy_table.block_texts(3) == table.block_texts(3)
+
+    print("\n" + "=" * 80)
+    print(f"📊 {total_pages}페이지 / {pages_per_chunk}페이지 청크 병합 (결과 {size_mb:.1f}MB)")
+    print("=" * 80)
+    print(f"  ✅ textAnchor / extracted_numbers 재배치 검증 통과 ({len(header['extracted_numbers']['currency'])}개 금액)")
+    print(f"  in-memory : {memory_time:6.2f}s, 최대 메모리 {memory_peak / 1024 ** 2:8.1f} MB")
+    print(f"  streaming : {stream_time:6.2f}s, 최대 메모리 {stream_peak / 1024 ** 2:8.1f} MB")
+    print(f"  전체 로드           : {full_time:6.2f}s, 최대 메모리 {full_peak / 1024 ** 2:8.1f} MB")
+    print(f"  metadata + 3페이지  : {page_time:6.2f}s, 최대 메모리 {page_peak / 1024 ** 2:8.1f} MB")
+    print(f"  페이지 순회(테이블) : {iter_time:6.2f}s, 최대 메모리 {iter_peak / 1024 ** 2:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
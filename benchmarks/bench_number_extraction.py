@@ -0,0 +1,116 @@
+"""
+숫자 추출 처리량 벤치마크 (수 MB 규모 OCR 텍스트)
+
+- legacy: 패턴 7개를 각각 전체 텍스트에 finditer (이전 extract_numbers 방식)
+- single-pass: 결합 스캐너 1회 + 배열 요약
+
+측정 전에 같은 말뭉치에서 두 방식의 (위치, 카테고리, 숫자) 결과가 같은지 확인한다.
+(legacy는 겹치는 패턴이 같은 위치를 두 카테고리로 중복 추출할 수 있으므로 그중 하나와 같으면 일치로 봄)
+
+실행: python -m benchmarks.bench_number_extraction
+"""
+
+import random
+import re
+import time
+
+import numpy as np
+
+from src.docs_analysis.document_ai.numbers import NUMBER_CATEGORIES, scan_numbers, summarize_numbers
+
+LEGACY_PATTERNS = [
+    ("currency", r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*억\s*원?"),
+    ("currency", r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*조\s*원?"),
+    ("currency", r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*만\s*원?"),
+    ("percentage", r"(\d+(?:\.\d+)?)\s*%"),
+    ("quantity", r"(\d+(?:,\d{3})*)\s*억?\s*개"),
+    ("quantity", r"(\d+(?:,\d{3})*)\s*대"),
+    ("quantity", r"(\d+(?:,\d{3})*)\s*명"),
+]
+
+SNIPPETS = [
+    "국내 시장 규모는 {n}억 원으로 추정되며",
+    "연평균 성장률 {p}%를 기록하고",
+    "누적 사용자 {q}명, 제휴 병원 {q}개",
+    "2025년 매출 목표 {n}조원 달성을 위해",
+    "IoT 기기 {q}대 보급, 월 구독료 {q}만원",
+    "매출 {n}억 대비 {p}% 성장",
+    "팀 구성원 및 핵심 기술 역량 소개 슬라이드입니다.",
+]
+
+
+def make_text(target_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < target_bytes:
+        snippet = rng.choice(SNIPPETS).format(
+            n=f"{rng.randint(1, 9999):,}.{rng.randint(0, 9)}",
+            p=f"{rng.uniform(0, 300):.1f}",
+            q=f"{rng.randint(1, 99999):,}",
+        )
+        parts.append(snippet)
+        size += len(snippet.encode("utf-8")) + 1
+    return "\n".join(parts)
+
+
+def legacy_extract(text: str) -> int:
+    count = 0
+    for _, pattern in LEGACY_PATTERNS:
+        for match in re.finditer(pattern, text):
+            _ = {"text": match.group(0), "value": match.group(1), "position": match.start()}
+            count += 1
+    return count
+
+
+def check_equivalence(text: str):
+    """legacy 패턴 결과와 단일 패스 결과의 (위치, 카테고리, 숫자)가 같은지 확인"""
+    legacy = {}
+    for category, pattern in LEGACY_PATTERNS:
+        for match in re.finditer(pattern, text):
+            legacy.setdefault(match.start(), set()).add((category, match.group(1)))
+
+    table = scan_numbers(text)
+    current = {
+        int(start): (NUMBER_CATEGORIES[category], raw)
+        for start, category, raw in zip(table["start"], table["category"], table["raw"])
+    }
+    assert current.keys() == legacy.keys(), "추출 위치 불일치"
+    for start, found in current.items():
+        assert found in legacy[start], f"카테고리/숫자 불일치: {text[start:start + 20]!r} → {found}, legacy {legacy[start]}"
+    return len(current)
+
+
+def main(sizes_mb=(1, 4, 16), repeats: int = 3):
+    matched = check_equivalence(make_text(256 * 1024, seed=1))
+    print(f"✅ legacy와 결과 동일 (256KB 말뭉치, {matched}개)")
+
+    print("\n" + "=" * 80)
+    print("📊 숫자 추출 처리량 (MB/s, 높을수록 좋음)")
+    print("=" * 80)
+    print(f"{'size':>6} {'legacy':>10} {'single-pass':>12} {'speedup':>8} {'matches':>9}")
+
+    for size_mb in sizes_mb:
+        text = make_text(size_mb * 1024 * 1024)
+        page_starts = np.arange(0, len(text), 2000, dtype=np.int64)
+
+        legacy_best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            legacy_extract(text)
+            legacy_best = min(legacy_best, time.perf_counter() - started)
+
+        new_best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            table = scan_numbers(text, page_starts)
+            summarize_numbers(table)
+            new_best = min(new_best, time.perf_counter() - started)
+
+        print(
+            f"{size_mb:>4}MB {size_mb / legacy_best:>10.1f} {size_mb / new_best:>12.1f} "
+            f"{legacy_best / new_best:>7.2f}x {table['value'].size:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+중복 페이지 감지 검증/벤치마크 (가짜 클라이언트 사용)
+
+간지/템플릿 슬라이드가 반복되는 덱을 만들어
+- 중복 제거 전후 OCR로 보낸 페이지 수와 요청 수 비교
+- 펼친 결과에서 중복 페이지의 텍스트가 대표 페이지와 같고, 모든 textAnchor가 올바른지 확인
+
+실행: python -m benchmarks.bench_page_dedup
+"""
+
+import os
+import tempfile
+import time
+
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, NameObject
+
+from benchmarks.fake_docai import FakeDocumentProcessorServiceClient
+from src.docs_analysis.document_ai.processor import merge_chunk_results, process_pdf_ocr_in_chunks
+
+
+def make_deck(path: str, num_pages: int, divider_every: int = 4) -> str:
+    """divider_every 페이지마다 같은 간지 슬라이드가 들어가는 덱"""
+    writer = PdfWriter()
+    for idx in range(num_pages):
+        page = PageObject.create_blank_page(width=960, height=540)
+        label = "Section Divider" if idx % divider_every == 0 else f"Slide {idx + 1}"
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 32 Tf 100 270 Td ({label}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def _check_anchors(merged: dict):
+    text = merged["text"]
+    for page in merged["pages"]:
+        for block in page.get("blocks", []):
+            for seg in block["layout"]["textAnchor"]["textSegments"]:
+                snippet = text[int(seg.get("startIndex", 0)):int(seg.get("endIndex", 0))]
+                assert snippet.startswith("슬라이드"), f"잘못된 textAnchor: {snippet!r}"
+
+
+def main(num_pages: int = 120, latency: float = 0.3):
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_deck(os.path.join(tmp, "deck.pdf"), num_pages)
+
+        rows = []
+        for dedup in (False, True):
+            client = FakeDocumentProcessorServiceClient(latency=latency)
+            out_dir = os.path.join(tmp, f"chunks_{dedup}")
+            started = time.perf_counter()
+            paths = process_pdf_ocr_in_chunks(
+                file_path=pdf_path,
+                output_dir=out_dir,
+                client=client,
+                return_paths=True,
+                dedup_pages=dedup,
+                use_cache=False,
+            )
+            elapsed = time.perf_counter() - started
+
+            merged = merge_chunk_results(paths, os.path.join(tmp, f"merged_{dedup}.pkas"))
+            assert len(merged["pages"]) == num_pages
+            _check_anchors(merged)
+
+            pages_sent = sum(1 for page in merged["pages"] if "duplicate_of" not in page)
+            if dedup:
+                # 중복 페이지 텍스트 = 대표 페이지 텍스트
+                text = merged["text"]
+
+                def _page_text(page):
+                    seg = page["blocks"][0]["layout"]["textAnchor"]["textSegments"][0]
+                    return text[int(seg.get("startIndex", 0)):int(seg.get("endIndex", 0))]
+
+                for page in merged["pages"]:
+                    if "duplicate_of" in page:
+                        assert _page_text(page) == _page_text(merged["pages"][page["duplicate_of"] - 1])
+
+            rows.append((dedup, elapsed, client.calls, pages_sent, merged["metadata"]["dedup_ratio"]))
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 덱 (4페이지마다 같은 간지) / 요청 지연 {latency}s")
+    print("=" * 80)
+    print(f"{'dedup':>6} {'time(s)':>9} {'calls':>6} {'pages sent':>11} {'dedup ratio':>12}")
+    for dedup, elapsed, calls, sent, ratio in rows:
+        print(f"{str(dedup):>6} {elapsed:>9.2f} {calls:>6} {sent:>11} {ratio:>12.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+PDF 텍스트 레이어 추출 벤치마크 (read_text_layers)
+
+텍스트와 이미지 XObject가 있는 슬라이드 PDF를
+- 텍스트 레이어 경로: read_text_layers → combine_with_ocr (Document AI 호출 없음)
+- OCR 경로: 가짜 Document AI 클라이언트 결과 (Document.to_json)
+로 읽어 토큰 테이블의 페이지별 이미지 개수(슬라이드 분석의 image_count)가 같은지 확인하고
+텍스트 레이어 추출 시간(페이지당)을 잰다.
+
+실행: python -m benchmarks.bench_text_layer [페이지 수]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+from google.cloud import documentai_v1beta3 as documentai
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+
+from benchmarks.fake_docai import FakeDocumentProcessorServiceClient
+from src.docs_analysis.document_ai.text_layer import combine_with_ocr, read_text_layers
+from src.docs_analysis.document_ai.token_table import TokenTable
+
+
+def _image_xobject(writer: PdfWriter, size: int = 8):
+    """회색 RGB 이미지 XObject (Flate 압축)"""
+    image = StreamObject()
+    image._data = zlib.compress(bytes([128]) * (size * size * 3))
+    image.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Image"),
+        NameObject("/Width"): NumberObject(size),
+        NameObject("/Height"): NumberObject(size),
+        NameObject("/ColorSpace"): NameObject("/DeviceRGB"),
+        NameObject("/BitsPerComponent"): NumberObject(8),
+        NameObject("/Filter"): NameObject("/FlateDecode"),
+    })
+    return writer._add_object(image)
+
+
+def make_slide_pdf(path: str, num_pages: int, width: float = 960, height: float = 540) -> str:
+    """페이지마다 제목/본문 텍스트와 작은 이미지 두 개(페이지 면적의 일부)를 그린 PDF"""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    image = _image_xobject(writer)
+
+    for idx in range(num_pages):
+        page = PageObject.create_blank_page(width=width, height=height)
+        lines = [f"BT /F1 28 Tf 60 470 Td (Slide {idx + 1} market overview) Tj ET"]
+        for row in range(8):
+            lines.append(f"BT /F1 14 Tf 60 {400 - row * 24} Td (revenue growth {idx + row} percent team) Tj ET")
+        lines.append("q 160 0 0 120 700 300 cm /Im1 Do Q")
+        lines.append("q 160 0 0 120 700 120 cm /Im1 Do Q")
+        content = DecodedStreamObject()
+        content.set_data("\n".join(lines).encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+            NameObject("/XObject"): DictionaryObject({NameObject("/Im1"): image}),
+        })
+        writer.add_page(page)
+
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def main(num_pages: int = 50):
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_slide_pdf(os.path.join(tmp, "deck.pdf"), num_pages)
+        page_indices = list(range(num_pages))
+
+        started = time.perf_counter()
+        layers = read_text_layers(pdf_path, page_indices, min_chars=20, max_garbage_ratio=0.1,
+                                  max_image_coverage=0.5)
+        elapsed = time.perf_counter() - started
+        assert len(layers) == num_pages, f"텍스트 레이어 페이지 {len(layers)}/{num_pages}개만 추출됨"
+        layer_table = TokenTable.from_document(combine_with_ocr(page_indices, layers, None))
+
+        with open(pdf_path, "rb") as f:
+            ocr_doc = json.loads(documentai.Document.to_json(FakeDocumentProcessorServiceClient._build_document(f.read())))
+        ocr_table = TokenTable.from_document(ocr_doc)
+
+    assert layer_table.page_image_count.tolist() == ocr_table.page_image_count.tolist(), (
+        f"image_count 불일치: 텍스트 레이어 {layer_table.page_image_count.tolist()[:5]} / "
+        f"OCR {ocr_table.page_image_count.tolist()[:5]}"
+    )
+
+    print("\n" + "=" * 80)
+    print(f"📊 {num_pages}페이지 슬라이드 PDF (텍스트 + 이미지 XObject 2개/페이지)")
+    print("=" * 80)
+    print(f"  ✅ 페이지별 image_count 동일 (텍스트 레이어 = OCR = {int(ocr_table.page_image_count[0])}, "
+          f"page.image 항목 기준)")
+    print(f"  텍스트 레이어 추출: {elapsed:.2f}s ({elapsed * 1000 / num_pages:.1f}ms/page), "
+          f"토큰 {len(layer_table.block)}행")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,99 @@
+"""
+벤치마크/로컬 검증용 가짜 Document AI 클라이언트
+(실제 API 호출 없이 지연 시간과 일시적 오류를 흉내냄)
+"""
+
+import io
+import random
+import threading
+import time
+
+from google.api_core import exceptions as gexc
+from google.cloud import documentai_v1beta3 as documentai
+from PyPDF2 import PdfReader, PdfWriter
+
+
+def make_blank_pdf(path: str, num_pages: int, width: float = 960, height: float = 540) -> str:
+    """지정한 페이지 수의 빈 PDF 생성 (16:9 슬라이드 크기)"""
+    writer = PdfWriter()
+    for _ in range(num_pages):
+        writer.add_blank_page(width=width, height=height)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+class FakeDocumentProcessorServiceClient:
+    """DocumentProcessorServiceClient 대역
+
+    Args:
+        latency: 요청 1회당 지연 시간(초)
+        failure_rate: ServiceUnavailable을 던질 확률 (0~1)
+        setup_cost: 클라이언트 생성 시 채널/인증 준비를 흉내내는 지연(초)
+    """
+
+    def __init__(self, latency: float = 0.2, failure_rate: float = 0.0, setup_cost: float = 0.0, seed: int = 0):
+        if setup_cost:
+            time.sleep(setup_cost)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @staticmethod
+    def processor_path(project: str, location: str, processor: str) -> str:
+        return documentai.DocumentProcessorServiceClient.processor_path(project, location, processor)
+
+    def process_document(self, request=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            should_fail = self._rng.random() < self.failure_rate
+        try:
+            time.sleep(self.latency)
+            if should_fail:
+                with self._lock:
+                    self.failures += 1
+                raise gexc.ServiceUnavailable("fake: 일시적 오류")
+            return documentai.ProcessResponse(document=self._build_document(request.raw_document.content))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _build_document(content: bytes):
+        num_pages = len(PdfReader(io.BytesIO(content)).pages)
+        text = ""
+        pages = []
+        for page_idx in range(num_pages):
+            line = f"슬라이드 {page_idx + 1} 시장 규모 {page_idx + 1}.5억원 성장률 {page_idx}%\n"
+            start, end = len(text), len(text) + len(line)
+            text += line
+            layout = documentai.Document.Page.Layout(
+                text_anchor=documentai.Document.TextAnchor(
+                    text_segments=[documentai.Document.TextAnchor.TextSegment(start_index=start, end_index=end)]
+                ),
+                bounding_poly=documentai.BoundingPoly(
+                    normalized_vertices=[
+                        documentai.NormalizedVertex(x=0.1, y=0.1),
+                        documentai.NormalizedVertex(x=0.9, y=0.1),
+                        documentai.NormalizedVertex(x=0.9, y=0.2),
+                        documentai.NormalizedVertex(x=0.1, y=0.2),
+                    ]
+                ),
+            )
+            pages.append(documentai.Document.Page(
+                page_number=page_idx + 1,
+                # 실제 OCR처럼 렌더링한 페이지 이미지를 붙임 (바이트는 생략)
+                image=documentai.Document.Page.Image(content=b"", mime_type="image/png", width=960, height=540),
+                dimension=documentai.Document.Page.Dimension(width=960, height=540, unit="points"),
+                layout=layout,
+                blocks=[documentai.Document.Page.Block(layout=layout)],
+                paragraphs=[documentai.Document.Page.Paragraph(layout=layout)],
+            ))
+        return documentai.Document(text=text, pages=pages)
@@ -0,0 +1,109 @@
+"""
+벤치마크/로컬 검증용 LayoutLM 대역 (허브 다운로드 없이 동작)
+
+- 합성 말뭉치로 학습한 작은 BPE 어휘의 LayoutLMv3 토크나이저/프로세서
+- 무작위 초기화 LayoutLMv3 (구조와 연산량은 실제 모델과 같음, 크기 선택 가능)
+- 특정 단어(ENTITY_WORD)의 토큰만 엔티티로 예측하는 오라클 모델 (인코딩 방식에 따른 재현율 측정용)
+"""
+
+import os
+import random
+import tempfile
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import torch
+
+FILLER_WORDS = [
+    "매출", "성장률", "투자", "유치", "시장", "규모", "고객", "팀", "제품", "경쟁사",
+    "revenue", "growth", "market", "team", "product", "2024년", "목표", "전략", "확보", "계획",
+]
+# 오라클 모델이 엔티티로 예측하는 단어 (다른 단어와 서브워드를 공유하지 않도록 고유 문자 사용)
+ENTITY_WORD = "EBITDAQ"
+
+MODEL_SIZES = {
+    # 실제 layoutlmv3-base와 같은 구조/연산량
+    "base": {"hidden_size": 768, "num_hidden_layers": 12, "num_attention_heads": 12, "intermediate_size": 3072,
+             "coordinate_size": 128, "shape_size": 128},
+    "small": {"hidden_size": 384, "num_hidden_layers": 4, "num_attention_heads": 6, "intermediate_size": 1536,
+              "coordinate_size": 64, "shape_size": 64},
+}
+
+
+def make_processor(vocab_size: int = 1000):
+    """합성 말뭉치로 BPE 어휘를 학습해 LayoutLMv3Processor 생성 (apply_ocr=False)"""
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import LayoutLMv3ImageProcessor, LayoutLMv3Processor, LayoutLMv3TokenizerFast
+
+    rng = random.Random(0)
+    corpus = [" ".join(rng.choice(FILLER_WORDS + [ENTITY_WORD]) for _ in range(50)) for _ in range(200)]
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(corpus, vocab_size=vocab_size, min_frequency=1,
+                            special_tokens=["<s>", "<pad>", "</s>", "<unk>", "<mask>"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bpe.save_model(tmp)
+        tokenizer = LayoutLMv3TokenizerFast(
+            vocab_file=os.path.join(tmp, "vocab.json"),
+            merges_file=os.path.join(tmp, "merges.txt"),
+        )
+    return LayoutLMv3Processor(image_processor=LayoutLMv3ImageProcessor(apply_ocr=False), tokenizer=tokenizer)
+
+
+def make_model(num_labels: int, vocab_size: int, size: str = "small", seed: int = 0):
+    """무작위 초기화 LayoutLMv3ForTokenClassification"""
+    from transformers import LayoutLMv3Config, LayoutLMv3ForTokenClassification
+
+    torch.manual_seed(seed)
+    # 위치 id가 padding_idx + 1부터 시작하므로 512토큰 윈도우에는 514개 필요 (실제 체크포인트와 같음)
+    config = LayoutLMv3Config(num_labels=num_labels, vocab_size=vocab_size, max_position_embeddings=514,
+                              **MODEL_SIZES[size])
+    return LayoutLMv3ForTokenClassification(config).eval()
+
+
+class OracleModel(torch.nn.Module):
+    """ENTITY_WORD 토큰은 entity_label, 나머지는 0("O")으로 예측 (윈도우/문맥과 무관한 정답 모델)"""
+
+    def __init__(self, tokenizer, num_labels: int, entity_label: int):
+        super().__init__()
+        table = torch.zeros(len(tokenizer), dtype=torch.long)
+        ids = tokenizer([ENTITY_WORD], boxes=[[0, 0, 0, 0]], add_special_tokens=False)["input_ids"]
+        table[ids] = entity_label
+        self.table = table
+        self.num_labels = num_labels
+
+    def forward(self, input_ids, **kwargs):
+        logits = torch.nn.functional.one_hot(self.table[input_ids], self.num_labels).float()
+        return SimpleNamespace(logits=logits)
+
+
+def make_pages(
+    word_counts: List[int],
+    entity_every: int = 25,
+    seed: int = 0
+) -> Tuple[List, List[List[str]], List[List[List[int]]], int]:
+    """
+    페이지별 (이미지, 단어, bbox) 합성 데이터
+
+    Returns:
+        (images, page_tokens, page_boxes, 엔티티 단어 수)
+    """
+    from PIL import Image
+
+    rng = random.Random(seed)
+    images, page_tokens, page_boxes = [], [], []
+    entities = 0
+    for count in word_counts:
+        words, boxes = [], []
+        for i in range(count):
+            if i % entity_every == entity_every - 1:
+                words.append(ENTITY_WORD)
+                entities += 1
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+            x, y = rng.randrange(0, 900), rng.randrange(0, 950)
+            boxes.append([x, y, x + 80, y + 30])
+        images.append(Image.new("RGB", (960, 540), "white"))
+        page_tokens.append(words)
+        page_boxes.append(boxes)
+    return images, page_tokens, page_boxes, entities
@@ -4,6 +4,7 @@ print("--- [시스템] 라이브러리 로딩 시작 (시간이 걸릴 수 있
 """
 
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv  # ✅ [추가됨]
@@ -11,14 +12,18 @@ from dotenv import load_dotenv  # ✅ [추가됨]
 # ✅ [추가됨] .env 파일 로드 (가장 먼저 실행하여 환경 변수 등록)
 load_dotenv()
 
-from src.utils.io_utils import save_json, read_json
+from src.utils.io_utils import save_artifact, shard_artifact_path
 from src.utils.pdf_split import split_pdf 
 
 from src.docs_analysis.document_ai.processor import (
     process_document,
+    process_pdf_ocr,
     process_pdf_ocr_in_chunks,
     merge_chunk_results
 )
+from src.docs_analysis.document_ai.cache import get_ocr_cache
+from src.docs_analysis.document_ai.document import load_document
+from src.docs_analysis.document_ai.token_table import TokenTable, token_table_path, load_token_table
 from src.docs_analysis.layoutlm.preprocess import (
     prepare_layoutlm_input,
     load_docai_json,
@@ -26,8 +31,17 @@ from src.docs_analysis.layoutlm.preprocess import (
     get_label_info,
     print_label_statistics
 )
-from src.docs_analysis.layoutlm.inference import run_inference, aggregate_entities
-from src.docs_analysis.layoutlm.config import LAYOUTLM_MODEL_PATH
+from src.docs_analysis.layoutlm.inference import run_batched_inference, aggregate_page_entities
+from src.docs_analysis.layoutlm.parallel import run_sharded_inference, worker_threads
+from src.docs_analysis.layoutlm.config import (
+    LAYOUTLM_BATCH_SIZE,
+    LAYOUTLM_MAX_LENGTH,
+    LAYOUTLM_NUM_WORKERS,
+    configure_threads,
+    load_processor,
+    load_timings,
+    preload_layoutlm
+)
 
 # 🔥 [NEW] Gemini 및 후처리 모듈 추가
 from src.docs_analysis.llm.gemini_client import GeminiAnalyst
@@ -51,8 +65,11 @@ def detect_document_type(docai_result: Dict) -> str:
     if any(s in detected_sections for s in section_keywords):
         return "pitch_deck"
     
-    numbers = docai_result.get("extracted_numbers", {})
-    currency_count = len(numbers.get("currency", []))
+    summary = docai_result.get("number_summary")
+    if summary:
+        currency_count = summary["currency"]["count"]
+    else:
+        currency_count = len(docai_result.get("extracted_numbers", {}).get("currency", []))
     if currency_count >= 5:
         return "ir_deck"
     
@@ -65,7 +82,7 @@ def run_document_ai_pipeline(
     output_path: Optional[str] = None,
     enable_enhancement: bool = True,
     use_chunking: bool = False,
-    pages_per_chunk: int = 15
+    pages_per_chunk: Optional[int] = None
 ) -> Dict:
     """Document AI 실행 (단일 또는 청크 처리)"""
     
@@ -78,27 +95,47 @@ def run_document_ai_pipeline(
     if not output_path:
         output_path = os.path.join(OUTPUT_DIR, f"{pdf_name}_docai_{processor_type.lower()}.json")
     
-    # 이미 분석된 파일이 있으면 재사용 (시간 절약)
-    if os.path.exists(output_path):
-        print(f"⚡️ 기존 분석 결과 발견! ({output_path}) - 재사용합니다.")
-        return read_json(output_path)
-    
     if use_chunking:
+        # 병합 결과는 JSON이 아닌 샤드 산출물 (*.pkas, load_document / load_docai_json으로 읽음)
+        output_path = shard_artifact_path(output_path)
         chunk_dir = os.path.join(OUTPUT_DIR, f"{pdf_name}_chunks")
-        chunk_results = process_pdf_ocr_in_chunks(
+        # 청크 결과는 경로로 받아 한 청크씩 읽으며 병합 (토큰 테이블도 병합 단계에서 저장)
+        chunk_paths = process_pdf_ocr_in_chunks(
             file_path=pdf_path,
             output_dir=chunk_dir,
             pages_per_chunk=pages_per_chunk,
-            enable_enhancement=enable_enhancement
+            enable_enhancement=enable_enhancement,
+            return_paths=True
         )
-        result = merge_chunk_results(chunk_results, output_path)
+        merge_chunk_results(chunk_paths, output_path, keep_pages=False)
+        # 병합 결과는 헤더만 읽고 pages는 필요할 때 한 페이지씩 읽음
+        result = load_document(output_path)
     else:
-        result = process_document(
-            file_path=pdf_path,
-            processor_type=processor_type,
-            output_path=output_path,
-            enable_enhancement=enable_enhancement
-        )
+        if processor_type == "OCR":
+            # 텍스트 레이어가 온전한 페이지는 로컬 추출, 나머지만 Document AI 호출
+            result = process_pdf_ocr(
+                file_path=pdf_path,
+                output_path=output_path,
+                enable_enhancement=enable_enhancement
+            )
+        else:
+            result = process_document(
+                file_path=pdf_path,
+                processor_type=processor_type,
+                output_path=output_path,
+                enable_enhancement=enable_enhancement
+            )
+        
+        # 이후 단계(LayoutLM, 최종 JSON)는 중첩 JSON 대신 토큰 테이블을 읽음
+        TokenTable.from_document(result).save(token_table_path(output_path))
+    
+    # 같은 내용의 PDF는 파일명과 무관하게 캐시에서 재사용됨 (processor.process_document)
+    stats = get_ocr_cache().stats()
+    print(f"  🗄️ OCR 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} (적중률 {stats['hit_rate']:.0%})")
+    
+    profile = result.get("ocr_profile")
+    if profile:
+        print(f"  ✂️ OCR 프로파일 '{profile['profile']}': 프루닝으로 {profile['pruned_bytes'] / 1024 ** 2:.2f}MB 절감")
     
     return result
 
@@ -107,47 +144,94 @@ def run_layoutlm_pipeline(
     pdf_path: str,
     docai_json_path: str,
     doc_type: Optional[str] = None,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    batch_size: int = LAYOUTLM_BATCH_SIZE,
+    num_workers: int = LAYOUTLM_NUM_WORKERS
 ) -> Dict:
-    """LayoutLM 분석 실행"""
+    """
+    LayoutLM 분석 실행 (페이지 윈도우를 batch_size씩 묶어 추론, 페이지별 엔티티 저장)
+    num_workers > 1이면 배치를 워커 프로세스에 나눠 추론 (layoutlm.parallel)
+    """
     
     print("\n" + "=" * 80)
     print("🤖 Step 2: LayoutLM 엔티티 추출")
     print("=" * 80)
     
-    docai_result = load_docai_json(docai_json_path)
-    
+    # 문서 타입이 정해져 있으면 전체 OCR JSON을 읽지 않고 토큰 테이블만 사용
     if not doc_type:
+        docai_result = load_docai_json(docai_json_path)
         doc_type = detect_document_type(docai_result)
         print(f"  🔍 문서 타입 자동 감지: {doc_type}")
     else:
+        docai_result = None
         print(f"  📋 문서 타입: {doc_type}")
     
+    token_table = load_token_table(docai_json_path, docai_result)
+    
     labels = get_labels(doc_type)
     print(f"  🏷️ 사용 라벨: {len(labels)}개")
     
-    from transformers import LayoutLMv3Processor
-    
-    # 🔥 apply_ocr=False 적용
-    processor = LayoutLMv3Processor.from_pretrained(
-        "microsoft/layoutlmv3-base",
-        apply_ocr=False
-    )
+    # 프로세스 전역 레지스트리 (apply_ocr=False, 두 번째 문서부터는 로딩 비용 없음)
+    processor = load_processor()
     
     layoutlm_input = prepare_layoutlm_input(
         doc_json=docai_result,
         pdf_path=pdf_path,
         processor=processor,
-        max_length=512
+        max_length=LAYOUTLM_MAX_LENGTH,
+        token_table=token_table
     )
     
-    print(f"\n  🎯 LayoutLM 추론 실행...")
+    started = time.perf_counter()
+    if num_workers > 1:
+        num_threads = worker_threads(num_workers)
+        print(f"\n  🎯 LayoutLM 추론 실행 (배치 {batch_size}윈도우, 워커 {num_workers}개 × 스레드 {num_threads}개)...")
+        page_results, batch_stats = run_sharded_inference(
+            layoutlm_input,
+            labels,
+            tokenizer=processor.tokenizer,
+            batch_size=batch_size,
+            num_workers=num_workers
+        )
+    else:
+        num_threads = configure_threads()
+        print(f"\n  🎯 LayoutLM 추론 실행 (배치 {batch_size}윈도우, 스레드 {num_threads}개)...")
+        page_results, batch_stats = run_batched_inference(
+            layoutlm_input,
+            labels,
+            tokenizer=processor.tokenizer,
+            batch_size=batch_size
+        )
+    total_ms = (time.perf_counter() - started) * 1000
+    
+    pages = [
+        {"page": idx + 1, "entities": entities}
+        for idx, entities in enumerate(aggregate_page_entities(page_results, processor.tokenizer))
+    ]
+    total_entities = sum(len(p["entities"]) for p in pages)
+    pages_per_sec = len(pages) / (total_ms / 1000) if total_ms else 0.0
+    print(f"  ✅ 추론 완료: {len(pages)}페이지, 엔티티 {total_entities}개, {total_ms:.0f}ms ({pages_per_sec:.1f} pages/s)")
     
     result = {
         "doc_type": doc_type,
         "num_labels": len(labels),
         "labels_sample": labels[:20],
         "input_shape": str(layoutlm_input["input_ids"].shape),
+        "num_windows": int(layoutlm_input["input_ids"].shape[0]),
+        "render": {
+            "total_ms": round(sum(layoutlm_input["render_ms"]), 2),
+            "page_ms": [round(ms, 2) for ms in layoutlm_input["render_ms"]],
+        },
+        "pages": pages,
+        "model_load": load_timings(),
+        "inference": {
+            "batch_size": batch_size,
+            "num_workers": num_workers,
+            "num_threads": num_threads,
+            "total_ms": round(total_ms, 2),
+            "pages_per_sec": round(pages_per_sec, 2),
+            "batches": batch_stats,
+        },
     }
     
     if not output_dir:
@@ -155,7 +239,7 @@ def run_layoutlm_pipeline(
     
     pdf_name = Path(pdf_path).stem
     result_path = os.path.join(output_dir, f"{pdf_name}_layoutlm_result.json")
-    save_json(result, result_path)
+    save_artifact(result, result_path)
     
     print(f"  ✅ 결과 저장: {result_path}\n")
     
@@ -171,7 +255,11 @@ def main():
     print("🚀 POKI-AI Intelligent RAG Pipeline (Gemini Powered)")
     print("=" * 80)
     
-    # 0. Gemini 초기화
+    # 0. LayoutLM 모델/프로세서는 OCR이 도는 동안 백그라운드에서 미리 로딩
+    #    (멀티 프로세스 추론이면 모델은 워커마다 로딩하므로 프로세서만)
+    preload_layoutlm(model=LAYOUTLM_NUM_WORKERS <= 1)
+
+    # Gemini 초기화
     gemini = GeminiAnalyst()
 
     # -------------------------------------------------------------------------
@@ -226,11 +314,11 @@ def main():
             pdf_path=ir_pdf,
             processor_type="OCR",
             enable_enhancement=True,
-            use_chunking=True,  # IR Deck은 보통 기니까 청크 처리
-            pages_per_chunk=15
+            use_chunking=True  # IR Deck은 보통 기니까 청크 처리 (청크 크기는 페이지 용량/프로세서 한도로 자동 계획)
         )
         
-        docai_json_path = os.path.join(OUTPUT_DIR, "sample_irdeck_docai_ocr.json")
+        # 청크 처리 결과는 샤드 산출물로 병합됨 (run_document_ai_pipeline)
+        docai_json_path = os.path.join(OUTPUT_DIR, "sample_irdeck_docai_ocr.pkas")
         
         # 2-2. LayoutLM (구조 분석)
         layoutlm_result = run_layoutlm_pipeline(
@@ -251,7 +339,8 @@ def main():
             docai_result=docai_result,
             layoutlm_result=layoutlm_result,
             output_path=final_json_path,
-            pitch_strategy=strategy  # <--- RAG의 핵심 연결 고리
+            pitch_strategy=strategy,  # <--- RAG의 핵심 연결 고리
+            token_table=load_token_table(docai_json_path, docai_result)
         )
         
         print(f"\n✨ 모든 분석이 완료되었습니다!")
@@ -0,0 +1,75 @@
+"""
+Document AI 결과 캐시 (PDF 내용 해시 기반)
+
+파일명이 아니라 PDF 바이트의 SHA-256 + 처리 옵션으로 키를 만들어
+같은 이름의 다른 파일은 섞이지 않고, 이름만 바뀐 파일은 다시 OCR하지 않음
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, Optional
+
+from src.utils.disk_cache import DiskLRUCache, sha256_bytes
+from src.utils.io_utils import decode_artifact, encode_artifact
+from src.docs_analysis.document_ai.config import OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES
+
+# 캐시 포맷/강화 로직이 바뀌면 올려서 기존 항목 무효화
+OCR_CACHE_VERSION = 3
+
+_CACHE: Optional["OCRCache"] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def ocr_cache_key(
+    content: bytes,
+    processor_type: str,
+    ocr_options: Dict,
+    enable_enhancement: bool,
+    profile: Optional[str] = None
+) -> str:
+    """PDF 바이트 해시 + 프로세서 타입 + OCR 옵션 + 강화 여부 + OCR 프로파일로 캐시 키 생성"""
+    
+    params = json.dumps(
+        {
+            "version": OCR_CACHE_VERSION,
+            "processor_type": processor_type,
+            "ocr_options": ocr_options,
+            "enable_enhancement": enable_enhancement,
+            "profile": profile,
+        },
+        sort_keys=True,
+    )
+    h = hashlib.sha256()
+    h.update(sha256_bytes(content).encode())
+    h.update(params.encode())
+    return h.hexdigest()
+
+
+class OCRCache:
+    """Document AI 결과 dict를 저장하는 디스크 LRU 캐시"""
+
+    def __init__(self, root: str = OCR_CACHE_DIR, max_bytes: int = OCR_CACHE_MAX_BYTES):
+        self._store = DiskLRUCache(root, max_bytes, suffix=".json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        data = self._store.get_bytes(key)
+        if data is None:
+            return None
+        # 이전 버전이 저장한 압축 JSON 항목도 그대로 읽힘 (헤더로 형식 판별)
+        return decode_artifact(data)
+
+    def put(self, key: str, doc_dict: Dict):
+        self._store.put_bytes(key, encode_artifact(doc_dict))
+
+    def stats(self) -> Dict:
+        return self._store.stats()
+
+
+def get_ocr_cache() -> OCRCache:
+    """프로세스 전역 OCR 캐시"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = OCRCache()
+        return _CACHE
@@ -0,0 +1,134 @@
+"""
+청크 OCR 작업 체크포인트 (매니페스트)
+
+청크 경계, 원본 PDF 해시, 청크별 완료 상태를 기록해서
+중간에 실패한 작업을 다시 실행하면 남은 청크만 처리하도록 함
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.utils.disk_cache import atomic_write_bytes
+
+MANIFEST_VERSION = 4
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+
+
+class ChunkManifest:
+    """청크 작업 매니페스트 (스레드 안전, 변경 시마다 원자적으로 저장)"""
+
+    def __init__(self, path: str, data: Dict):
+        self.path = path
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_or_create(
+        cls,
+        path: str,
+        source_path: str,
+        source_sha256: str,
+        boundaries: List[Dict],
+        profile: Optional[str] = None
+    ) -> "ChunkManifest":
+        """
+        기존 매니페스트가 같은 원본/같은 청크 경계/같은 OCR 프로파일이면 이어서 사용하고,
+        아니면 새 매니페스트를 만든다.
+        청크 결과는 강화 전 원본으로 저장되고 강화/프루닝은 재개 후에 적용하므로 강화 여부는 비교하지 않는다.
+        OCR 프로파일은 요청 옵션과 저장된 청크 결과의 프루닝 범위를 정하므로 다르면 새로 만든다.
+
+        Args:
+            boundaries: [{"start_page": 0, "end_page": 15, "page_indices": [...],
+                          "chunk_file": ..., "output_file": ...}, ...]
+                        (페이지는 0부터, end_page는 포함하지 않음, page_indices = 실제로 OCR할 페이지)
+        """
+        chunks = [
+            {"index": idx, **bound, "status": STATUS_PENDING}
+            for idx, bound in enumerate(boundaries, 1)
+        ]
+        fresh = {
+            "version": MANIFEST_VERSION,
+            "source": source_path,
+            "source_sha256": source_sha256,
+            "profile": profile,
+            "chunks": chunks,
+        }
+
+        existing = cls._read(path)
+        if existing is not None and cls._is_compatible(existing, fresh):
+            manifest = cls(path, existing)
+            done = len(manifest.completed_indices())
+            print(f"  ♻️ 체크포인트 발견: {done}/{len(chunks)}개 청크 완료 상태에서 재개")
+            return manifest
+
+        manifest = cls(path, fresh)
+        manifest.save()
+        return manifest
+
+    @staticmethod
+    def _read(path: str) -> Optional[Dict]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"  ⚠️ 손상된 체크포인트 무시: {path}")
+            return None
+
+    @staticmethod
+    def _is_compatible(existing: Dict, fresh: Dict) -> bool:
+        if existing.get("version") != fresh["version"]:
+            return False
+        if existing.get("source_sha256") != fresh["source_sha256"]:
+            return False
+        if existing.get("profile") != fresh["profile"]:
+            return False
+
+        def _bounds(data: Dict):
+            return [
+                (c["start_page"], c["end_page"], c.get("page_indices"), c.get("ocr_pages"))
+                for c in data.get("chunks", [])
+            ]
+
+        return _bounds(existing) == _bounds(fresh)
+
+    @property
+    def chunks(self) -> List[Dict]:
+        return self.data["chunks"]
+
+    def is_done(self, chunk: Dict) -> bool:
+        """완료로 기록되어 있고 결과 파일도 남아 있어야 완료로 인정"""
+        return chunk.get("status") == STATUS_DONE and os.path.exists(chunk["output_file"])
+
+    def completed_indices(self) -> List[int]:
+        return [c["index"] for c in self.chunks if self.is_done(c)]
+
+    def pending_chunks(self) -> List[Dict]:
+        return [c for c in self.chunks if not self.is_done(c)]
+
+    def mark_done(self, index: int):
+        with self._lock:
+            chunk = self.chunks[index - 1]
+            chunk["status"] = STATUS_DONE
+            chunk.pop("error", None)
+            self._save_locked()
+
+    def mark_failed(self, index: int, error: str):
+        with self._lock:
+            chunk = self.chunks[index - 1]
+            chunk["status"] = STATUS_PENDING
+            chunk["error"] = error
+            self._save_locked()
+
+    def save(self):
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self):
+        data = json.dumps(self.data, indent=2, ensure_ascii=False).encode("utf-8")
+        atomic_write_bytes(self.path, data)
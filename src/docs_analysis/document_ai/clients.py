@@ -0,0 +1,108 @@
+"""
+프로세스 전역 Document AI 클라이언트 레지스트리
+
+호출마다 DocumentProcessorServiceClient를 새로 만들면 채널 생성, 인증 토큰 발급,
+TLS 핸드셰이크 비용을 매번 치르게 되므로 location(엔드포인트)별 gRPC 채널 하나를
+공유하는 클라이언트를 한 번만 만들어 재사용한다.
+"""
+
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from google.cloud import documentai_v1beta3 as documentai
+from google.cloud.documentai_v1beta3.services.document_processor_service.transports import (
+    DocumentProcessorServiceGrpcTransport,
+)
+
+from src.docs_analysis.document_ai.config import LOCATION
+
+# 대용량 PDF 응답을 받기 위해 gRPC 기본 메시지 제한(4MB) 해제
+_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+]
+
+
+def api_endpoint(location: str) -> str:
+    """location별 Document AI 엔드포인트"""
+    return f"{location}-documentai.googleapis.com"
+
+
+def _default_channel_factory(endpoint: str):
+    return DocumentProcessorServiceGrpcTransport.create_channel(
+        endpoint,
+        options=_CHANNEL_OPTIONS,
+    )
+
+
+def _default_client_factory(endpoint: str, channel):
+    transport = DocumentProcessorServiceGrpcTransport(host=endpoint, channel=channel)
+    return documentai.DocumentProcessorServiceClient(transport=transport)
+
+
+class ClientRegistry:
+    """
+    (location, processor_type)별 장수명 클라이언트 저장소
+
+    - 같은 location의 클라이언트들은 하나의 gRPC 채널을 공유
+    - 생성은 잠금 안에서 한 번만 일어나며, 생성된 클라이언트는 여러 스레드에서 동시에 사용 가능
+    - channel_factory / client_factory를 바꿔 끼우면 로컬 대역(fake)으로도 동작
+    """
+
+    def __init__(
+        self,
+        channel_factory: Callable[[str], object] = _default_channel_factory,
+        client_factory: Callable[[str, object], object] = _default_client_factory,
+    ):
+        self._channel_factory = channel_factory
+        self._client_factory = client_factory
+        self._channels: Dict[str, object] = {}
+        self._clients: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, processor_type: str = "OCR", location: str = LOCATION):
+        key = (location, processor_type)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                endpoint = api_endpoint(location)
+                channel = self._channels.get(endpoint)
+                if channel is None:
+                    channel = self._channel_factory(endpoint)
+                    self._channels[endpoint] = channel
+                client = self._client_factory(endpoint, channel)
+                self._clients[key] = client
+            return client
+
+    def close(self):
+        """공유 채널 정리 (프로세스 종료 전이나 설정 변경 시)"""
+        with self._lock:
+            for channel in self._channels.values():
+                close = getattr(channel, "close", None)
+                if close is not None:
+                    close()
+            self._channels.clear()
+            self._clients.clear()
+
+
+_REGISTRY: Optional[ClientRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ClientRegistry:
+    """프로세스 전역 클라이언트 레지스트리"""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ClientRegistry()
+        return _REGISTRY
+
+
+def get_client(processor_type: str = "OCR", location: str = LOCATION):
+    """공유 Document AI 클라이언트 반환"""
+    return get_registry().get(processor_type, location)
@@ -9,4 +9,46 @@ PROCESSORS = {
     "OCR": os.getenv("OCR_PROCESSOR_ID", "e41bb5d1cae96184"),
     "LAYOUT": os.getenv("LAYOUT_PROCESSOR_ID", "82698693210d7aa8"),
     "FORM": os.getenv("FORM_PROCESSOR_ID", "662d7f1f1e179648"),
-}
\ No newline at end of file
+}
+
+# 청크 병렬 처리 설정
+MAX_CONCURRENT_REQUESTS = int(os.getenv("DOCAI_MAX_CONCURRENT_REQUESTS", "4"))
+MAX_RETRIES = int(os.getenv("DOCAI_MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.getenv("DOCAI_RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = float(os.getenv("DOCAI_RETRY_MAX_DELAY", "30.0"))
+
+# OCR 결과 캐시 설정 (PDF 내용 해시 기반)
+OCR_CACHE_DIR = os.getenv("DOCAI_CACHE_DIR", os.path.join("data", "cache", "docai"))
+OCR_CACHE_MAX_BYTES = int(os.getenv("DOCAI_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# 프로세서별 온라인 요청 한도 (요청 1건당 페이지 수 / PDF 바이트)
+PROCESSOR_LIMITS = {
+    "OCR": {
+        "max_pages": int(os.getenv("OCR_MAX_PAGES_PER_REQUEST", "15")),
+        "max_bytes": int(os.getenv("OCR_MAX_BYTES_PER_REQUEST", str(20 * 1024 ** 2))),
+    },
+    "LAYOUT": {
+        "max_pages": int(os.getenv("LAYOUT_MAX_PAGES_PER_REQUEST", "15")),
+        "max_bytes": int(os.getenv("LAYOUT_MAX_BYTES_PER_REQUEST", str(20 * 1024 ** 2))),
+    },
+    "FORM": {
+        "max_pages": int(os.getenv("FORM_MAX_PAGES_PER_REQUEST", "15")),
+        "max_bytes": int(os.getenv("FORM_MAX_BYTES_PER_REQUEST", str(20 * 1024 ** 2))),
+    },
+}
+
+# 중복 페이지 감지 (고유 페이지만 OCR 후 중복 위치로 결과 복제)
+# 지각 해시 거리 임계값(0~256비트)을 올리면 재스캔본 같은 근사 중복도 묶지만,
+# 쪽번호만 다른 간지 슬라이드도 같은 OCR 텍스트를 공유하게 됨
+PAGE_DEDUP_ENABLED = os.getenv("DOCAI_PAGE_DEDUP", "true").lower() in ("1", "true", "yes")
+PAGE_DEDUP_RENDER_DPI = int(os.getenv("DOCAI_PAGE_DEDUP_DPI", "36"))
+PAGE_DEDUP_MAX_DISTANCE = int(os.getenv("DOCAI_PAGE_DEDUP_MAX_DISTANCE", "0"))
+
+# 텍스트 레이어 우선 경로 (텍스트 레이어가 온전한 페이지는 Document AI 호출 없이 로컬 추출)
+TEXT_LAYER_ENABLED = os.getenv("DOCAI_TEXT_LAYER", "true").lower() in ("1", "true", "yes")
+TEXT_LAYER_MIN_CHARS = int(os.getenv("DOCAI_TEXT_LAYER_MIN_CHARS", "10"))
+TEXT_LAYER_MAX_GARBAGE_RATIO = float(os.getenv("DOCAI_TEXT_LAYER_MAX_GARBAGE_RATIO", "0.05"))
+TEXT_LAYER_MAX_IMAGE_COVERAGE = float(os.getenv("DOCAI_TEXT_LAYER_MAX_IMAGE_COVERAGE", "0.5"))
+
+# OCR 프로파일 (full / layout / lean) - 요청 옵션과 강화 후 결과 프루닝 범위 (profiles.py)
+OCR_PROFILE = os.getenv("DOCAI_OCR_PROFILE", "layout")
@@ -0,0 +1,202 @@
+"""
+중복 페이지 감지 + OCR 결과 팬아웃
+
+피치덱은 간지/템플릿 슬라이드가 반복되고, 일괄 제출본은 같은 부록 페이지를 공유하는 경우가 많다.
+Document AI 호출 전에 페이지마다 지문을 만들어 고유 페이지만 OCR하고,
+OCR 결과를 중복 페이지 위치로 다시 복제(팬아웃)한 뒤 섹션 감지/병합 단계로 넘긴다.
+
+페이지 지문
+- 콘텐츠 해시: 페이지 콘텐츠 스트림 + 리소스(이미지 XObject는 원본 스트림 데이터, 나머지는 객체 id)의 SHA-256
+- 지각 해시: 저해상도로 렌더링한 페이지의 dHash (렌더링 불가 시 콘텐츠 해시만 사용)
+
+콘텐츠 해시가 같거나 지각 해시 해밍 거리가 임계값 이하이면 같은 페이지로 본다.
+"""
+
+import copy
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+from src.utils.io_utils import read_artifact
+from src.docs_analysis.document_ai.pages import PageEntry, assemble_pages, page_entries
+
+# dHash 격자 크기 (hash_size × hash_size 비트)
+PHASH_SIZE = 16
+
+
+def _hash_resource(digest, obj, depth: int = 0):
+    """리소스 트리를 해시에 반영 (스트림은 원본 데이터, 간접 객체는 스트림이 아니면 id만)"""
+
+    if isinstance(obj, IndirectObject):
+        resolved = obj.get_object()
+        if isinstance(resolved, StreamObject):
+            data = getattr(resolved, "_data", b"") or b""
+            digest.update(b"S" + hashlib.sha256(data).digest())
+        else:
+            # 같은 PDF 안에서 같은 폰트/그래픽 상태 객체는 같은 id를 공유
+            digest.update(f"R{obj.idnum}:{obj.generation}".encode())
+    elif isinstance(obj, DictionaryObject) and depth < 2:
+        for key in sorted(obj.keys()):
+            digest.update(str(key).encode())
+            _hash_resource(digest, obj[key], depth + 1)
+    elif isinstance(obj, ArrayObject):
+        for item in obj:
+            _hash_resource(digest, item, depth + 1)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def content_hashes(input_pdf: str) -> List[str]:
+    """페이지별 콘텐츠 스트림 + 리소스 해시"""
+
+    reader = PdfReader(input_pdf)
+    hashes = []
+    for page in reader.pages:
+        digest = hashlib.sha256()
+        contents = page.get_contents()
+        digest.update(contents.get_data() if contents is not None else b"")
+        resources = page.get("/Resources")
+        if resources is not None:
+            _hash_resource(digest, resources.get_object())
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
+def dhash(image, hash_size: int = PHASH_SIZE) -> np.ndarray:
+    """dHash: 축소한 흑백 이미지에서 가로로 이웃한 픽셀 밝기 비교 (bool[hash_size * hash_size])"""
+
+    from PIL import Image
+
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    return (pixels[:, 1:] > pixels[:, :-1]).ravel()
+
+
+def perceptual_hashes(input_pdf: str, dpi: int) -> Optional[List[np.ndarray]]:
+    """페이지별 지각 해시 (poppler가 없어 렌더링할 수 없으면 None)"""
+
+    try:
+        from pdf2image import convert_from_path
+        images = convert_from_path(input_pdf, dpi=dpi, grayscale=True)
+    except Exception as e:
+        print(f"  ⚠️ 페이지 렌더링 실패 - 콘텐츠 해시만 사용: {type(e).__name__}: {e}")
+        return None
+    return [dhash(image) for image in images]
+
+
+def find_duplicate_pages(
+    hashes: Sequence[str],
+    phashes: Optional[Sequence[np.ndarray]] = None,
+    max_distance: int = 0
+) -> List[int]:
+    """
+    페이지별 대표 페이지 인덱스 (대표 = 같은 지문을 가진 첫 페이지, 고유 페이지는 자기 자신)
+
+    Returns:
+        canonical: canonical[i] == i 이면 고유 페이지, 아니면 canonical[i] 페이지의 중복
+    """
+    canonical: List[int] = []
+    by_hash: Dict[str, int] = {}
+    unique_pages: List[int] = []
+    unique_bits: List[np.ndarray] = []
+
+    for idx, page_hash in enumerate(hashes):
+        match = by_hash.get(page_hash)
+
+        if match is None and phashes is not None and unique_bits:
+            distances = np.count_nonzero(np.stack(unique_bits) != phashes[idx], axis=1)
+            nearest = int(distances.argmin())
+            if distances[nearest] <= max_distance:
+                match = unique_pages[nearest]
+
+        if match is None:
+            match = idx
+            unique_pages.append(idx)
+            if phashes is not None:
+                unique_bits.append(phashes[idx])
+
+        by_hash.setdefault(page_hash, match)
+        canonical.append(match)
+
+    return canonical
+
+
+def fingerprint_pdf(input_pdf: str, dpi: int, max_distance: int) -> List[int]:
+    """PDF 페이지 지문을 만들어 대표 페이지 인덱스 목록 반환"""
+    return find_duplicate_pages(content_hashes(input_pdf), perceptual_hashes(input_pdf, dpi), max_distance)
+
+
+def dedup_summary(canonical: Sequence[int]) -> Dict:
+    """중복 제거 통계 (페이지 번호는 1부터)"""
+
+    total = len(canonical)
+    duplicates = {str(idx + 1): rep + 1 for idx, rep in enumerate(canonical) if rep != idx}
+    return {
+        "total_pages": total,
+        "unique_pages": total - len(duplicates),
+        "duplicate_pages": len(duplicates),
+        "dedup_ratio": round(len(duplicates) / total, 4) if total else 0.0,
+        "duplicates": duplicates,
+    }
+
+
+def fan_out_chunks(
+    chunk_results: Iterable,
+    chunk_pages: Sequence[Sequence[int]],
+    canonical: Sequence[int]
+) -> Iterable[Tuple[int, Dict]]:
+    """
+    고유 페이지만 OCR한 청크 결과를 원본 페이지 순서로 펼침 (청크 순서대로 하나씩 생성)
+
+    Args:
+        chunk_results: 청크별 OCR 결과 dict 또는 JSON 경로 (청크 순서)
+        chunk_pages: 청크별로 OCR에 보낸 원본 페이지 인덱스 (고유 페이지, 오름차순)
+        canonical: find_duplicate_pages 결과
+
+    출력 청크 k는 원본 페이지 [청크 k 첫 페이지, 청크 k+1 첫 페이지)를 담는다.
+    중복 페이지는 대표 페이지의 OCR 트리를 복사하고 텍스트를 이어 붙인 뒤
+    textAnchor를 새 위치로 옮기며, duplicate_of(대표 페이지 번호, 1부터)를 기록한다.
+    중복이 끼어들지 않은 청크는 OCR 결과를 그대로 넘긴다.
+
+    Returns:
+        (청크 번호(1부터), 펼친 결과 dict)
+    """
+    total_pages = len(canonical)
+    firsts = [pages[0] for pages in chunk_pages] + [total_pages]
+
+    # 뒤쪽 청크에서 다시 쓰일 대표 페이지만 보관 (원본 페이지 → (페이지 트리, 텍스트, 원래 시작 오프셋))
+    referenced = {rep for idx, rep in enumerate(canonical) if rep != idx}
+    kept: Dict[int, PageEntry] = {}
+
+    for part, (result, sent) in enumerate(zip(chunk_results, chunk_pages), 1):
+        if isinstance(result, str):
+            result = read_artifact(result)
+
+        local: Dict[int, PageEntry] = {}
+        for orig, (page, page_text, start) in zip(sent, page_entries(result)):
+            local[orig] = (page, page_text, start)
+            if orig in referenced:
+                # 이후 단계가 페이지 트리를 수정해도 영향받지 않도록 복사본 보관
+                kept[orig] = (copy.deepcopy(page), page_text, start)
+
+        lo, hi = firsts[part - 1], firsts[part]
+        if list(sent) == list(range(lo, hi)):
+            yield part, result
+            continue
+
+        entries = []
+        for orig in range(lo, hi):
+            rep = canonical[orig]
+            page, page_text, start = local[rep] if rep in local else kept[rep]
+            if rep != orig:
+                page = copy.deepcopy(page)
+                page["duplicate_of"] = rep + 1
+            entries.append((page, page_text, start))
+
+        base = {k: v for k, v in result.items() if k in ("mimeType", "uri")}
+        if "ocr_profile" in result:
+            base["ocr_profile"] = dict(result["ocr_profile"])
+        yield part, assemble_pages(entries, base)
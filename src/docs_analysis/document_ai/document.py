@@ -0,0 +1,80 @@
+"""
+페이지 단위로 읽는 Document AI 결과 (샤드 산출물 위의 지연 로딩 뷰)
+
+병합 결과는 text / metadata / detected_sections 같은 최상위 키(헤더)와
+페이지별 레코드로 나눠 저장된다 (io_utils.save_artifact_shards).
+Document는 헤더만 메모리에 두고 pages는 접근할 때마다 한 페이지씩 파일에서 읽으며
+읽은 페이지를 보관하지 않는다. dict처럼 doc["text"], doc.get("pages", [])로 쓸 수 있어
+기존 소비자(토큰 테이블, 슬라이드 추출, 문서 타입 감지)는 그대로 동작하고,
+pages를 순회하면 메모리는 페이지 1개 분량만 쓴다.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, Union
+
+from src.utils.io_utils import ShardedArtifact, is_sharded_artifact, read_artifact
+
+
+class PageSequence(Sequence):
+    """페이지 목록 뷰 (인덱싱/순회 시마다 해당 페이지 레코드를 읽음)"""
+
+    def __init__(self, store: ShardedArtifact):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.read_item(i) for i in range(*index.indices(len(self)))]
+        return self._store.read_item(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self._store.iter_items()
+
+    def __repr__(self) -> str:
+        return f"PageSequence({len(self)} pages)"
+
+
+class Document(Mapping):
+    """샤드로 저장된 Document AI 결과의 읽기 전용 dict 뷰"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._store = ShardedArtifact(path)
+        self._header = self._store.header
+        self.pages = PageSequence(self._store)
+
+    def __getitem__(self, key: str):
+        if key == self._store.key:
+            return self.pages
+        return self._header[key]
+
+    def __iter__(self):
+        yield self._store.key
+        yield from self._header
+
+    def __len__(self) -> int:
+        return len(self._header) + 1
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.pages)
+
+    def page(self, index: int) -> Dict:
+        """0부터 시작하는 페이지 인덱스로 페이지 트리 하나만 읽음"""
+        return self.pages[index]
+
+    def to_dict(self) -> Dict:
+        """전체 문서를 메모리에 복원"""
+        return self._store.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Document({self.path!r}, {self.num_pages} pages)"
+
+
+def load_document(path: str) -> Union[Document, Dict]:
+    """OCR 결과 로드 (샤드 산출물이면 지연 로딩 Document, 아니면 전체 dict)"""
+    if is_sharded_artifact(path):
+        return Document(path)
+    return read_artifact(path)
@@ -0,0 +1,127 @@
+"""
+청크 단위 Document AI 요청 병렬 실행기
+(동시 요청 수 제한 + 지터 백오프 재시도 + 청크 순서 보존)
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from google.api_core import exceptions as gexc
+
+from src.docs_analysis.document_ai.config import (
+    MAX_CONCURRENT_REQUESTS,
+    MAX_RETRIES,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+
+T = TypeVar("T")
+
+# 일시적인 오류로 보고 재시도할 예외들
+RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    gexc.ServiceUnavailable,
+    gexc.DeadlineExceeded,
+    gexc.TooManyRequests,
+    gexc.ResourceExhausted,
+    gexc.InternalServerError,
+    gexc.BadGateway,
+    gexc.GatewayTimeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """지수 백오프 + full jitter 대기 시간 계산 (attempt는 0부터)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    label: str = "",
+    max_retries: int = MAX_RETRIES,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+) -> T:
+    """재시도 가능한 오류일 때 지터 백오프로 fn을 다시 호출"""
+
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except retry_on as e:
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            attempt += 1
+            print(f"  🔁 {label} 재시도 {attempt}/{max_retries} ({type(e).__name__}, {delay:.1f}초 대기)")
+            time.sleep(delay)
+
+
+def run_chunks_concurrently(
+    tasks: Iterable[Callable[[], T]],
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    max_retries: int = MAX_RETRIES,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS,
+) -> List[T]:
+    """
+    청크 작업들을 최대 max_workers개까지 동시에 실행하고 입력 순서대로 결과 반환
+
+    Args:
+        tasks: 인자 없는 호출 가능 객체들 (제너레이터도 가능 - 필요한 만큼만 꺼내 씀)
+        max_workers: 동시에 진행할 최대 요청 수
+        max_retries: 청크당 최대 재시도 횟수
+        base_delay / max_delay: 지터 백오프 기본/최대 대기 시간(초)
+        retry_on: 재시도 대상 예외 타입
+
+    Returns:
+        tasks 순서와 같은 순서의 결과 리스트.
+        하나라도 최종 실패하면 나머지 청크가 끝난 뒤 첫 번째 실패를 RuntimeError로 전달
+    """
+    max_workers = max(1, max_workers)
+
+    # 제출 대기열을 제한해 제너레이터 입력이 한꺼번에 메모리에 올라오지 않도록 함
+    window = threading.BoundedSemaphore(max_workers * 2)
+    futures = []
+
+    def _run(idx: int, fn: Callable[[], T]) -> T:
+        try:
+            return call_with_retry(
+                fn,
+                label=f"청크 {idx}",
+                max_retries=max_retries,
+                base_delay=base_delay,
+                max_delay=max_delay,
+                retry_on=retry_on,
+            )
+        finally:
+            window.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="docai-chunk") as pool:
+        for idx, fn in enumerate(tasks, 1):
+            window.acquire()
+            futures.append(pool.submit(_run, idx, fn))
+
+    results: List[T] = []
+    first_error: Optional[Tuple[int, BaseException]] = None
+
+    for idx, future in enumerate(futures, 1):
+        error = future.exception()
+        if error is not None:
+            print(f"  ❌ 청크 {idx} 최종 실패: {error}")
+            if first_error is None:
+                first_error = (idx, error)
+            continue
+        results.append(future.result())
+
+    if first_error is not None:
+        idx, error = first_error
+        raise RuntimeError(f"❌ 청크 {idx} 처리 실패: {error}") from error
+
+    return results
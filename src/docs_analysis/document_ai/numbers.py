@@ -0,0 +1,180 @@
+"""
+숫자/통계 데이터 단일 패스 추출기
+
+하나의 결합 정규식으로 전체 텍스트를 한 번만 훑으면서
+화폐(억/조/만), 백분율, 수량(개/대/명)을 분류하고
+단위를 반영한 정규화 값(예: 3.5억 → 350000000)을 계산한다.
+결과는 NumPy 배열(컬럼) 형태로 보관해 합계/통계를 문자열 재탐색 없이 계산할 수 있다.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+NUMBER_CATEGORIES = ("currency", "percentage", "quantity")
+CATEGORY_CODES = {name: code for code, name in enumerate(NUMBER_CATEGORIES)}
+
+SCALE_FACTORS = {
+    "조": 1_000_000_000_000,
+    "억": 100_000_000,
+    "만": 10_000,
+}
+
+# 결합 패턴: 숫자 뒤에 오는 단위로 카테고리 결정
+#   - %                 → percentage
+#   - [조억만]? + 개/대/명 → quantity (배수와 단위는 붙어 있어야 함: "3억개"는 수량, "3억 개"는 화폐)
+#   - [조억만] + 원?       → currency
+# "대"는 대비/대상/대체처럼 다음 단어의 첫 글자일 때 수량 단위로 보지 않음 ("100억 대비"는 화폐)
+NUMBER_SCANNER = re.compile(
+    r"""
+    (?P<num>\d+(?:,\d{3})*(?:\.\d+)?)\s*
+    (?:
+        (?P<pct>%)
+      | (?P<qscale>[조억만])?(?P<qunit>[개명]|대(?![비상체]))
+      | (?P<scale>[조억만])(?:\s*원)?
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+def page_start_offsets(pages: Sequence[Dict]) -> np.ndarray:
+    """페이지별 텍스트 시작 오프셋 (textAnchor 기준, 없으면 이전 페이지 값 유지)"""
+
+    starts = np.zeros(len(pages), dtype=np.int64)
+    last = 0
+    for idx, page in enumerate(pages):
+        segments = page.get("layout", {}).get("textAnchor", {}).get("textSegments", [])
+        if segments:
+            last = min(int(seg.get("startIndex", 0)) for seg in segments)
+        starts[idx] = last
+    return starts
+
+
+def scan_numbers(full_text: str, page_starts: Optional[np.ndarray] = None) -> Dict:
+    """
+    텍스트를 한 번 훑어 숫자 표현을 컬럼 배열로 반환
+
+    Returns:
+        {
+            "category": int8[N]   (NUMBER_CATEGORIES 인덱스),
+            "value": float64[N]   (단위 반영 정규화 값),
+            "start": int64[N], "end": int64[N]  (문자 오프셋),
+            "page": int32[N]      (0부터, 페이지 정보 없으면 -1),
+            "text": List[str], "raw": List[str]  (원문 / 숫자 부분)
+        }
+    """
+
+    categories: List[int] = []
+    values: List[float] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    texts: List[str] = []
+    raws: List[str] = []
+
+    currency = CATEGORY_CODES["currency"]
+    percentage = CATEGORY_CODES["percentage"]
+    quantity = CATEGORY_CODES["quantity"]
+
+    for match in NUMBER_SCANNER.finditer(full_text):
+        raw = match.group("num")
+        number = float(raw.replace(",", ""))
+
+        if match.group("pct"):
+            categories.append(percentage)
+            values.append(number)
+        elif match.group("qunit"):
+            categories.append(quantity)
+            values.append(number * SCALE_FACTORS.get(match.group("qscale"), 1))
+        else:
+            categories.append(currency)
+            values.append(number * SCALE_FACTORS[match.group("scale")])
+
+        starts.append(match.start())
+        ends.append(match.end())
+        texts.append(match.group(0))
+        raws.append(raw)
+
+    start_arr = np.asarray(starts, dtype=np.int64)
+    if page_starts is not None and len(page_starts):
+        pages = np.searchsorted(page_starts, start_arr, side="right").astype(np.int32) - 1
+        pages[pages < 0] = 0
+    else:
+        pages = np.full(len(starts), -1, dtype=np.int32)
+
+    return {
+        "category": np.asarray(categories, dtype=np.int8),
+        "value": np.asarray(values, dtype=np.float64),
+        "start": start_arr,
+        "end": np.asarray(ends, dtype=np.int64),
+        "page": pages,
+        "text": texts,
+        "raw": raws,
+    }
+
+
+def numbers_to_dict(table: Dict) -> Dict[str, List[Dict]]:
+    """컬럼 배열 → 기존 extracted_numbers 형식 (카테고리별 dict 리스트)"""
+
+    extracted = {name: [] for name in NUMBER_CATEGORIES}
+    quantity = CATEGORY_CODES["quantity"]
+
+    for i, code in enumerate(table["category"].tolist()):
+        raw = table["raw"][i]
+        extracted[NUMBER_CATEGORIES[code]].append({
+            "text": table["text"][i],
+            "value": raw.replace(",", "") if code == quantity else raw,
+            "normalized": float(table["value"][i]),
+            "position": int(table["start"][i]),
+            "page": int(table["page"][i]) + 1,
+        })
+
+    return extracted
+
+
+def numbers_from_dict(extracted: Dict[str, List[Dict]]) -> Dict:
+    """저장된 extracted_numbers → 컬럼 배열 (정규화 값이 없는 옛 결과는 다시 계산)"""
+
+    categories: List[int] = []
+    values: List[float] = []
+    starts: List[int] = []
+    pages: List[int] = []
+
+    for name in NUMBER_CATEGORIES:
+        code = CATEGORY_CODES[name]
+        for item in extracted.get(name, []):
+            normalized = item.get("normalized")
+            if normalized is None:
+                match = NUMBER_SCANNER.search(item.get("text", ""))
+                if match is None:
+                    continue
+                normalized = scan_numbers(match.group(0))["value"][0]
+            categories.append(code)
+            values.append(float(normalized))
+            starts.append(int(item.get("position", 0)))
+            pages.append(int(item.get("page", 0)) - 1)
+
+    return {
+        "category": np.asarray(categories, dtype=np.int8),
+        "value": np.asarray(values, dtype=np.float64),
+        "start": np.asarray(starts, dtype=np.int64),
+        "page": np.asarray(pages, dtype=np.int32),
+    }
+
+
+def summarize_numbers(table: Dict) -> Dict:
+    """카테고리별 개수/합계/통계 (문자열 재탐색 없이 배열 연산으로 계산)"""
+
+    summary = {}
+    for name in NUMBER_CATEGORIES:
+        mask = table["category"] == CATEGORY_CODES[name]
+        values = table["value"][mask]
+        count = int(values.size)
+        summary[name] = {
+            "count": count,
+            "total": float(values.sum()) if count else 0.0,
+            "max": float(values.max()) if count else 0.0,
+            "mean": float(values.mean()) if count else 0.0,
+        }
+    return summary
@@ -0,0 +1,90 @@
+"""
+Document AI 페이지 트리 이어 붙이기 유틸
+
+청크 병합, 중복 페이지 팬아웃, 텍스트 레이어 결과 합치기는 모두
+"페이지 트리 + 그 페이지의 텍스트"를 순서대로 이어 붙이고 textAnchor를 새 위치로 옮기는 작업이다.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (페이지 트리, 페이지 텍스트, 원래 문서에서 페이지 텍스트 시작 오프셋)
+PageEntry = Tuple[Dict, str, int]
+
+
+def _shift_index(value, offset: int):
+    """textSegment 인덱스 이동 (Document AI JSON은 int64를 문자열로 직렬화하므로 타입 유지)"""
+    shifted = int(value) + offset
+    return str(shifted) if isinstance(value, str) else shifted
+
+
+def rebase_text_anchors(node, offset: int):
+    """
+    node 아래의 모든 textAnchor 세그먼트 인덱스를 offset만큼 이동
+    (청크 텍스트를 이어 붙인 뒤에도 full_text를 올바르게 slicing하도록)
+    """
+    if not offset:
+        return node
+
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            anchor = current.get("textAnchor")
+            if isinstance(anchor, dict):
+                for segment in anchor.get("textSegments", []):
+                    # 0인 인덱스는 JSON에서 생략되므로 기본값 0으로 처리
+                    segment["startIndex"] = _shift_index(segment.get("startIndex", "0"), offset)
+                    segment["endIndex"] = _shift_index(segment.get("endIndex", "0"), offset)
+            stack.extend(v for k, v in current.items() if k != "textAnchor" and isinstance(v, (dict, list)))
+        elif isinstance(current, list):
+            stack.extend(v for v in current if isinstance(v, (dict, list)))
+
+    return node
+
+
+def page_entries(doc_dict: Dict) -> List[PageEntry]:
+    """
+    문서를 페이지 단위 (페이지 트리, 텍스트, 시작 오프셋)로 나눔
+    페이지 텍스트 구간은 [페이지 시작, 다음 페이지 시작)이며 첫 페이지는 0부터 시작
+    (페이지 사이 문자도 빠짐없이 어느 한 페이지에 포함됨)
+    """
+    text = doc_dict.get("text", "")
+    pages = doc_dict.get("pages", [])
+
+    starts = []
+    last = 0
+    for page in pages:
+        segments = page.get("layout", {}).get("textAnchor", {}).get("textSegments", [])
+        if segments:
+            last = min(int(seg.get("startIndex", 0)) for seg in segments)
+        starts.append(last)
+    if starts:
+        starts[0] = 0
+    ends = starts[1:] + [len(text)]
+
+    return [(page, text[start:end], start) for page, start, end in zip(pages, starts, ends)]
+
+
+def assemble_pages(entries: Iterable[PageEntry], base: Optional[Dict] = None) -> Dict:
+    """
+    페이지 항목들을 순서대로 이어 붙여 하나의 문서로 만듦
+    (페이지 트리는 그 자리에서 수정됨 - textAnchor 이동, pageNumber 1부터 다시 매김)
+
+    Args:
+        base: 결과 문서에 그대로 옮길 최상위 키 (mimeType 등)
+    """
+    texts: List[str] = []
+    pages: List[Dict] = []
+    offset = 0
+
+    for page, page_text, start in entries:
+        rebase_text_anchors(page, offset - start)
+        page["pageNumber"] = len(pages) + 1
+        pages.append(page)
+        texts.append(page_text)
+        offset += len(page_text)
+
+    doc = dict(base or {})
+    doc["text"] = "".join(texts)
+    doc["pages"] = pages
+    return doc
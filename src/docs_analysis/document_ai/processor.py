@@ -3,15 +3,53 @@ Document AI API 호출 + 강화 기능
 """
 
 import json
-import re
 import os
 from typing import Dict, List, Optional
 from google.cloud import documentai_v1beta3 as documentai
 
 # 기존 유틸 임포트 (그대로 가져와서 사용)
-from src.utils.io_utils import save_json, read_json, read_bytes
-from src.utils.pdf_split import split_pdf
-from src.docs_analysis.document_ai.config import PROJECT_ID, LOCATION, PROCESSORS
+from src.utils.io_utils import SHARD_EXTENSION, save_artifact, save_artifact_shards, read_artifact, read_bytes
+from src.utils.pdf_split import (
+    count_pdf_pages,
+    chunk_file_name,
+    iter_pdf_chunks,
+    plan_pdf_chunks,
+    print_chunk_plan,
+)
+from src.utils.disk_cache import sha256_file
+from src.docs_analysis.document_ai.config import (
+    PROJECT_ID,
+    LOCATION,
+    PROCESSORS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_RETRIES,
+    PROCESSOR_LIMITS,
+    PAGE_DEDUP_ENABLED,
+    PAGE_DEDUP_RENDER_DPI,
+    PAGE_DEDUP_MAX_DISTANCE,
+    TEXT_LAYER_ENABLED,
+    TEXT_LAYER_MIN_CHARS,
+    TEXT_LAYER_MAX_GARBAGE_RATIO,
+    TEXT_LAYER_MAX_IMAGE_COVERAGE,
+    OCR_PROFILE,
+)
+from src.docs_analysis.document_ai.executor import run_chunks_concurrently
+from src.docs_analysis.document_ai.cache import OCRCache, get_ocr_cache, ocr_cache_key
+from src.docs_analysis.document_ai.checkpoint import ChunkManifest
+from src.docs_analysis.document_ai.clients import get_client
+from src.docs_analysis.document_ai.dedup import fingerprint_pdf, dedup_summary, fan_out_chunks
+from src.docs_analysis.document_ai.pages import rebase_text_anchors
+from src.docs_analysis.document_ai.profiles import get_profile, prune_document
+from src.docs_analysis.document_ai.text_layer import TEXT_SOURCE_LAYER, read_text_layers, combine_with_ocr
+from src.docs_analysis.document_ai.numbers import (
+    scan_numbers,
+    page_start_offsets,
+    numbers_to_dict,
+    numbers_from_dict,
+    summarize_numbers,
+)
+from src.docs_analysis.document_ai.sections import KeywordAutomaton, rank_sections, UNKNOWN_SECTION
+from src.docs_analysis.document_ai.token_table import TokenTable, token_table_path
 
 
 # 섹션 감지 패턴
@@ -29,43 +67,63 @@ SECTION_KEYWORDS = {
     "growth": ["growth", "성장", "확장", "계획", "roadmap", "milestone"],
 }
 
-
-# 숫자 추출 패턴
-NUMBER_PATTERNS = {
-    "currency_korean": [
-        r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*억\s*원?",
-        r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*조\s*원?",
-        r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*만\s*원?",
-    ],
-    "percentage": [
-        r"(\d+(?:\.\d+)?)\s*%",
-    ],
-    "quantity": [
-        r"(\d+(?:,\d{3})*)\s*억?\s*개",
-        r"(\d+(?:,\d{3})*)\s*대",
-        r"(\d+(?:,\d{3})*)\s*명",
-    ],
-}
+# 전체 키워드로 한 번만 만들어 두는 다중 패턴 오토마톤
+SECTION_AUTOMATON = KeywordAutomaton(SECTION_KEYWORDS)
 
 
 def process_document(
     file_path: str,
     processor_type: str,
     output_path: str,
-    enable_enhancement: bool = True
+    enable_enhancement: bool = True,
+    client=None,
+    use_cache: bool = True,
+    content: Optional[bytes] = None,
+    profile: str = OCR_PROFILE,
+    cache: Optional[OCRCache] = None
 ) -> Dict:
-    """Document AI API 호출 + 강화 기능"""
+    """Document AI API 호출 + 강화 기능
+
+    client를 넘기지 않으면 프로세스 전역 공유 클라이언트를 사용
+    (테스트용 가짜 클라이언트도 넘길 수 있음).
+    use_cache=True면 같은 내용/옵션의 PDF는 API 호출 없이 캐시 결과를 반환.
+    cache를 넘기지 않으면 프로세스 전역 캐시(OCR_CACHE_DIR)를 사용 (테스트/벤치마크는 임시 디렉토리 캐시를 넘김).
+    content(PDF bytes)를 넘기면 파일을 읽지 않고 그대로 업로드 (file_path는 로그 표시용).
+    OCR 프로세서는 profile(full/layout/lean)에 따라 요청 옵션을 정하고 강화 후 결과를 프루닝함
+    """
     
     processor_id = PROCESSORS[processor_type]
     
-    client = documentai.DocumentProcessorServiceClient()
+    if content is None:
+        # 기존 유틸 사용
+        content = read_bytes(file_path)
+    
+    ocr_options = get_profile(profile)["ocr_options"] if processor_type == "OCR" else {}
+    if not use_cache:
+        cache = None
+    elif cache is None:
+        cache = get_ocr_cache()
+    cache_key = ocr_cache_key(
+        content,
+        processor_type,
+        ocr_options,
+        enable_enhancement,
+        profile if processor_type == "OCR" else None
+    )
+    
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡️ [{processor_type}] 캐시 적중: {file_path} - API 호출 생략")
+            save_artifact(cached, output_path)
+            return cached
+    
+    if client is None:
+        client = get_client(processor_type, LOCATION)
     name = client.processor_path(PROJECT_ID, LOCATION, processor_id)
     
     print(f"📄 [{processor_type}] {file_path} 분석 시작...")
     
-    # 기존 유틸 사용
-    content = read_bytes(file_path)
-    
     raw_document = documentai.RawDocument(
         content=content,
         mime_type="application/pdf",
@@ -74,12 +132,7 @@ def process_document(
     # OCR 옵션 강화
     if processor_type == "OCR":
         process_options = documentai.ProcessOptions(
-            ocr_config=documentai.OcrConfig(
-                compute_style_info=True,
-                enable_native_pdf_parsing=True,
-                enable_image_quality_scores=True,
-                enable_symbol=True,
-            )
+            ocr_config=documentai.OcrConfig(**ocr_options)
         )
         request = documentai.ProcessRequest(
             name=name,
@@ -100,93 +153,326 @@ def process_document(
     
     # 강화 기능 적용
     if enable_enhancement:
-        print(f"🔧 강화 기능 적용 중...")
-        doc_dict = detect_sections(doc_dict)
-        doc_dict = extract_numbers(doc_dict)
-        doc_dict = generate_metadata(doc_dict)
-        
-        print(f"✅ 강화 완료: {len(doc_dict.get('detected_sections', []))}개 섹션, "
-              f"{sum(len(v) for v in doc_dict.get('extracted_numbers', {}).values())}개 숫자 추출")
+        doc_dict = enhance_document(doc_dict)
+    
+    if processor_type == "OCR":
+        doc_dict = apply_ocr_profile(doc_dict, profile)
+    
+    if cache is not None:
+        cache.put(cache_key, doc_dict)
     
     # 기존 유틸 사용
-    save_json(doc_dict, output_path)
+    save_artifact(doc_dict, output_path)
     print(f"✅ [{processor_type}] 결과 저장 완료 → {output_path}\n")
     
     return doc_dict
 
 
+def _read_text_layers(file_path: str, page_indices: List[int]) -> Dict:
+    """텍스트 레이어를 쓸 수 있는 페이지 추출 (config 기준값 적용)"""
+    
+    layers = read_text_layers(
+        file_path,
+        page_indices,
+        min_chars=TEXT_LAYER_MIN_CHARS,
+        max_garbage_ratio=TEXT_LAYER_MAX_GARBAGE_RATIO,
+        max_image_coverage=TEXT_LAYER_MAX_IMAGE_COVERAGE,
+    )
+    if layers:
+        print(f"  📝 텍스트 레이어 사용 {len(layers)}페이지 → "
+              f"Document AI 대상 {len(page_indices) - len(layers)}페이지")
+    return layers
+
+
+def process_pdf_ocr(
+    file_path: str,
+    output_path: str,
+    enable_enhancement: bool = True,
+    client=None,
+    use_text_layer: bool = TEXT_LAYER_ENABLED,
+    profile: str = OCR_PROFILE,
+    use_cache: bool = True,
+    cache: Optional[OCRCache] = None
+) -> Dict:
+    """PDF OCR (단일 요청)
+
+    use_text_layer=True면 텍스트 레이어가 온전한 페이지는 PyPDF2로 로컬 추출하고
+    스캔/이미지 페이지만 Document AI로 보낸 뒤, 두 결과를 페이지 순서대로 합쳐
+    Document AI 결과와 같은 모양으로 반환함 (모든 페이지를 로컬 처리하면 API 호출 없음)
+    use_cache/cache는 process_document에 그대로 전달
+    """
+    
+    total_pages = count_pdf_pages(file_path)
+    layers = _read_text_layers(file_path, list(range(total_pages))) if use_text_layer else {}
+    
+    if not layers:
+        return process_document(
+            file_path=file_path,
+            processor_type="OCR",
+            output_path=output_path,
+            enable_enhancement=enable_enhancement,
+            client=client,
+            profile=profile,
+            use_cache=use_cache,
+            cache=cache
+        )
+    
+    ocr_pages = [idx for idx in range(total_pages) if idx not in layers]
+    ocr_result = None
+    if ocr_pages:
+        _, content = next(iter_pdf_chunks(file_path, [(1, ocr_pages)]))
+        ocr_result = process_document(
+            file_path=file_path,
+            processor_type="OCR",
+            output_path=output_path,
+            enable_enhancement=False,
+            client=client,
+            content=content,
+            profile=profile,
+            use_cache=use_cache,
+            cache=cache
+        )
+    
+    doc_dict = combine_with_ocr(range(total_pages), layers, ocr_result)
+    if enable_enhancement:
+        doc_dict = enhance_document(doc_dict)
+    doc_dict = apply_ocr_profile(doc_dict, profile)
+    
+    save_artifact(doc_dict, output_path)
+    print(f"✅ [OCR] 결과 저장 완료 → {output_path}\n")
+    
+    return doc_dict
+
+
+def enhance_document(doc_dict: Dict) -> Dict:
+    """강화 기능 적용 (섹션 감지 → 숫자 추출 → 메타데이터)"""
+    
+    print(f"🔧 강화 기능 적용 중...")
+    doc_dict = detect_sections(doc_dict)
+    doc_dict = extract_numbers(doc_dict)
+    doc_dict = generate_metadata(doc_dict)
+    
+    print(f"✅ 강화 완료: {len(doc_dict.get('detected_sections', []))}개 섹션, "
+          f"{sum(len(v) for v in doc_dict.get('extracted_numbers', {}).values())}개 숫자 추출")
+    return doc_dict
+
+
+def apply_ocr_profile(doc_dict: Dict, profile: str) -> Dict:
+    """강화가 끝난 결과에서 프로파일이 제거하는 트리를 지우고 절감량을 ocr_profile에 누적"""
+    
+    saved = prune_document(doc_dict, profile)
+    stats = doc_dict.setdefault("ocr_profile", {"profile": profile, "pruned_bytes": 0})
+    stats["profile"] = profile
+    stats["pruned_bytes"] += saved
+    
+    if saved:
+        print(f"✂️ OCR 프로파일 '{profile}': 결과 {saved / 1024 ** 2:.2f}MB 절감")
+    return doc_dict
+
+
 def process_pdf_ocr_in_chunks(
     file_path: str,
     output_dir: str,
-    pages_per_chunk: int = 15,
-    enable_enhancement: bool = True
-) -> List[Dict]:
-    """대용량 PDF를 청크로 나누어 OCR 처리"""
+    pages_per_chunk: Optional[int] = None,
+    enable_enhancement: bool = True,
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    max_retries: int = MAX_RETRIES,
+    client=None,
+    return_paths: bool = False,
+    keep_chunk_files: bool = False,
+    dedup_pages: bool = PAGE_DEDUP_ENABLED,
+    use_text_layer: bool = TEXT_LAYER_ENABLED,
+    profile: str = OCR_PROFILE,
+    use_cache: bool = True,
+    cache: Optional[OCRCache] = None
+) -> List:
+    """대용량 PDF를 청크로 나누어 OCR 처리 (동시 요청 수 제한 병렬 처리)
+
+    결과는 항상 청크 순서대로 반환되므로 merge_chunk_results에 그대로 넘길 수 있음.
+    output_dir의 매니페스트에 청크별 완료 상태를 기록하므로, 실패 후 다시 실행하면
+    이미 끝난 청크는 저장된 *_chunk_N_ocr_raw.json을 읽고 남은 청크만 처리함.
+    return_paths=True면 결과 dict 대신 청크 결과 JSON(*_chunk_N_ocr.json) 경로를 반환해서
+    청크 트리를 메모리에 모아두지 않음 (merge_chunk_results의 스트리밍 병합용).
+
+    청크 PDF는 메모리에서 만들어 바로 업로드하며, 청크 N이 전송되는 동안 청크 N+1을 분할함.
+    keep_chunk_files=True면 디버깅용으로 청크 PDF도 output_dir에 저장.
+
+    청크는 페이지별 바이트 크기와 프로세서 한도(PROCESSOR_LIMITS)로 계획하며,
+    pages_per_chunk를 주면 청크당 페이지 수 상한으로만 사용함.
+
+    dedup_pages=True면 페이지 지문으로 중복 페이지를 찾아 고유 페이지만 OCR하고,
+    OCR 결과를 중복 위치로 복제한 뒤 청크별로 강화 기능(섹션 감지 등)을 적용함.
+    use_text_layer=True면 텍스트 레이어가 온전한 페이지는 로컬에서 추출하고 나머지만 업로드함.
+    profile(full/layout/lean)은 요청 옵션과 강화 후 프루닝 범위를 정함
+    use_cache/cache는 청크별 process_document에 그대로 전달
+    """
     
     os.makedirs(output_dir, exist_ok=True)
     
     print(f"\n📄 대용량 PDF 청크 처리: {file_path}")
-    print(f"  - 청크 크기: {pages_per_chunk}페이지")
+    print(f"  - 동시 요청 수: {max_workers}")
     print(f"  - 출력 디렉토리: {output_dir}")
     
-    # 기존 pdf_split 사용
-    chunk_files = split_pdf(file_path, output_dir, pages_per_chunk)
+    # 중복 페이지 감지 (대표 페이지 인덱스)
+    if dedup_pages:
+        canonical = fingerprint_pdf(file_path, PAGE_DEDUP_RENDER_DPI, PAGE_DEDUP_MAX_DISTANCE)
+    else:
+        canonical = list(range(count_pdf_pages(file_path)))
+    page_dedup = dedup_summary(canonical)
+    unique_pages = [idx for idx, rep in enumerate(canonical) if rep == idx]
+    
+    if page_dedup["duplicate_pages"]:
+        print(f"  🔁 중복 페이지 {page_dedup['duplicate_pages']}개 → "
+              f"고유 {page_dedup['unique_pages']}/{page_dedup['total_pages']}페이지만 OCR "
+              f"(중복률 {page_dedup['dedup_ratio']:.0%})")
+    
+    # 텍스트 레이어가 온전한 페이지는 로컬에서 추출 (Document AI로 보내지 않음)
+    text_layers = _read_text_layers(file_path, unique_pages) if use_text_layer else {}
+    
+    # API 호출 전에 청크 계획을 세우고 출력
+    limits = PROCESSOR_LIMITS["OCR"]
+    max_pages = min(limits["max_pages"], pages_per_chunk or limits["max_pages"])
+    plan = plan_pdf_chunks(
+        file_path,
+        max_pages,
+        limits["max_bytes"],
+        pages=unique_pages,
+        local_pages=set(text_layers)
+    )
+    print_chunk_plan(plan, max_pages, limits["max_bytes"])
     
-    print(f"  ✅ {len(chunk_files)}개 청크로 분할 완료\n")
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    boundaries = []
+    for part, chunk in enumerate(plan, 1):
+        chunk_path = os.path.join(output_dir, chunk_file_name(file_path, part))
+        chunk_name = os.path.splitext(os.path.basename(chunk_path))[0]
+        boundaries.append({
+            "start_page": chunk["start_page"],
+            "end_page": chunk["end_page"],
+            "page_indices": chunk["page_indices"],
+            "ocr_pages": [idx for idx in chunk["page_indices"] if idx not in text_layers],
+            "bytes": chunk["bytes"],
+            "chunk_file": chunk_path,
+            "output_file": os.path.join(output_dir, f"{chunk_name}_ocr_raw.json"),
+            "result_file": os.path.join(output_dir, f"{chunk_name}_ocr.json"),
+        })
     
-    results = []
+    manifest = ChunkManifest.load_or_create(
+        path=os.path.join(output_dir, f"{base_name}_manifest.json"),
+        source_path=file_path,
+        source_sha256=sha256_file(file_path),
+        boundaries=boundaries,
+        profile=profile
+    )
+    total_chunks = len(manifest.chunks)
+    pending = manifest.pending_chunks()
+    
+    print(f"  ✅ {total_chunks}개 청크 중 처리 대상 {len(pending)}개\n")
+    
+    def _make_task(chunk: Dict, data: bytes):
+        def _task():
+            idx = chunk["index"]
+            print(f"📄 청크 {idx}/{total_chunks} 처리 중...")
+            
+            try:
+                # 강화 기능은 중복 페이지를 펼친 뒤 적용
+                result = None
+                if chunk["ocr_pages"]:
+                    result = process_document(
+                        file_path=chunk["chunk_file"],
+                        processor_type="OCR",
+                        output_path=chunk["output_file"],
+                        enable_enhancement=False,
+                        client=client,
+                        content=data,
+                        profile=profile,
+                        use_cache=use_cache,
+                        cache=cache
+                    )
+                
+                # 텍스트 레이어 페이지와 OCR 페이지를 원본 순서로 합침
+                if len(chunk["ocr_pages"]) != len(chunk["page_indices"]):
+                    result = combine_with_ocr(chunk["page_indices"], text_layers, result)
+                    save_artifact(result, chunk["output_file"])
+            except Exception as e:
+                manifest.mark_failed(idx, f"{type(e).__name__}: {e}")
+                raise
+            
+            manifest.mark_done(idx)
+            return chunk["output_file"] if return_paths else result
+        return _task
+    
+    def _tasks():
+        # 실행기가 작업을 꺼낼 때마다 다음 청크를 메모리에서 분할 (업로드와 겹침)
+        # 모든 페이지를 텍스트 레이어로 처리하는 청크는 PDF를 만들지 않음
+        splits = iter_pdf_chunks(
+            file_path,
+            [(c["index"], c["ocr_pages"]) for c in pending if c["ocr_pages"]],
+            keep_dir=output_dir if keep_chunk_files else None
+        )
+        for chunk in pending:
+            data = next(splits)[1] if chunk["ocr_pages"] else None
+            yield _make_task(chunk, data)
+    
+    fresh_results = run_chunks_concurrently(
+        _tasks(),
+        max_workers=max_workers,
+        max_retries=max_retries,
+    )
+    fresh_by_index = {chunk["index"]: r for chunk, r in zip(pending, fresh_results)}
     
-    for idx, chunk_path in enumerate(chunk_files, 1):
-        print(f"📄 청크 {idx}/{len(chunk_files)} 처리 중...")
-        
-        chunk_name = os.path.splitext(os.path.basename(chunk_path))[0]
-        output_path = os.path.join(output_dir, f"{chunk_name}_ocr.json")
+    # OCR 결과를 원본 페이지 순서로 펼친 뒤 강화 기능 적용 (한 청크씩)
+    raw_results = (fresh_by_index.get(c["index"], c["output_file"]) for c in manifest.chunks)
+    results = []
+    for part, result in fan_out_chunks(raw_results, [c["page_indices"] for c in manifest.chunks], canonical):
+        chunk = manifest.chunks[part - 1]
+        result["page_dedup"] = page_dedup
+        if enable_enhancement:
+            result = enhance_document(result)
+        result = apply_ocr_profile(result, profile)
+        save_artifact(result, chunk["result_file"])
         
-        result = process_document(
-            file_path=chunk_path,
-            processor_type="OCR",
-            output_path=output_path,
-            enable_enhancement=enable_enhancement
-        )
+        if return_paths:
+            results.append(chunk["result_file"])
+            continue
         
         result["chunk_info"] = {
-            "chunk_index": idx,
-            "total_chunks": len(chunk_files),
-            "chunk_file": chunk_path,
+            "chunk_index": part,
+            "total_chunks": total_chunks,
+            "chunk_file": chunk["chunk_file"],
+            "page_range": [chunk["start_page"], chunk["end_page"]],
         }
-        
         results.append(result)
     
-    print(f"\n✅ 전체 {len(results)}개 청크 처리 완료\n")
+    print(f"\n✅ 전체 {total_chunks}개 청크 처리 완료 (재사용 {total_chunks - len(pending)}개)\n")
     
     return results
 
 
-def detect_sections(doc_dict: Dict) -> Dict:
-    """페이지별 섹션 자동 감지"""
+def detect_sections(doc_dict: Dict, token_table: Optional[TokenTable] = None) -> Dict:
+    """페이지별 섹션 자동 감지 (모든 블록을 위치/크기 가중치로 점수화)"""
+    
+    if token_table is None:
+        token_table = TokenTable.from_document(doc_dict)
     
     pages = doc_dict.get("pages", [])
-    full_text = doc_dict.get("text", "")
     detected_sections = []
     
     for page_idx, page in enumerate(pages):
-        blocks = page.get("blocks", [])
-        if not blocks:
+        block_texts = token_table.block_texts(page_idx)
+        if not block_texts:
             continue
         
-        first_block = blocks[0]
-        block_text = _extract_block_text(first_block, full_text).lower()
+        block_boxes = token_table.block_boxes(page_idx)
         
-        section_type = "unknown"
-        for section, keywords in SECTION_KEYWORDS.items():
-            if any(keyword.lower() in block_text for keyword in keywords):
-                section_type = section
-                break
+        ranked = rank_sections(SECTION_AUTOMATON, block_texts, block_boxes, list(SECTION_KEYWORDS))
+        section_type = ranked[0]["section"] if ranked else UNKNOWN_SECTION
         
         detected_sections.append({
             "page": page_idx + 1,
             "section": section_type,
-            "preview": block_text[:100]
+            "scores": ranked,
+            "preview": block_texts[0].lower()[:100]
         })
         
         page["detected_section"] = section_type
@@ -196,43 +482,13 @@ def detect_sections(doc_dict: Dict) -> Dict:
 
 
 def extract_numbers(doc_dict: Dict) -> Dict:
-    """숫자/통계 데이터 자동 추출"""
+    """숫자/통계 데이터 자동 추출 (단일 패스 스캐너 + 단위 정규화)"""
     
     full_text = doc_dict.get("text", "")
-    extracted = {
-        "currency": [],
-        "percentage": [],
-        "quantity": [],
-    }
+    table = scan_numbers(full_text, page_start_offsets(doc_dict.get("pages", [])))
     
-    # 화폐 추출
-    for pattern in NUMBER_PATTERNS["currency_korean"]:
-        for match in re.finditer(pattern, full_text):
-            extracted["currency"].append({
-                "text": match.group(0),
-                "value": match.group(1),
-                "position": match.start()
-            })
-    
-    # 백분율 추출
-    for pattern in NUMBER_PATTERNS["percentage"]:
-        for match in re.finditer(pattern, full_text):
-            extracted["percentage"].append({
-                "text": match.group(0),
-                "value": match.group(1),
-                "position": match.start()
-            })
-    
-    # 수량 추출
-    for pattern in NUMBER_PATTERNS["quantity"]:
-        for match in re.finditer(pattern, full_text):
-            extracted["quantity"].append({
-                "text": match.group(0),
-                "value": match.group(1).replace(",", ""),
-                "position": match.start()
-            })
-    
-    doc_dict["extracted_numbers"] = extracted
+    doc_dict["extracted_numbers"] = numbers_to_dict(table)
+    doc_dict["number_summary"] = summarize_numbers(table)
     return doc_dict
 
 
@@ -254,6 +510,8 @@ def generate_metadata(doc_dict: Dict) -> Dict:
         )),
         "has_currency": len(doc_dict.get("extracted_numbers", {}).get("currency", [])) > 0,
         "has_percentage": len(doc_dict.get("extracted_numbers", {}).get("percentage", [])) > 0,
+        "dedup_ratio": doc_dict.get("page_dedup", {}).get("dedup_ratio", 0.0),
+        "text_layer_pages": sum(1 for p in pages if p.get("textSource") == TEXT_SOURCE_LAYER),
         "language": "ko",
     }
     
@@ -261,33 +519,33 @@ def generate_metadata(doc_dict: Dict) -> Dict:
     return doc_dict
 
 
-def _extract_block_text(block: Dict, full_text: str) -> str:
-    """블록에서 텍스트 추출"""
-    
-    layout = block.get("layout", {})
-    text_anchor = layout.get("textAnchor", {})
-    segments = text_anchor.get("textSegments", [])
-    
-    texts = []
-    for segment in segments:
-        start = int(segment.get("startIndex", 0))
-        end = int(segment.get("endIndex", 0))
-        texts.append(full_text[start:end])
-    
-    return " ".join(texts).strip()
+def merge_chunk_results(
+    chunk_results: List,
+    output_path: str,
+    keep_pages: bool = True
+) -> Dict:
+    """
+    여러 청크 결과를 하나로 병합 (페이지를 파일에 순차적으로 기록하는 스트리밍 병합)
 
+    Args:
+        chunk_results: 청크 결과 dict 또는 청크 결과 JSON 경로 리스트 (청크 순서).
+                       경로를 넘기면 한 번에 한 청크만 메모리에 올림
+        output_path: 병합 결과 경로 (*.pkas) - 헤더 + 페이지별 레코드의 샤드 산출물이라 JSON이 아니며
+                     load_document / read_artifact로 읽음 (같은 위치에 토큰 테이블도 저장)
+        keep_pages: False면 반환값에 pages를 담지 않음 → 최대 메모리 O(청크 1개)
 
-def merge_chunk_results(chunk_results: List[Dict], output_path: str) -> Dict:
-    """여러 청크 결과를 하나로 병합"""
+    모든 textAnchor 세그먼트와 extracted_numbers 위치는 앞선 청크들의 텍스트 길이만큼,
+    페이지 번호는 앞선 청크들의 페이지 수만큼 이동된다.
+    """
     
     if not chunk_results:
         raise ValueError("❌ 병합할 청크 결과가 없습니다.")
+    if not output_path.endswith(SHARD_EXTENSION):
+        raise ValueError(f"❌ 병합 결과는 샤드 산출물이므로 {SHARD_EXTENSION} 경로가 필요합니다: {output_path}")
     
     print(f"\n🔗 {len(chunk_results)}개 청크 결과 병합 중...")
     
     merged = {
-        "text": "",
-        "pages": [],
         "detected_sections": [],
         "extracted_numbers": {
             "currency": [],
@@ -298,32 +556,82 @@ def merge_chunk_results(chunk_results: List[Dict], output_path: str) -> Dict:
             "total_chunks": len(chunk_results)
         }
     }
-    
-    page_offset = 0
-    
-    for chunk in chunk_results:
-        merged["text"] += chunk.get("text", "")
-        
-        for page in chunk.get("pages", []):
-            page["original_page_number"] = page_offset + page.get("pageNumber", 0)
-            merged["pages"].append(page)
-        
-        page_offset += len(chunk.get("pages", []))
-        
-        for section in chunk.get("detected_sections", []):
-            section["page"] += page_offset - len(chunk.get("pages", []))
-            merged["detected_sections"].append(section)
-        
-        numbers = chunk.get("extracted_numbers", {})
-        for num_type in ["currency", "percentage", "quantity"]:
-            merged["extracted_numbers"][num_type].extend(numbers.get(num_type, []))
-    
-    merged["metadata"]["total_pages"] = len(merged["pages"])
-    merged["metadata"]["total_blocks"] = sum(
-        len(p.get("blocks", [])) for p in merged["pages"]
-    )
-    
-    save_json(merged, output_path)
-    print(f"✅ 병합 완료: {output_path}\n")
-    
-    return merged
\ No newline at end of file
+    kept_pages = []
+    text_parts = []
+    tables = []
+    totals = {"pages": 0, "text": 0, "blocks": 0, "text_layer_pages": 0, "pruned_bytes": 0}
+    profile = None
+    
+    def _pages():
+        nonlocal profile
+        for chunk in chunk_results:
+            if isinstance(chunk, str):
+                chunk = read_artifact(chunk)
+            
+            chunk_text = chunk.get("text", "")
+            chunk_pages = chunk.get("pages", [])
+            page_offset = totals["pages"]
+            text_offset = totals["text"]
+            
+            # 로컬 오프셋 기준 토큰 테이블 (concatenate에서 이동)
+            tables.append(TokenTable.from_document(chunk))
+            
+            for page in chunk_pages:
+                rebase_text_anchors(page, text_offset)
+                page["original_page_number"] = page_offset + page.get("pageNumber", 0)
+                totals["blocks"] += len(page.get("blocks", []))
+                totals["text_layer_pages"] += page.get("textSource") == TEXT_SOURCE_LAYER
+                
+                yield page
+                
+                if keep_pages:
+                    kept_pages.append(page)
+            
+            for section in chunk.get("detected_sections", []):
+                section["page"] += page_offset
+                merged["detected_sections"].append(section)
+            
+            numbers = chunk.get("extracted_numbers", {})
+            for num_type in ["currency", "percentage", "quantity"]:
+                for item in numbers.get(num_type, []):
+                    item["position"] = item.get("position", 0) + text_offset
+                    if "page" in item:
+                        item["page"] += page_offset
+                    merged["extracted_numbers"][num_type].append(item)
+            
+            if "ocr_profile" in chunk:
+                profile = chunk["ocr_profile"]["profile"]
+                totals["pruned_bytes"] += chunk["ocr_profile"]["pruned_bytes"]
+            
+            # 중복 페이지 통계는 문서 전체 기준이라 청크마다 같은 값
+            if "page_dedup" in chunk:
+                merged["page_dedup"] = chunk["page_dedup"]
+            
+            text_parts.append(chunk_text)
+            totals["text"] += len(chunk_text)
+            totals["pages"] += len(chunk_pages)
+            
+            # 다음 청크를 읽기 전에 현재 청크 트리 해제
+            del chunk, chunk_pages
+    
+    def _tail() -> Dict:
+        # 페이지를 모두 기록한 뒤 나머지 최상위 키 작성
+        merged["text"] = "".join(text_parts)
+        merged["number_summary"] = summarize_numbers(numbers_from_dict(merged["extracted_numbers"]))
+        merged["metadata"]["total_pages"] = totals["pages"]
+        merged["metadata"]["total_blocks"] = totals["blocks"]
+        merged["metadata"]["text_layer_pages"] = totals["text_layer_pages"]
+        if profile is not None:
+            merged["ocr_profile"] = {"profile": profile, "pruned_bytes": totals["pruned_bytes"]}
+        merged["metadata"]["dedup_ratio"] = merged.get("page_dedup", {}).get("dedup_ratio", 0.0)
+        return merged
+    
+    # 페이지를 하나씩 페이지 레코드로 기록 (document.load_document로 페이지 단위 지연 로딩)
+    save_artifact_shards(output_path, "pages", _pages(), _tail)
+    
+    TokenTable.concatenate(tables).save(token_table_path(output_path))
+    print(f"✅ 병합 완료: {output_path} ({totals['pages']}페이지)\n")
+    
+    if keep_pages:
+        merged["pages"] = kept_pages
+    return merged
@@ -0,0 +1,97 @@
+"""
+OCR 프로파일 (요청 옵션 + 결과 프루닝)
+
+Document.to_json 결과의 대부분은 심볼 단위 데이터와 스타일 정보인데,
+섹션 감지/숫자 추출/토큰 테이블/LayoutLM/최종 JSON 어느 단계도 읽지 않는다.
+프로파일은 Document AI에 요청할 옵션과, 강화 기능이 끝난 뒤 결과에서 제거할 트리를 함께 정한다.
+
+- full:   모든 옵션 요청, 아무것도 제거하지 않음 (이전 동작)
+- layout: 심볼/스타일 정보 요청 안 함, symbols·styleInfo·textStyles 제거 (tokens/lines는 유지)
+- lean:   layout + tokens·lines·visualElements·detectedLanguages·품질 점수 제거,
+          페이지 렌더링 이미지 바이트(image.content) 비움
+"""
+
+import json
+from typing import Dict
+
+OCR_PROFILES = {
+    "full": {
+        "ocr_options": {
+            "compute_style_info": True,
+            "enable_native_pdf_parsing": True,
+            "enable_image_quality_scores": True,
+            "enable_symbol": True,
+        },
+        "prune_keys": (),
+        "drop_page_image": False,
+    },
+    "layout": {
+        "ocr_options": {
+            "compute_style_info": False,
+            "enable_native_pdf_parsing": True,
+            "enable_image_quality_scores": False,
+            "enable_symbol": False,
+        },
+        "prune_keys": ("symbols", "styleInfo", "textStyles"),
+        "drop_page_image": False,
+    },
+    "lean": {
+        "ocr_options": {
+            "compute_style_info": False,
+            "enable_native_pdf_parsing": True,
+            "enable_image_quality_scores": False,
+            "enable_symbol": False,
+        },
+        "prune_keys": (
+            "symbols", "styleInfo", "textStyles",
+            "tokens", "lines", "visualElements", "detectedLanguages", "imageQualityScores",
+        ),
+        "drop_page_image": True,
+    },
+}
+
+
+def get_profile(name: str) -> Dict:
+    """프로파일 설정 반환 (알 수 없는 이름이면 ValueError)"""
+    try:
+        return OCR_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"❌ 알 수 없는 OCR 프로파일: {name} (사용 가능: {', '.join(OCR_PROFILES)})")
+
+
+def _json_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def prune_document(doc_dict: Dict, profile: str) -> int:
+    """
+    프로파일에 따라 결과 dict에서 쓰지 않는 트리를 제거 (그 자리에서 수정)
+
+    page 이미지는 키를 남기고 content만 비우므로 페이지 이미지 개수 계산(len(page["image"]))은 그대로다.
+
+    Returns:
+        제거한 데이터의 JSON 크기(바이트, 압축 구분자 기준 추정치)
+    """
+    config = get_profile(profile)
+    prune_keys = set(config["prune_keys"])
+    saved = 0
+
+    if prune_keys:
+        stack = [doc_dict]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                for key in [k for k in current if k in prune_keys]:
+                    saved += _json_size(current.pop(key)) + len(key) + 4
+                stack.extend(v for v in current.values() if isinstance(v, (dict, list)))
+            elif isinstance(current, list):
+                stack.extend(v for v in current if isinstance(v, (dict, list)))
+
+    if config["drop_page_image"]:
+        for page in doc_dict.get("pages", []):
+            image = page.get("image")
+            if isinstance(image, dict) and image.get("content"):
+                saved += len(image["content"])
+                image["content"] = ""
+
+    return saved
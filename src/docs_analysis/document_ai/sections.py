@@ -0,0 +1,123 @@
+"""
+Aho–Corasick 기반 섹션 분류기
+
+SECTION_KEYWORDS 전체로 다중 패턴 오토마톤을 한 번 만들어 두고,
+페이지의 모든 블록을 한 번씩만 훑어 키워드 적중을 모은 뒤
+블록 위치/크기 가중치를 곱해 페이지별 섹션 분포(순위)를 계산한다.
+"""
+
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+UNKNOWN_SECTION = "unknown"
+
+
+class KeywordAutomaton:
+    """키워드 → 라벨 다중 패턴 매칭 오토마톤 (Aho–Corasick)"""
+
+    def __init__(self, keyword_map: Dict[str, Sequence[str]]):
+        # 상태별 전이 / 실패 링크 / 출력(키워드 id 목록)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.keywords: List[Tuple[str, str]] = []  # (keyword, label)
+
+        for label, keywords in keyword_map.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                self._add(keyword, len(self.keywords))
+                self.keywords.append((keyword, label))
+
+        self._build_fail_links()
+
+    def _add(self, keyword: str, keyword_id: int):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(keyword_id)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[int]:
+        """text(소문자)에 등장하는 키워드 id 목록 (중복 포함, 등장 순서)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        hits: List[int] = []
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+
+def block_weight(block_index: int, bbox: Optional[Tuple[float, float, float, float]]) -> float:
+    """
+    블록 가중치 = 순서 가중치 × 위치 가중치 × 크기 가중치
+
+    - 순서: 앞쪽 블록(제목일 가능성)이 높음 → 1 / (1 + 0.25 * index)
+    - 위치: 페이지 위쪽일수록 높음 → 1 + (1 - y_min)  (1~2)
+    - 크기: 면적이 클수록 높음 → 1 + sqrt(area)     (1~2)
+    bbox는 0~1 정규화 좌표 (x_min, y_min, x_max, y_max), 없으면 위치/크기 가중치 1
+    """
+    weight = 1.0 / (1.0 + 0.25 * block_index)
+    if bbox is not None:
+        x_min, y_min, x_max, y_max = bbox
+        area = max(0.0, x_max - x_min) * max(0.0, y_max - y_min)
+        weight *= (1.0 + (1.0 - min(max(y_min, 0.0), 1.0))) * (1.0 + math.sqrt(min(area, 1.0)))
+    return weight
+
+
+def rank_sections(
+    automaton: KeywordAutomaton,
+    block_texts: Sequence[str],
+    block_boxes: Sequence[Optional[Tuple[float, float, float, float]]],
+    section_order: Sequence[str]
+) -> List[Dict]:
+    """
+    페이지의 블록들을 점수화해서 섹션 분포를 내림차순으로 반환
+
+    Returns:
+        [{"section": "market", "score": 0.62}, ...]  (score 합계 = 1, 적중 없으면 빈 리스트)
+    """
+    scores: Dict[str, float] = {}
+
+    for idx, text in enumerate(block_texts):
+        if not text:
+            continue
+        # 한 블록 안에서는 섹션별로 한 번만 인정 (키워드 반복/동의어 중복 방지)
+        labels = {automaton.keywords[keyword_id][1] for keyword_id in automaton.find(text.lower())}
+        if not labels:
+            continue
+        weight = block_weight(idx, block_boxes[idx] if idx < len(block_boxes) else None)
+        for label in labels:
+            scores[label] = scores.get(label, 0.0) + weight
+
+    total = sum(scores.values())
+    if not total:
+        return []
+
+    order = {name: i for i, name in enumerate(section_order)}
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], order.get(item[0], len(order))))
+    return [{"section": name, "score": round(score / total, 4)} for name, score in ranked]
@@ -0,0 +1,321 @@
+"""
+PDF 텍스트 레이어 기반 로컬 추출 (Document AI 호출 생략 경로)
+
+PowerPoint/Keynote에서 내보낸 PDF는 이미 정확한 텍스트 레이어를 갖고 있으므로
+PyPDF2로 텍스트 조각과 위치를 읽어 Document AI OCR 결과와 같은 모양의 페이지 dict를 만든다.
+(dimension, layout, blocks, paragraphs, lines, tokens - textAnchor + normalizedVertices)
+텍스트가 거의 없거나, 깨진 문자가 많거나, 이미지가 페이지 대부분을 덮는 페이지(스캔본 등)는
+텍스트 레이어를 쓰지 않고 Document AI로 보낸다.
+
+위치는 텍스트 행렬 × CTM으로 계산한 기준선 좌표와 글자 크기로 추정한 값이므로
+글자 폭은 근사치이다 (한글/한자 1em, 그 외 0.5em).
+
+Document AI OCR 페이지는 렌더링한 페이지 이미지(page.image: content/mimeType/width/height)를 하나 갖고,
+슬라이드 분석의 이미지 개수(len(page["image"]))는 이 dict를 센다.
+텍스트 레이어 페이지도 같은 키의 이미지 항목을 넣어(렌더링하지 않으므로 content는 비움,
+lean 프로파일이 비운 OCR 페이지와 같은 모양) 두 경로의 슬라이드 분석 결과가 같게 한다.
+"""
+
+import math
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PyPDF2 import PdfReader
+
+from src.docs_analysis.document_ai.pages import PageEntry, assemble_pages, page_entries
+
+TEXT_SOURCE_LAYER = "TEXT_LAYER"
+
+# (텍스트, 기준선 x, 기준선 y, 글자 크기) - PDF 좌표 (원점 왼쪽 아래, 단위 pt)
+Fragment = Tuple[str, float, float, float]
+
+
+def _multiply(m1: Sequence[float], m2: Sequence[float]) -> List[float]:
+    """PDF 변환 행렬 곱 (m1 × m2)"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return [
+        a1 * a2 + b1 * c2,
+        a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2,
+        c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2,
+        e1 * b2 + f1 * d2 + f2,
+    ]
+
+
+def _char_width(ch: str) -> float:
+    """글자 폭 추정 (em 단위)"""
+    if ch == " ":
+        return 0.25
+    if unicodedata.east_asian_width(ch) in ("W", "F"):
+        return 1.0
+    return 0.5
+
+
+def _text_width(text: str, size: float) -> float:
+    return sum(_char_width(ch) for ch in text) * size
+
+
+def _garbage_ratio(text: str) -> float:
+    """깨진 문자 비율 (대체 문자, 사용자 정의 영역, 제어 문자)"""
+    chars = [ch for ch in text if not ch.isspace()]
+    if not chars:
+        return 0.0
+    bad = sum(1 for ch in chars if ch == "�" or unicodedata.category(ch) in ("Co", "Cc", "Cs"))
+    return bad / len(chars)
+
+
+def read_fragments(page) -> Tuple[List[Fragment], float]:
+    """
+    페이지의 텍스트 조각과 이미지가 덮는 면적 비율
+
+    Returns:
+        (fragments, image_coverage)  image_coverage = 이미지 XObject 면적 합 / 페이지 면적 (최대 1)
+    """
+    box = page.mediabox
+    left, bottom = float(box.left), float(box.bottom)
+    page_area = max(float(box.width) * float(box.height), 1.0)
+
+    resources = page.get("/Resources")
+    xobjects = {}
+    if resources is not None:
+        xobj_dict = resources.get_object().get("/XObject")
+        if xobj_dict is not None:
+            xobjects = xobj_dict.get_object()
+
+    fragments: List[Fragment] = []
+    image_area = 0.0
+
+    def _on_text(text, cm, tm, font_dict, font_size):
+        text = text.replace("\n", " ")
+        if not text.strip():
+            # 공백만 있는 조각은 앞 조각의 단어 구분으로 반영
+            if text and fragments and not fragments[-1][0].endswith(" "):
+                fragments[-1] = (fragments[-1][0] + " ",) + fragments[-1][1:]
+            return
+        matrix = _multiply(tm, cm)
+        size = font_size * math.sqrt(abs(matrix[0] * matrix[3] - matrix[1] * matrix[2]))
+        fragments.append((text, matrix[4] - left, matrix[5] - bottom, size or 1.0))
+
+    def _on_operator(operator, operands, cm, tm):
+        nonlocal image_area
+        if operator != b"Do" or not operands:
+            return
+        xobj = xobjects.get(operands[0])
+        if xobj is not None and xobj.get_object().get("/Subtype") == "/Image":
+            image_area += abs(cm[0] * cm[3] - cm[1] * cm[2])
+
+    page.extract_text(visitor_text=_on_text, visitor_operand_before=_on_operator)
+    return fragments, min(image_area / page_area, 1.0)
+
+
+def _group_lines(fragments: List[Fragment]) -> List[List[Fragment]]:
+    """
+    기준선이 같은(글자 크기 절반 이내) 조각을 한 줄로 묶어 x 순으로 정렬하고,
+    가로 간격이 크면(글자 크기 3배 초과) 다른 줄로 나눔 (나란히 놓인 텍스트 상자가 섞이지 않도록)
+    """
+    rows: List[List[Fragment]] = []
+    for frag in sorted(fragments, key=lambda f: -f[2]):
+        if rows and abs(rows[-1][0][2] - frag[2]) <= 0.5 * max(rows[-1][0][3], frag[3]):
+            rows[-1].append(frag)
+        else:
+            rows.append([frag])
+
+    lines: List[List[Fragment]] = []
+    for row in rows:
+        row.sort(key=lambda f: f[1])
+        line = [row[0]]
+        for frag in row[1:]:
+            prev = line[-1]
+            gap = frag[1] - (prev[1] + _text_width(prev[0], prev[3]))
+            if gap > 3 * max(frag[3], prev[3]):
+                lines.append(line)
+                line = [frag]
+            else:
+                line.append(frag)
+        lines.append(line)
+
+    return lines
+
+
+def _line_box(line: List[Fragment]) -> Tuple[float, float, float, float]:
+    """줄의 (x_min, 기준선 y, x_max, 글자 크기)"""
+    x_min = min(f[1] for f in line)
+    x_max = max(f[1] + _text_width(f[0], f[3]) for f in line)
+    return x_min, line[0][2], x_max, max(f[3] for f in line)
+
+
+def _group_blocks(lines: List[List[Fragment]]) -> List[List[List[Fragment]]]:
+    """
+    세로로 가깝고(줄 간격 1.8배 이내) 가로로 겹치며 글자 크기가 비슷한 줄을 한 블록으로 묶음
+    """
+    blocks: List[List[List[Fragment]]] = []
+    for line in lines:
+        x_min, y, x_max, size = _line_box(line)
+        target = None
+        for block in reversed(blocks):
+            bx_min, by, bx_max, bsize = _line_box(block[-1])
+            close = 0 < by - y <= 1.8 * max(size, bsize)
+            overlap = min(x_max, bx_max) - max(x_min, bx_min) > 0
+            similar = max(size, bsize) <= 1.3 * min(size, bsize)
+            if close and overlap and similar:
+                target = block
+                break
+        if target is None:
+            blocks.append([line])
+        else:
+            target.append(line)
+    return blocks
+
+
+def _layout(start: int, end: int, box: Tuple[float, float, float, float], width: float, height: float) -> Dict:
+    """Document AI 형식 layout (textAnchor + 0~1 normalizedVertices, 원점 왼쪽 위)"""
+    x_min, y_min, x_max, y_max = box
+    nx0, nx1 = max(x_min / width, 0.0), min(x_max / width, 1.0)
+    ny0, ny1 = max(1.0 - y_max / height, 0.0), min(1.0 - y_min / height, 1.0)
+    return {
+        "textAnchor": {"textSegments": [{"startIndex": str(start), "endIndex": str(end)}]},
+        "confidence": 1.0,
+        "boundingPoly": {
+            "normalizedVertices": [
+                {"x": nx0, "y": ny0},
+                {"x": nx1, "y": ny0},
+                {"x": nx1, "y": ny1},
+                {"x": nx0, "y": ny1},
+            ]
+        },
+        "orientation": "PAGE_UP",
+    }
+
+
+def _page_image(width: float, height: float) -> Dict:
+    """Document AI page.image와 같은 키의 페이지 이미지 항목 (content 없음)"""
+    return {"content": "", "mimeType": "image/png", "width": round(width), "height": round(height)}
+
+
+def build_page(fragments: List[Fragment], width: float, height: float) -> Tuple[Dict, str]:
+    """
+    텍스트 조각 → Document AI 형식 페이지 dict와 페이지 텍스트
+    (textAnchor는 페이지 텍스트 기준 오프셋, 0부터)
+    """
+    text_parts: List[str] = []
+    offset = 0
+    blocks, paragraphs, lines_out, tokens = [], [], [], []
+
+    def _vbox(line_boxes):
+        # 기준선 아래 0.2em, 위 0.8em을 글자 높이로 봄
+        return (
+            min(b[0] for b in line_boxes),
+            min(b[1] - 0.2 * b[3] for b in line_boxes),
+            max(b[2] for b in line_boxes),
+            max(b[1] + 0.8 * b[3] for b in line_boxes),
+        )
+
+    for block in _group_blocks(_group_lines(fragments)):
+        block_start = offset
+        block_boxes = []
+
+        for line in block:
+            line_start = offset
+            prev_end = None
+            for pos, (text, x, y, size) in enumerate(line):
+                if pos == len(line) - 1:
+                    text = text.rstrip(" ")
+                # 앞 조각과 떨어져 있으면 공백 삽입
+                if prev_end is not None and x - prev_end > 0.15 * size and not text.startswith(" ") \
+                        and text_parts and not text_parts[-1].endswith(" "):
+                    text_parts.append(" ")
+                    offset += 1
+
+                cursor = x
+                for word in text.split(" "):
+                    if word:
+                        word_width = _text_width(word, size)
+                        tokens.append({
+                            "layout": _layout(offset, offset + len(word), (cursor, y - 0.2 * size, cursor + word_width, y + 0.8 * size), width, height),
+                            "detectedBreak": {"type": "SPACE"},
+                        })
+                        cursor += word_width
+                    cursor += _text_width(" ", size)
+                    offset += len(word) + 1
+                offset -= 1  # 마지막 단어 뒤에는 공백이 없음
+                text_parts.append(text)
+                prev_end = x + _text_width(text, size)
+
+            text_parts.append("\n")
+            offset += 1
+            line_box = _line_box(line)
+            block_boxes.append(line_box)
+            lines_out.append({"layout": _layout(line_start, offset, _vbox([line_box]), width, height)})
+
+        block_layout = _layout(block_start, offset, _vbox(block_boxes), width, height)
+        blocks.append({"layout": block_layout})
+        paragraphs.append({"layout": dict(block_layout)})
+
+    page_text = "".join(text_parts)
+    page = {
+        "pageNumber": 1,
+        "image": _page_image(width, height),
+        "dimension": {"width": width, "height": height, "unit": "points"},
+        "layout": _layout(0, len(page_text), (0.0, 0.0, width, height), width, height),
+        "blocks": blocks,
+        "paragraphs": paragraphs,
+        "lines": lines_out,
+        "tokens": tokens,
+        "textSource": TEXT_SOURCE_LAYER,
+    }
+    return page, page_text
+
+
+def read_text_layers(
+    input_pdf: str,
+    page_indices: Sequence[int],
+    min_chars: int,
+    max_garbage_ratio: float,
+    max_image_coverage: float
+) -> Dict[int, PageEntry]:
+    """
+    텍스트 레이어를 쓸 수 있는 페이지만 로컬에서 추출
+
+    Returns:
+        {원본 페이지 인덱스: (페이지 dict, 페이지 텍스트, 0)}  (없는 페이지는 Document AI 대상)
+    """
+    reader = PdfReader(input_pdf)
+    layers: Dict[int, PageEntry] = {}
+
+    for idx in page_indices:
+        page = reader.pages[idx]
+        if page.get("/Rotate", 0) % 360:
+            continue
+
+        fragments, image_coverage = read_fragments(page)
+        if image_coverage > max_image_coverage:
+            continue
+
+        raw = "".join(f[0] for f in fragments)
+        if sum(1 for ch in raw if not ch.isspace()) < min_chars or _garbage_ratio(raw) > max_garbage_ratio:
+            continue
+
+        width, height = float(page.mediabox.width), float(page.mediabox.height)
+        layer_page, layer_text = build_page(fragments, width, height)
+        layers[idx] = (layer_page, layer_text, 0)
+
+    return layers
+
+
+def combine_with_ocr(
+    page_indices: Sequence[int],
+    layers: Dict[int, PageEntry],
+    ocr_doc: Optional[Dict]
+) -> Dict:
+    """
+    텍스트 레이어 페이지와 Document AI 결과(텍스트 레이어가 없는 페이지만, 페이지 순서)를
+    원본 페이지 순서로 합쳐 하나의 Document AI 형식 문서로 만듦
+    """
+    ocr_entries = iter(page_entries(ocr_doc) if ocr_doc else [])
+    entries = [layers[idx] if idx in layers else next(ocr_entries) for idx in page_indices]
+    base = {"mimeType": (ocr_doc or {}).get("mimeType", "application/pdf")}
+    if ocr_doc and "ocr_profile" in ocr_doc:
+        base["ocr_profile"] = dict(ocr_doc["ocr_profile"])
+    return assemble_pages(entries, base)
@@ -0,0 +1,248 @@
+"""
+Document AI 결과 → 컬럼형 토큰 테이블
+
+pages → blocks → paragraphs → textAnchor 중첩 dict를 한 번만 훑어
+행(텍스트 세그먼트)마다 page / block / paragraph id, 텍스트 시작·끝 오프셋,
+정규화 bbox(0~1)를 NumPy 배열로 보관한다.
+섹션 감지, LayoutLM 전처리, 슬라이드 추출은 중첩 JSON 대신 이 테이블을 읽는다.
+
+- block 행: paragraph = -1
+- block 안의 paragraph 행: paragraph = 0, 1, ...
+- 세그먼트가 없는 요소도 빈 행(start = end = 0) 하나를 가짐
+- boundingPoly가 없으면 bbox = NaN, 좌표 정보가 없는 boundingPoly는 bbox = 0
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.docs_analysis.document_ai.document import load_document
+
+ROW_COLUMNS = ("page", "block", "paragraph", "start", "end", "bbox")
+PAGE_COLUMNS = ("page_width", "page_height", "page_image_count")
+
+
+def _normalized_bbox(poly: Optional[Dict], width: float, height: float) -> Tuple[float, float, float, float]:
+    """boundingPoly → 0~1 정규화 (x_min, y_min, x_max, y_max)"""
+
+    if not poly:
+        return (np.nan, np.nan, np.nan, np.nan)
+    if "normalizedVertices" in poly:
+        verts = poly["normalizedVertices"]
+        xs = [v.get("x", 0) for v in verts]
+        ys = [v.get("y", 0) for v in verts]
+    elif "vertices" in poly:
+        verts = poly["vertices"]
+        xs = [v.get("x", 0) / width for v in verts]
+        ys = [v.get("y", 0) / height for v in verts]
+    else:
+        return (0.0, 0.0, 0.0, 0.0)
+    if not xs:
+        return (0.0, 0.0, 0.0, 0.0)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+class TokenTable:
+    """배열 기반 토큰(세그먼트) 테이블"""
+
+    def __init__(self, text: str, columns: Dict[str, np.ndarray]):
+        self.text = text
+        self.page = columns["page"]
+        self.block = columns["block"]
+        self.paragraph = columns["paragraph"]
+        self.start = columns["start"]
+        self.end = columns["end"]
+        self.bbox = columns["bbox"]
+        self.page_width = columns["page_width"]
+        self.page_height = columns["page_height"]
+        self.page_image_count = columns["page_image_count"]
+
+    # ------------------------------------------------------------------
+    # 생성 / 저장
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_document(cls, doc_dict: Dict) -> "TokenTable":
+        """Document AI 결과 dict를 한 번 훑어 테이블 생성"""
+
+        pages = doc_dict.get("pages", [])
+        rows_page: List[int] = []
+        rows_block: List[int] = []
+        rows_para: List[int] = []
+        rows_start: List[int] = []
+        rows_end: List[int] = []
+        rows_bbox: List[Tuple[float, float, float, float]] = []
+
+        page_width = np.ones(len(pages), dtype=np.float64)
+        page_height = np.ones(len(pages), dtype=np.float64)
+        page_image_count = np.zeros(len(pages), dtype=np.int32)
+
+        def _add(page_idx: int, block_idx: int, para_idx: int, layout: Dict, width: float, height: float):
+            bbox = _normalized_bbox(layout.get("boundingPoly"), width, height)
+            segments = layout.get("textAnchor", {}).get("textSegments", []) or [None]
+            for segment in segments:
+                rows_page.append(page_idx)
+                rows_block.append(block_idx)
+                rows_para.append(para_idx)
+                if segment is None:
+                    rows_start.append(0)
+                    rows_end.append(0)
+                else:
+                    rows_start.append(int(segment.get("startIndex", 0)))
+                    rows_end.append(int(segment.get("endIndex", 0)))
+                rows_bbox.append(bbox)
+
+        for page_idx, page in enumerate(pages):
+            dim = page.get("dimension", {})
+            width = dim.get("width", 1)
+            height = dim.get("height", 1)
+            page_width[page_idx] = width
+            page_height[page_idx] = height
+            page_image_count[page_idx] = len(page.get("image", []))
+
+            for block_idx, block in enumerate(page.get("blocks", [])):
+                _add(page_idx, block_idx, -1, block.get("layout", {}), width, height)
+                for para_idx, paragraph in enumerate(block.get("paragraphs", []) or []):
+                    _add(page_idx, block_idx, para_idx, paragraph.get("layout", {}), width, height)
+
+        columns = {
+            "page": np.asarray(rows_page, dtype=np.int32),
+            "block": np.asarray(rows_block, dtype=np.int32),
+            "paragraph": np.asarray(rows_para, dtype=np.int32),
+            "start": np.asarray(rows_start, dtype=np.int64),
+            "end": np.asarray(rows_end, dtype=np.int64),
+            "bbox": np.asarray(rows_bbox, dtype=np.float64).reshape(-1, 4),
+            "page_width": page_width,
+            "page_height": page_height,
+            "page_image_count": page_image_count,
+        }
+        return cls(doc_dict.get("text", ""), columns)
+
+    @classmethod
+    def concatenate(cls, tables: List["TokenTable"]) -> "TokenTable":
+        """청크별 테이블을 이어 붙임 (page id와 텍스트 오프셋을 앞선 청크만큼 이동)"""
+
+        page_offsets = np.cumsum([0] + [t.num_pages for t in tables[:-1]])
+        text_offsets = np.cumsum([0] + [len(t.text) for t in tables[:-1]])
+
+        columns = {
+            "page": np.concatenate([t.page + p for t, p in zip(tables, page_offsets)]).astype(np.int32),
+            "block": np.concatenate([t.block for t in tables]),
+            "paragraph": np.concatenate([t.paragraph for t in tables]),
+            "start": np.concatenate([t.start + o for t, o in zip(tables, text_offsets)]),
+            "end": np.concatenate([t.end + o for t, o in zip(tables, text_offsets)]),
+            "bbox": np.concatenate([t.bbox for t in tables]).reshape(-1, 4),
+            "page_width": np.concatenate([t.page_width for t in tables]),
+            "page_height": np.concatenate([t.page_height for t in tables]),
+            "page_image_count": np.concatenate([t.page_image_count for t in tables]),
+        }
+        return cls("".join(t.text for t in tables), columns)
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in ROW_COLUMNS + PAGE_COLUMNS}
+
+    def save(self, path: str):
+        """
+        .npz 경로면 단일 압축 파일로, 그 외 경로면 컬럼별 .npy 디렉토리로 저장
+        (디렉토리 형식은 load 시 메모리 매핑 가능)
+        """
+        if path.endswith(".npz"):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            np.savez(path, text=np.array(self.text), **self._columns())
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for name, array in self._columns().items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+        with open(os.path.join(path, "text.json"), "w", encoding="utf-8") as f:
+            json.dump(self.text, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "TokenTable":
+        """save로 저장한 테이블 로드 (디렉토리 형식은 mmap=True면 메모리 매핑)"""
+        if path.endswith(".npz"):
+            with np.load(path) as data:
+                columns = {name: data[name] for name in ROW_COLUMNS + PAGE_COLUMNS}
+                text = str(data["text"])
+            return cls(text, columns)
+
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+            for name in ROW_COLUMNS + PAGE_COLUMNS
+        }
+        with open(os.path.join(path, "text.json"), "r", encoding="utf-8") as f:
+            text = json.load(f)
+        return cls(text, columns)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @property
+    def num_pages(self) -> int:
+        return len(self.page_width)
+
+    def page_rows(self, page_idx: int) -> slice:
+        """해당 페이지 행 구간 (행은 페이지 순으로 정렬되어 있음)"""
+        lo = int(np.searchsorted(self.page, page_idx, side="left"))
+        hi = int(np.searchsorted(self.page, page_idx, side="right"))
+        return slice(lo, hi)
+
+    def segment_text(self, row: int) -> str:
+        return self.text[int(self.start[row]):int(self.end[row])]
+
+    def block_texts(self, page_idx: int) -> List[str]:
+        """블록별 텍스트 (세그먼트를 공백으로 이어 strip) - _extract_block_text와 동일"""
+        rows = self.page_rows(page_idx)
+        texts: Dict[int, List[str]] = {}
+        for row in range(rows.start, rows.stop):
+            if self.paragraph[row] != -1:
+                continue
+            texts.setdefault(int(self.block[row]), []).append(self.segment_text(row))
+        return [" ".join(texts[b]).strip() for b in sorted(texts)]
+
+    def block_boxes(self, page_idx: int) -> List[Optional[Tuple[float, float, float, float]]]:
+        """블록별 정규화 bbox (boundingPoly 없으면 None)"""
+        rows = self.page_rows(page_idx)
+        boxes: Dict[int, Optional[Tuple[float, float, float, float]]] = {}
+        for row in range(rows.start, rows.stop):
+            block = int(self.block[row])
+            if self.paragraph[row] != -1 or block in boxes:
+                continue
+            bbox = self.bbox[row]
+            boxes[block] = None if np.isnan(bbox[0]) else tuple(float(v) for v in bbox)
+        return [boxes[b] for b in sorted(boxes)]
+
+    def page_text(self, page_idx: int) -> str:
+        """페이지의 블록 세그먼트 텍스트를 그대로 이어 붙인 문자열"""
+        rows = self.page_rows(page_idx)
+        mask = self.paragraph[rows] == -1
+        starts = self.start[rows][mask]
+        ends = self.end[rows][mask]
+        return "".join(self.text[int(s):int(e)] for s, e in zip(starts, ends))
+
+
+def token_table_path(docai_json_path: str) -> str:
+    """OCR JSON 경로에 대응하는 토큰 테이블 경로 (<name>_tokens.npz)"""
+    return f"{os.path.splitext(docai_json_path)[0]}_tokens.npz"
+
+
+def load_token_table(docai_json_path: str, doc_dict: Optional[Dict] = None) -> TokenTable:
+    """
+    저장된 토큰 테이블을 읽고, 없거나 OCR JSON보다 오래됐으면 새로 만들어 저장
+    (doc_dict가 없으면 OCR 결과를 읽어서 생성 - 샤드 산출물은 한 페이지씩 읽음)
+    """
+    path = token_table_path(docai_json_path)
+    if os.path.exists(path) and (
+        not os.path.exists(docai_json_path)
+        or os.path.getmtime(path) >= os.path.getmtime(docai_json_path)
+    ):
+        return TokenTable.load(path)
+
+    if doc_dict is None:
+        doc_dict = load_document(docai_json_path)
+
+    table = TokenTable.from_document(doc_dict)
+    table.save(path)
+    return table
@@ -0,0 +1,45 @@
+# src/layoutlm/backends.py
+"""
+LayoutLMv3 CPU 추론 백엔드
+
+- eager  : fp32 PyTorch 모델 그대로 (기준)
+- int8   : Linear 레이어 동적 int8 양자화 (가중치 int8, 활성값은 실행 시 양자화)
+- compile: torch.compile 그래프 (동적 패딩으로 배치마다 길이가 달라지므로 dynamic=True,
+           첫 배치들에서 컴파일 시간이 들고 C++ 컴파일러가 필요)
+
+LAYOUTLM_BACKEND로 선택하며 load_model이 로딩 직후 적용한다.
+"""
+
+import torch
+
+BACKENDS = ("eager", "int8", "compile")
+
+# 가중치 행렬을 직접 인덱싱해 상대 위치 편향으로 쓰는 Linear (양자화하면 .weight가 텐서가 아니게 됨)
+_UNQUANTIZED_LINEARS = ("rel_pos_bias", "rel_pos_x_bias", "rel_pos_y_bias")
+
+
+def quantize_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Linear 레이어를 동적 int8 양자화 (상대 위치 편향 Linear 제외)"""
+    qconfig = torch.ao.quantization.default_dynamic_qconfig
+    spec = {
+        name: qconfig
+        for name, module in model.named_modules()
+        if isinstance(module, torch.nn.Linear) and name.rsplit(".", 1)[-1] not in _UNQUANTIZED_LINEARS
+    }
+    return torch.ao.quantization.quantize_dynamic(model, spec, dtype=torch.qint8)
+
+
+def compile_model(model: torch.nn.Module) -> torch.nn.Module:
+    """torch.compile (배치 길이가 바뀔 때마다 다시 컴파일하지 않도록 동적 shape)"""
+    return torch.compile(model, dynamic=True)
+
+
+def apply_backend(model: torch.nn.Module, backend: str) -> torch.nn.Module:
+    """eval 상태의 fp32 모델에 백엔드 적용 (int8은 새 모델, compile은 원본을 감싼 모듈 반환)"""
+    if backend == "eager":
+        return model
+    if backend == "int8":
+        return quantize_int8(model)
+    if backend == "compile":
+        return compile_model(model)
+    raise ValueError(f"❌ 지원하지 않는 LayoutLM 백엔드: {backend} (선택: {', '.join(BACKENDS)})")
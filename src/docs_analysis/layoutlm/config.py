@@ -1,24 +1,168 @@
 import os
+import threading
+import time
+from typing import Callable, Dict, Optional
 
 LAYOUTLM_MODEL_PATH = "microsoft/layoutlmv3-base"
 
-# 전역 변수
+# 모델/프로세서 로딩 (로컬 스냅샷 디렉토리가 있으면 그곳에서, 없으면 허브 캐시에서 오프라인으로 먼저 시도)
+# LAYOUTLM_OFFLINE=true면 로컬에 없을 때 다운로드하지 않고 실패
+LAYOUTLM_LOCAL_DIR = os.getenv("LAYOUTLM_LOCAL_DIR", "")
+LAYOUTLM_OFFLINE = os.getenv("LAYOUTLM_OFFLINE", "false").lower() in ("1", "true", "yes")
+
+# CPU 추론 백엔드 (eager: fp32 / int8: Linear 동적 양자화 / compile: torch.compile, backends.py 참고)
+LAYOUTLM_BACKEND = os.getenv("LAYOUTLM_BACKEND", "eager").lower()
+
+# 추론 설정 (배치당 윈도우 수 / CPU 스레드 수, 0이면 이 프로세스가 쓸 수 있는 코어 수)
+LAYOUTLM_BATCH_SIZE = int(os.getenv("LAYOUTLM_BATCH_SIZE", "8"))
+
+# 인코딩 설정 (윈도우 길이 / 이웃 윈도우가 겹치는 토큰 수, 겹침 없이 잘라내려면 LAYOUTLM_STRIDE=-1)
+LAYOUTLM_MAX_LENGTH = int(os.getenv("LAYOUTLM_MAX_LENGTH", "512"))
+LAYOUTLM_STRIDE = int(os.getenv("LAYOUTLM_STRIDE", "128"))
+LAYOUTLM_NUM_THREADS = int(os.getenv("LAYOUTLM_NUM_THREADS", "0"))
+
+# 멀티 프로세스 추론 (워커 수, 1이면 현재 프로세스에서 실행 / 워커당 스레드 수, 0이면 코어를 워커 수로 나눈 값)
+LAYOUTLM_NUM_WORKERS = int(os.getenv("LAYOUTLM_NUM_WORKERS", "1"))
+LAYOUTLM_WORKER_THREADS = int(os.getenv("LAYOUTLM_WORKER_THREADS", "0"))
+# 워커 풀 시작 대기 시간 (초, 모든 워커가 모델 로딩을 마칠 때까지)
+LAYOUTLM_WORKER_START_TIMEOUT = float(os.getenv("LAYOUTLM_WORKER_START_TIMEOUT", "600"))
+
+# 동적 패딩 (윈도우를 길이 버킷 순으로 묶어 배치마다 가장 긴 윈도우 길이까지만 패딩, 버킷 폭 = 토큰 수)
+LAYOUTLM_LENGTH_BUCKETING = os.getenv("LAYOUTLM_LENGTH_BUCKETING", "true").lower() in ("1", "true", "yes")
+LAYOUTLM_BUCKET_WIDTH = int(os.getenv("LAYOUTLM_BUCKET_WIDTH", "32"))
+
+# 페이지 렌더링 (한 번에 렌더링/인코딩할 페이지 수 / pdftoppm 스레드 수, 0이면 사용 가능한 코어 수)
+LAYOUTLM_RENDER_PAGES = int(os.getenv("LAYOUTLM_RENDER_PAGES", "8"))
+LAYOUTLM_RENDER_THREADS = int(os.getenv("LAYOUTLM_RENDER_THREADS", "0"))
+
+# 페이지 이미지 캐시 (PDF 내용 해시 + 페이지 + 렌더링 크기 → 정규화된 pixel_values)
+LAYOUTLM_PAGE_CACHE_ENABLED = os.getenv("LAYOUTLM_PAGE_CACHE", "true").lower() in ("1", "true", "yes")
+LAYOUTLM_PAGE_CACHE_DIR = os.getenv("LAYOUTLM_PAGE_CACHE_DIR", os.path.join("data", "cache", "layoutlm_pages"))
+LAYOUTLM_PAGE_CACHE_MAX_BYTES = int(os.getenv("LAYOUTLM_PAGE_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+# 전역 변수 (프로세스당 한 번만 로딩하는 모델/프로세서 레지스트리)
 _MODEL = None
 _PROCESSOR = None
+_NUM_THREADS = None
+_LOAD_LOCKS = {"model": threading.Lock(), "processor": threading.Lock()}
+_LOAD_TIMINGS: Dict[str, Dict] = {}
+_PRELOAD_THREAD: Optional[threading.Thread] = None
+
+def model_source() -> str:
+    """모델/프로세서를 읽을 위치 (LAYOUTLM_LOCAL_DIR 스냅샷이 있으면 그 경로, 아니면 허브 모델 id)"""
+    if LAYOUTLM_LOCAL_DIR and os.path.isdir(LAYOUTLM_LOCAL_DIR):
+        return LAYOUTLM_LOCAL_DIR
+    return LAYOUTLM_MODEL_PATH
+
+def _from_pretrained(name: str, loader: Callable, **kwargs):
+    """로컬 파일만으로 먼저 로딩하고, 없으면 (오프라인 모드가 아닐 때만) 다운로드. 소요 시간 기록"""
+    source = model_source()
+    started = time.perf_counter()
+    try:
+        obj = loader(source, local_files_only=True, **kwargs)
+        origin = "local"
+    except OSError:
+        if LAYOUTLM_OFFLINE:
+            raise
+        print(f"  ⚠️ 로컬 {name} 스냅샷 없음 - 허브에서 다운로드: {source}")
+        obj = loader(source, **kwargs)
+        origin = "download"
+    load_ms = (time.perf_counter() - started) * 1000
+    _LOAD_TIMINGS[name] = {
+        "source": source,
+        "origin": origin,
+        "load_ms": round(load_ms, 2),
+        "thread": threading.current_thread().name,
+    }
+    print(f"  ✅ LayoutLM {name} 로딩 완료 ({origin}, {load_ms:.0f}ms)")
+    return obj
 
 # ✅ inference.py가 찾고 있는 그 함수!
-def load_model():
+def load_model(backend: str = LAYOUTLM_BACKEND):
+    """
+    프로세스 전역 LayoutLMv3ForTokenClassification (처음 호출 시 한 번만 로딩, 백그라운드 로딩 중이면 대기)
+    로딩 직후 backend를 적용하며, 이후 호출의 backend 인자는 무시된다 (프로세스당 백엔드 하나).
+    """
     global _MODEL
-    if _MODEL is None:
-        print("⏳ LayoutLM 모델 로딩 중...")
-        from transformers import LayoutLMv3ForTokenClassification
-        _MODEL = LayoutLMv3ForTokenClassification.from_pretrained(LAYOUTLM_MODEL_PATH)
-        _MODEL.eval()
+    with _LOAD_LOCKS["model"]:
+        if _MODEL is None:
+            print(f"⏳ LayoutLM 모델 로딩 중 (백엔드: {backend})...")
+            from transformers import LayoutLMv3ForTokenClassification
+            from src.docs_analysis.layoutlm.backends import apply_backend
+            model = _from_pretrained("model", LayoutLMv3ForTokenClassification.from_pretrained)
+            model.eval()
+
+            started = time.perf_counter()
+            model = apply_backend(model, backend)
+            _LOAD_TIMINGS["model"]["backend"] = backend
+            _LOAD_TIMINGS["model"]["backend_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            _MODEL = model
     return _MODEL
 
 def load_processor():
+    """프로세스 전역 LayoutLMv3Processor (Document AI OCR 결과를 쓰므로 apply_ocr=False)"""
     global _PROCESSOR
-    if _PROCESSOR is None:
-        from transformers import LayoutLMv3Processor
-        _PROCESSOR = LayoutLMv3Processor.from_pretrained(LAYOUTLM_MODEL_PATH)
-    return _PROCESSOR
\ No newline at end of file
+    with _LOAD_LOCKS["processor"]:
+        if _PROCESSOR is None:
+            from transformers import LayoutLMv3Processor
+            _PROCESSOR = _from_pretrained("processor", LayoutLMv3Processor.from_pretrained, apply_ocr=False)
+    return _PROCESSOR
+
+def _preload(model: bool):
+    try:
+        load_processor()
+        if model:
+            load_model()
+    except Exception as e:
+        # 실제 사용 시점에 다시 로딩을 시도하며 그때 오류가 드러남
+        print(f"  ⚠️ LayoutLM 미리 로딩 실패: {type(e).__name__}: {e}")
+
+def preload_layoutlm(background: bool = True, model: bool = True) -> Optional[threading.Thread]:
+    """
+    프로세서와 (model이면) 모델을 미리 로딩 (시작 시 호출해 OCR 등 다른 작업과 겹치게 함)
+
+    background면 데몬 스레드에서 로딩하고 스레드를 반환한다 (이미 시작했으면 같은 스레드).
+    로딩 중에 load_model / load_processor를 호출하면 끝날 때까지 기다렸다가 같은 객체를 받는다.
+    """
+    global _PRELOAD_THREAD
+    if not background:
+        _preload(model)
+        return None
+    if _PRELOAD_THREAD is None:
+        _PRELOAD_THREAD = threading.Thread(target=_preload, args=(model,), name="layoutlm-preload", daemon=True)
+        _PRELOAD_THREAD.start()
+    return _PRELOAD_THREAD
+
+def load_timings() -> Dict[str, Dict]:
+    """모델/프로세서 로딩 기록 {이름: {source, origin, load_ms, thread (+ 모델은 backend, backend_ms)}} (로딩 전이면 빈 dict)"""
+    return {name: dict(timing) for name, timing in _LOAD_TIMINGS.items()}
+
+def available_cpus() -> int:
+    """이 프로세스가 쓸 수 있는 CPU 코어 수"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def configure_threads(num_threads: int = LAYOUTLM_NUM_THREADS) -> int:
+    """
+    CPU 추론 스레드 수 설정 (프로세스에서 한 번만 적용)
+
+    배치 하나의 연산자 내부 병렬화(intra-op)에 코어를 모두 쓰고,
+    배치는 순서대로 하나씩 실행하므로 연산자 간 병렬화(inter-op)는 1로 둔다.
+    """
+    global _NUM_THREADS
+    if _NUM_THREADS is not None:
+        return _NUM_THREADS
+
+    import torch
+
+    if num_threads <= 0:
+        num_threads = available_cpus()
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # 이미 병렬 작업이 시작된 뒤에는 바꿀 수 없음
+        pass
+    _NUM_THREADS = num_threads
+    return num_threads
@@ -1,7 +1,16 @@
 # src/layoutlm/inference.py
+import time
+import numpy as np
 import torch
-from typing import List, Dict, Any
-from src.docs_analysis.layoutlm.config import load_model
+from typing import List, Dict, Any, Tuple
+from src.docs_analysis.layoutlm.config import (
+    load_model, configure_threads, LAYOUTLM_BATCH_SIZE, LAYOUTLM_LENGTH_BUCKETING, LAYOUTLM_BUCKET_WIDTH
+)
+
+# 모델 forward에 넘기는 키 (encode_pages가 추가하는 window_page / word_ids 등은 제외)
+MODEL_INPUT_KEYS = ("input_ids", "attention_mask", "bbox", "pixel_values")
+# 토큰 축(두 번째 차원)이 있어 배치마다 잘라낼 수 있는 키
+SEQUENCE_KEYS = ("input_ids", "attention_mask", "bbox")
 
 def run_inference(inputs: Dict[str, torch.Tensor], label_list: List[str], tokenizer=None) -> List[List[Dict[str, Any]]]:
     """
@@ -22,57 +31,253 @@ def run_inference(inputs: Dict[str, torch.Tensor], label_list: List[str], tokeni
     model = load_model()
     model.eval()
 
-    with torch.no_grad():
+    predictions = predict_labels(model, inputs)
+    return decode_predictions(inputs, predictions, label_list, tokenizer)
+
+
+def predict_labels(model, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+    """모델 forward → 토큰별 예측 라벨 인덱스 (batch_size, seq_len)"""
+    with torch.inference_mode():
         outputs = model(**inputs)
         logits = outputs.logits  # (batch_size, seq_len, num_labels)
-        predictions = logits.argmax(dim=-1)  # (batch_size, seq_len)
+        return logits.argmax(dim=-1)
+
+
+def decode_tokens(token_ids: List[int], tokenizer) -> List[str]:
+    """토큰 id별 tokenizer.decode([id]) 결과 (고유 id만 한 번에 batch_decode)"""
+    unique = sorted(set(token_ids))
+    texts = dict(zip(unique, tokenizer.batch_decode([[i] for i in unique])))
+    return [texts[i] for i in token_ids]
 
-    # attention mask로 유효한(패딩 아닌) 토큰 식별
-    attention_mask = inputs.get("attention_mask", torch.ones_like(inputs["input_ids"]))
+
+def decode_predictions(
+    inputs: Dict[str, torch.Tensor],
+    predictions: torch.Tensor,
+    label_list: List[str],
+    tokenizer=None
+) -> List[List[Dict[str, Any]]]:
+    """
+    예측 라벨 인덱스 → 문서(페이지)별 토큰 예측 결과 (run_inference 반환 형식)
+
+    패딩(attention_mask == 0), 범위를 벗어난 예측, "O" 라벨을 텐서 연산으로 한 번에 걸러내고
+    남은 위치의 토큰 id / 라벨만 모아 결과를 만든다.
+    """
     input_ids = inputs["input_ids"]
-    
-    batch_size, seq_len = input_ids.shape
-    batch_results = []
-
-    # 배치의 각 문서를 개별적으로 처리
-    for batch_idx in range(batch_size):
-        doc_results = []
-        
-        for seq_idx in range(seq_len):
-            # 패딩 토큰은 건너뛰기
-            if attention_mask[batch_idx, seq_idx] == 0:
-                continue
-            
-            token_id = input_ids[batch_idx, seq_idx].item()
-            pred_idx = predictions[batch_idx, seq_idx].item()
-            
-            # 특수 토큰 건너뛰기 (선택사항 - 용도에 따라 다름)
-            # if token_id in [tokenizer.cls_token_id, tokenizer.sep_token_id, tokenizer.pad_token_id]:
-            #     continue
-            
-            # 예측 인덱스가 유효한지 확인
-            if pred_idx >= len(label_list):
+    attention_mask = inputs.get("attention_mask", torch.ones_like(input_ids))
+    batch_size = input_ids.shape[0]
+
+    # 라벨 인덱스 → 남길지 여부 (범위 밖 인덱스는 마지막 False 칸으로 보냄)
+    keep_label = torch.tensor([label != "O" for label in label_list] + [False])
+    pred = predictions.clamp(min=0, max=len(label_list))
+    mask = (attention_mask != 0) & keep_label[pred]
+
+    rows, cols = mask.nonzero(as_tuple=True)
+    token_ids = input_ids[rows, cols].tolist()
+    labels = [label_list[i] for i in pred[rows, cols].tolist()]
+    positions = cols.tolist()
+    texts = decode_tokens(token_ids, tokenizer) if tokenizer is not None else None
+
+    results = [{"token_id": t, "label": l, "position": p} for t, l, p in zip(token_ids, labels, positions)]
+    if texts is not None:
+        for result, text in zip(results, texts):
+            result["token_text"] = text
+
+    # nonzero는 행 순서로 정렬되어 있으므로 행별 개수로 잘라 문서별 리스트로 나눔
+    bounds = np.cumsum([0] + torch.bincount(rows, minlength=batch_size).tolist())
+    return [results[bounds[i]:bounds[i + 1]] for i in range(batch_size)]
+
+
+def _continuation_label(label: str) -> str:
+    """단어의 나머지 서브워드 라벨 (B-X/I-X → I-X, 그 외는 그대로)"""
+    if label.startswith("B-") or label.startswith("I-"):
+        return "I-" + label[2:]
+    return label
+
+
+def reconcile_windows(
+    input_ids: torch.Tensor,
+    predictions: torch.Tensor,
+    word_ids: torch.Tensor,
+    window_page: torch.Tensor,
+    num_pages: int,
+    label_list: List[str],
+    tokenizer=None
+) -> List[List[Dict[str, Any]]]:
+    """
+    윈도우별 예측 → 페이지별 토큰 예측 결과 (단어마다 라벨 하나)
+
+    겹치는 윈도우에 같은 단어가 여러 번 나오면, 단어 첫 서브워드가 윈도우 내용의 가장자리에서
+    가장 먼(앞뒤 문맥이 가장 많은) 윈도우의 예측을 쓴다. 단어 라벨은 그 윈도우에서
+    첫 서브워드의 예측이고, 나머지 서브워드에는 같은 엔티티의 I- 라벨을 붙여
+    aggregate_entities가 단어를 하나의 엔티티로 묶도록 한다.
+
+    Returns:
+        페이지별 결과 리스트 (run_inference 형식 + word_index: 페이지 내 단어 인덱스,
+        position은 선택된 윈도우 안의 토큰 위치)
+    """
+    ids = input_ids.cpu().numpy()
+    preds = predictions.cpu().numpy()
+    wids = word_ids.cpu().numpy()
+    pages = window_page.cpu().numpy()
+
+    # 페이지 → {단어 인덱스: (문맥 점수, 윈도우, 첫 서브워드 위치)}
+    owners: List[Dict[int, Tuple[int, int, int]]] = [{} for _ in range(num_pages)]
+    for window in range(ids.shape[0]):
+        row = wids[window]
+        positions = np.flatnonzero(row >= 0)
+        if not len(positions):
+            continue
+        lo, hi = positions[0], positions[-1]
+        first = positions[np.r_[True, row[positions[1:]] != row[positions[:-1]]]]
+        owner = owners[pages[window]]
+        for pos in first.tolist():
+            word = int(row[pos])
+            score = min(pos - lo, hi - pos)
+            if word not in owner or score > owner[word][0]:
+                owner[word] = (score, window, pos)
+
+    page_results: List[List[Dict[str, Any]]] = []
+    for owner in owners:
+        results = []
+        for word in sorted(owner):
+            _, window, pos = owner[word]
+            pred_idx = int(preds[window, pos])
+            if pred_idx >= len(label_list) or label_list[pred_idx] == "O":
                 continue
-                
+
             label = label_list[pred_idx]
-            
-            # "O" (외부) 라벨 건너뛰기 (엔티티만 원할 경우)
-            if label != "O":
-                result = {
-                    "token_id": token_id,
-                    "label": label,
-                    "position": seq_idx
-                }
-                
-                # tokenizer가 있으면 디코딩된 텍스트 추가
-                if tokenizer is not None:
-                    result["token_text"] = tokenizer.decode([token_id])
-                
-                doc_results.append(result)
-        
-        batch_results.append(doc_results)
-    
-    return batch_results
+            while pos < wids.shape[1] and wids[window, pos] == word:
+                token_id = int(ids[window, pos])
+                results.append({"token_id": token_id, "label": label, "position": pos, "word_index": word})
+                label = _continuation_label(label)
+                pos += 1
+        page_results.append(results)
+
+    if tokenizer is not None:
+        flat = [result for results in page_results for result in results]
+        for result, text in zip(flat, decode_tokens([r["token_id"] for r in flat], tokenizer)):
+            result["token_text"] = text
+
+    return page_results
+
+
+def plan_batches(
+    attention_mask: torch.Tensor,
+    batch_size: int,
+    bucketing: bool = LAYOUTLM_LENGTH_BUCKETING,
+    bucket_width: int = LAYOUTLM_BUCKET_WIDTH
+) -> List[Tuple[List[int], int]]:
+    """
+    윈도우를 배치로 나누고 배치마다 필요한 토큰 길이 계산
+
+    bucketing이면 윈도우를 실제 길이(attention_mask 합)를 bucket_width 단위로 올림한
+    길이 버킷 순(긴 버킷 먼저, 버킷 안에서는 원래 순서)으로 정렬한 뒤 batch_size씩 묶어
+    한 배치에 비슷한 길이의 윈도우만 모이게 한다. 아니면 원래 순서대로 묶는다.
+
+    Returns:
+        [(배치에 들어갈 윈도우 인덱스, 배치의 패딩 길이)] (패딩 길이 = 배치 내 가장 긴 윈도우 길이)
+    """
+    lengths = attention_mask.sum(dim=1).tolist()
+    order = list(range(len(lengths)))
+    if bucketing:
+        width = max(1, bucket_width)
+        # 안정 정렬이므로 같은 버킷 안에서는 원래 순서 유지
+        order.sort(key=lambda i: (lengths[i] + width - 1) // width, reverse=True)
+
+    batches = []
+    for start in range(0, len(order), batch_size):
+        windows = order[start:start + batch_size]
+        batches.append((windows, max(lengths[i] for i in windows)))
+    return batches
+
+
+def slice_batch(tensors: Dict[str, torch.Tensor], index: torch.Tensor, seq_len: int) -> Dict[str, torch.Tensor]:
+    """index 윈도우만 골라 토큰 축을 seq_len까지 자른 배치 (pixel_values는 윈도우만 선택)"""
+    return {k: (v[index, :seq_len] if k in SEQUENCE_KEYS else v[index]) for k, v in tensors.items()}
+
+
+def run_batched_inference(
+    inputs: Dict[str, torch.Tensor],
+    label_list: List[str],
+    tokenizer=None,
+    batch_size: int = LAYOUTLM_BATCH_SIZE,
+    model=None,
+    bucketing: bool = LAYOUTLM_LENGTH_BUCKETING
+) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    윈도우를 batch_size씩 묶어 추론 (동적 패딩 + 길이 버킷)
+
+    전체를 한 번에 forward하면 활성값 메모리가 윈도우 수에 비례해 커지므로 배치 단위로 실행하고,
+    배치마다 지연 시간을 기록한다. 긴 페이지의 추가 윈도우도 다른 페이지 윈도우와 같은 배치에 담긴다.
+    입력은 max_length까지 오른쪽 패딩되어 있으므로 배치마다 그 배치에서 가장 긴 윈도우 길이까지만
+    잘라 forward하고, bucketing이면 비슷한 길이의 윈도우끼리 묶어(plan_batches) 짧은 슬라이드가
+    512토큰 연산을 하지 않게 한다. 예측은 원래 윈도우 순서로 되돌려 놓는다.
+    encode_pages 결과(window_page / word_ids 포함)면 윈도우 예측을 페이지별 단어 라벨로 합치고,
+    그 외 입력은 행마다 페이지 하나로 보고 run_inference와 같은 결과를 낸다.
+
+    Returns:
+        (페이지별 토큰 예측 결과,
+         배치별 {pages: 포함된 페이지 번호 (1부터), size, seq_len: 패딩 길이, latency_ms})
+    """
+    if model is None:
+        model = load_model()
+    model.eval()
+    configure_threads()
+
+    tensors = {k: inputs[k] for k in MODEL_INPUT_KEYS if k in inputs}
+    input_ids = tensors["input_ids"]
+    num_windows, max_len = input_ids.shape
+    attention_mask = tensors.get("attention_mask", torch.ones_like(input_ids))
+    window_page = inputs.get("window_page")
+    if window_page is None:
+        window_page = torch.arange(num_windows)
+    batch_size = max(1, batch_size)
+
+    # 배치에서 잘린 뒤쪽(패딩) 위치는 attention_mask / word_ids로 걸러지므로 0으로 둠
+    predictions = torch.zeros((num_windows, max_len), dtype=torch.long)
+    batch_stats: List[Dict[str, Any]] = []
+
+    for windows, seq_len in plan_batches(attention_mask, batch_size, bucketing):
+        index = torch.tensor(windows)
+        batch = slice_batch(tensors, index, seq_len)
+
+        started = time.perf_counter()
+        predictions[index, :seq_len] = predict_labels(model, batch)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        pages = sorted({int(p) + 1 for p in window_page[index].tolist()})
+        batch_stats.append({
+            "pages": pages,
+            "size": len(windows),
+            "seq_len": seq_len,
+            "latency_ms": round(latency_ms, 2),
+        })
+        print(f"  ⏱️ 배치 {len(batch_stats)} (윈도우 {len(windows)}개, 길이 {seq_len}, "
+              f"페이지 {len(pages)}장): {latency_ms:.0f}ms")
+
+    return collect_page_results(inputs, predictions, label_list, tokenizer), batch_stats
+
+
+def collect_page_results(
+    inputs: Dict[str, torch.Tensor],
+    predictions: torch.Tensor,
+    label_list: List[str],
+    tokenizer=None
+) -> List[List[Dict[str, Any]]]:
+    """
+    원래 윈도우 순서의 예측 (윈도우 수, max_len) → 페이지별 토큰 예측 결과
+
+    encode_pages 결과(window_page / word_ids 포함)면 윈도우 예측을 페이지별 단어 라벨로 합치고,
+    그 외 입력은 행마다 페이지 하나로 보고 run_inference와 같은 결과를 낸다.
+    """
+    if "word_ids" not in inputs:
+        return decode_predictions(inputs, predictions, label_list, tokenizer)
+
+    window_page = inputs["window_page"]
+    num_pages = int(window_page.max()) + 1 if len(window_page) else 0
+    return reconcile_windows(
+        inputs["input_ids"], predictions, inputs["word_ids"], window_page, num_pages, label_list, tokenizer
+    )
 
 
 def aggregate_entities(results: List[Dict[str, Any]], tokenizer=None) -> List[Dict[str, Any]]:
@@ -86,43 +291,71 @@ def aggregate_entities(results: List[Dict[str, Any]], tokenizer=None) -> List[Di
     Returns:
         결합된 텍스트를 가진 집계된 엔티티 리스트
     """
-    entities = []
-    current_entity = None
-    
-    for result in results:
-        label = result["label"]
-        
-        if label.startswith("B-"):
-            # 새 엔티티 시작
-            if current_entity is not None:
-                entities.append(current_entity)
-            
-            entity_type = label[2:]  # "B-" 접두사 제거
-            current_entity = {
-                "entity_type": entity_type,
-                "tokens": [result["token_text"]] if "token_text" in result else [],
-                "token_ids": [result["token_id"]],
-                "start_position": result["position"]
-            }
-            
-        elif label.startswith("I-") and current_entity is not None:
-            # 현재 엔티티 계속
-            entity_type = label[2:]
-            if current_entity["entity_type"] == entity_type:
-                if "token_text" in result:
-                    current_entity["tokens"].append(result["token_text"])
-                current_entity["token_ids"].append(result["token_id"])
-    
-    # 마지막 엔티티 잊지 않기
-    if current_entity is not None:
-        entities.append(current_entity)
-    
-    # 각 엔티티의 전체 텍스트 재구성
-    for entity in entities:
-        if tokenizer and entity["tokens"]:
-            # 서브워드 토큰을 올바르게 처리하여 재구성
-            entity["text"] = tokenizer.convert_tokens_to_string(entity["tokens"])
-        else:
-            entity["text"] = " ".join(entity["tokens"])
-    
-    return entities
\ No newline at end of file
+    return aggregate_page_entities([results], tokenizer)[0]
+
+
+def aggregate_page_entities(
+    page_results: List[List[Dict[str, Any]]],
+    tokenizer=None
+) -> List[List[Dict[str, Any]]]:
+    """
+    여러 페이지의 토큰 예측 결과를 한 번에 엔티티로 집계 (페이지별 aggregate_entities와 같은 결과)
+
+    B- 라벨마다 엔티티가 시작되고, 다음 B- 전까지의 같은 페이지 I- 토큰 중 타입이 같은 것만 이어 붙인다
+    (첫 B- 이전의 I-, 타입이 다른 I-, B-/I- 접두사가 없는 라벨은 무시).
+    모든 페이지의 라벨을 정수 배열로 바꿔 엔티티 번호(B- 누적 개수)와 소속 여부를 한 번에 계산한다.
+    """
+    results = [result for page in page_results for result in page]
+    entities: List[List[Dict[str, Any]]] = [[] for _ in page_results]
+    if not results:
+        return entities
+
+    # 라벨 → 정수 코드 (고유 라벨마다 접두사 종류 / 타입 번호를 한 번만 계산)
+    label_codes: Dict[str, int] = {}
+    codes = np.array([label_codes.setdefault(result["label"], len(label_codes)) for result in results])
+    unique_labels = list(label_codes)
+    type_codes: Dict[str, int] = {}
+    label_kind = np.array([{"B-": 1, "I-": 2}.get(label[:2], 0) for label in unique_labels])
+    label_type = np.array([type_codes.setdefault(label[2:], len(type_codes)) for label in unique_labels])
+
+    kinds = label_kind[codes]
+    types = label_type[codes]
+    pages = np.repeat(np.arange(len(page_results)), [len(page) for page in page_results])
+    is_begin = kinds == 1
+    starts = np.flatnonzero(is_begin)
+    if not len(starts):
+        return entities
+
+    # 각 토큰이 속한 엔티티 번호 (첫 B- 이전은 -1), 엔티티는 시작한 페이지 안에서만 이어짐
+    entity_idx = np.cumsum(is_begin) - 1
+    owner = starts[np.maximum(entity_idx, 0)]
+    member = (entity_idx >= 0) & (pages == pages[owner]) & (
+        is_begin | ((kinds == 2) & (types == types[owner]))
+    )
+
+    # 소속 토큰은 엔티티 순서대로 정렬되어 있으므로 엔티티별 구간으로 잘라 씀
+    member_idx = np.flatnonzero(member)
+    bounds = np.searchsorted(entity_idx[member_idx], np.arange(len(starts) + 1)).tolist()
+    members = [results[i] for i in member_idx.tolist()]
+    member_ids = [m["token_id"] for m in members]
+    member_texts = [m.get("token_text") for m in members]
+    all_texts = None not in member_texts
+
+    # 같은 토큰 열은 같은 텍스트로 재구성되므로 한 번만 변환
+    joined: Dict[tuple, str] = {}
+    for k, (start, page) in enumerate(zip(starts.tolist(), pages[starts].tolist())):
+        lo, hi = bounds[k], bounds[k + 1]
+        tokens = member_texts[lo:hi] if all_texts else [t for t in member_texts[lo:hi] if t is not None]
+        key = tuple(tokens)
+        if key not in joined:
+            # 서브워드 토큰을 올바르게 처리하여 전체 텍스트 재구성
+            joined[key] = tokenizer.convert_tokens_to_string(tokens) if tokenizer and tokens else " ".join(tokens)
+        entities[page].append({
+            "entity_type": results[start]["label"][2:],
+            "tokens": tokens,
+            "token_ids": member_ids[lo:hi],
+            "start_position": results[start]["position"],
+            "text": joined[key],
+        })
+
+    return entities
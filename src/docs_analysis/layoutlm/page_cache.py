@@ -0,0 +1,84 @@
+# src/layoutlm/page_cache.py
+"""
+LayoutLM 페이지 이미지 캐시 (PDF 내용 해시 기반)
+
+PDF 바이트의 SHA-256 + 페이지 인덱스 + 렌더링 크기 + 이미지 프로세서 설정으로 키를 만들어
+정규화까지 끝난 페이지별 pixel_values (float32, 3×H×W)를 .npy로 저장한다.
+OCR 결과를 재사용하는 반복 실행이나 다른 라벨 세트로 다시 분석할 때
+렌더링과 이미지 정규화를 모두 건너뛰고, 항목은 메모리 맵으로 읽는다.
+"""
+
+import hashlib
+import io
+import json
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.utils.disk_cache import DiskLRUCache
+from src.docs_analysis.layoutlm.config import LAYOUTLM_PAGE_CACHE_DIR, LAYOUTLM_PAGE_CACHE_MAX_BYTES
+
+# 저장 형식/렌더링 방식이 바뀌면 올려서 기존 항목 무효화
+PAGE_CACHE_VERSION = 1
+
+_CACHE: Optional["PageCache"] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def image_processor_fingerprint(image_processor) -> str:
+    """pixel_values에 영향을 주는 이미지 프로세서 설정 (리사이즈/정규화 파라미터) 해시"""
+    config = image_processor.to_dict() if hasattr(image_processor, "to_dict") else {}
+    params = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(params.encode()).hexdigest()
+
+
+def page_cache_key(pdf_hash: str, page_index: int, size: Tuple[int, int], processor_fingerprint: str) -> str:
+    """PDF 해시 + 페이지 인덱스 + 렌더링 크기 + 이미지 프로세서 설정으로 캐시 키 생성"""
+    params = json.dumps(
+        {
+            "version": PAGE_CACHE_VERSION,
+            "page": page_index,
+            "size": list(size),
+            "image_processor": processor_fingerprint,
+        },
+        sort_keys=True,
+    )
+    h = hashlib.sha256()
+    h.update(pdf_hash.encode())
+    h.update(params.encode())
+    return h.hexdigest()
+
+
+class PageCache:
+    """페이지별 pixel_values 배열을 저장하는 디스크 LRU 캐시"""
+
+    def __init__(self, root: str = LAYOUTLM_PAGE_CACHE_DIR, max_bytes: int = LAYOUTLM_PAGE_CACHE_MAX_BYTES):
+        self._store = DiskLRUCache(root, max_bytes, suffix=".npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self._store.touch(key)
+        if path is None:
+            return None
+        try:
+            return np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            # 조회 직후 다른 스레드가 삭제했거나 손상된 항목
+            return None
+
+    def put(self, key: str, pixel_values: np.ndarray):
+        buffer = io.BytesIO()
+        np.save(buffer, np.ascontiguousarray(pixel_values, dtype=np.float32))
+        self._store.put_bytes(key, buffer.getvalue())
+
+    def stats(self) -> Dict:
+        return self._store.stats()
+
+
+def get_page_cache() -> PageCache:
+    """프로세스 전역 페이지 이미지 캐시"""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = PageCache()
+        return _CACHE
@@ -0,0 +1,210 @@
+# src/layoutlm/parallel.py
+"""
+멀티 프로세스 LayoutLM 추론 (배치를 워커 프로세스에 나눠 실행)
+
+intra-op 스레드는 코어 수가 많아지면 더 이상 빨라지지 않으므로,
+코어를 워커 수로 나눠 워커마다 고정된 스레드 수(와 CPU 코어 집합)를 주고 배치를 동시에 실행한다.
+
+- 워커는 프로세스 전역 풀로 한 번 띄우고, 모델은 워커마다 시작할 때 한 번만 로딩한다
+  (같은 설정으로 다시 호출하면 같은 풀을 재사용하므로 두 번째 문서부터는 로딩 비용 없음)
+- 입력 텐서와 예측 결과 텐서는 공유 메모리에 두고 핸들만 넘긴다 (torch.multiprocessing)
+- 워커는 예측을 결과 텐서의 원래 윈도우 행에 직접 쓰므로, 끝난 뒤 페이지 순서대로 결과를 만든다
+"""
+
+import atexit
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+import torch.multiprocessing as mp
+
+from src.docs_analysis.layoutlm.config import (
+    LAYOUTLM_BATCH_SIZE,
+    LAYOUTLM_LENGTH_BUCKETING,
+    LAYOUTLM_NUM_WORKERS,
+    LAYOUTLM_WORKER_START_TIMEOUT,
+    LAYOUTLM_WORKER_THREADS,
+    available_cpus,
+    configure_threads,
+    load_model
+)
+from src.docs_analysis.layoutlm.inference import (
+    MODEL_INPUT_KEYS,
+    collect_page_results,
+    plan_batches,
+    predict_labels,
+    slice_batch
+)
+
+_POOL = None
+_POOL_KEY: Optional[Tuple] = None
+_POOL_STARTUP_MS = 0.0
+
+# 워커 프로세스 전역
+_WORKER_MODEL = None
+_WORKER_ID = None
+_WORKER_ERROR: Optional[str] = None
+
+
+def worker_threads(num_workers: int, threads: int = LAYOUTLM_WORKER_THREADS) -> int:
+    """워커당 intra-op 스레드 수 (0이면 사용 가능한 코어를 워커 수로 나눈 값, 최소 1)"""
+    if threads > 0:
+        return threads
+    return max(1, available_cpus() // num_workers)
+
+
+def _init_worker(worker_ids, ready, threads: int, model_factory: Optional[Callable]):
+    """
+    워커 시작: CPU 코어 고정 → 스레드 수 고정 → 모델 한 번 로딩 → ready에 알림
+
+    어느 단계에서 실패해도 ready에는 반드시 알린다 (부모가 ready를 기다리며 멈추지 않도록).
+    풀이 다시 띄운 워커는 id 큐가 이미 비어 있으므로 프로세스 id를 워커 id로 쓴다.
+    """
+    global _WORKER_MODEL, _WORKER_ID, _WORKER_ERROR
+    try:
+        _WORKER_ID = worker_ids.get_nowait()
+    except queue.Empty:
+        _WORKER_ID = os.getpid()
+
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+            # 워커마다 겹치지 않는 코어 threads개 (코어가 모자라면 돌아가며 공유)
+            pinned = {cores[(_WORKER_ID * threads + i) % len(cores)] for i in range(threads)}
+            os.sched_setaffinity(0, pinned)
+        configure_threads(threads)
+
+        _WORKER_MODEL = model_factory() if model_factory is not None else load_model()
+        _WORKER_MODEL.eval()
+    except Exception as e:
+        # 초기화에서 예외가 나면 풀이 워커를 계속 다시 띄우므로, 작업을 받을 때 오류로 돌려줌
+        _WORKER_ERROR = f"{type(e).__name__}: {e}"
+    finally:
+        ready.put(_WORKER_ID)
+
+
+def _run_batch(
+    tensors: Dict[str, torch.Tensor],
+    predictions: torch.Tensor,
+    windows: List[int],
+    seq_len: int
+) -> Tuple[int, float]:
+    """배치 하나를 추론해 공유 예측 텐서의 해당 윈도우 행에 기록 → (워커 id, 지연 시간 ms)"""
+    if _WORKER_ERROR is not None:
+        raise RuntimeError(f"❌ LayoutLM 워커 {_WORKER_ID} 모델 로딩 실패: {_WORKER_ERROR}")
+    index = torch.tensor(windows)
+    started = time.perf_counter()
+    predictions[index, :seq_len] = predict_labels(_WORKER_MODEL, slice_batch(tensors, index, seq_len))
+    return _WORKER_ID, (time.perf_counter() - started) * 1000
+
+
+def get_worker_pool(num_workers: int, threads: int, model_factory: Optional[Callable] = None):
+    """
+    프로세스 전역 워커 풀 (같은 설정이면 재사용, 설정이 바뀌면 새로 띄움)
+
+    spawn으로 띄워 부모의 스레드/OpenMP 상태를 물려받지 않게 한다.
+    LAYOUTLM_WORKER_START_TIMEOUT초 안에 모든 워커가 준비되지 않으면 풀을 정리하고 RuntimeError.
+    """
+    global _POOL, _POOL_KEY, _POOL_STARTUP_MS
+    key = (num_workers, threads, model_factory)
+    if _POOL is not None and _POOL_KEY == key:
+        return _POOL
+    shutdown_worker_pool()
+
+    print(f"⏳ LayoutLM 워커 {num_workers}개 시작 중 (워커당 스레드 {threads}개)...")
+    started = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    worker_ids, ready = ctx.Queue(), ctx.Queue()
+    for worker_id in range(num_workers):
+        worker_ids.put(worker_id)
+    pool = ctx.Pool(num_workers, initializer=_init_worker, initargs=(worker_ids, ready, threads, model_factory))
+    # 모든 워커가 모델 로딩을 마칠 때까지 대기
+    deadline = started + LAYOUTLM_WORKER_START_TIMEOUT
+    try:
+        for _ in range(num_workers):
+            ready.get(timeout=max(deadline - time.perf_counter(), 0.0))
+    except queue.Empty:
+        pool.terminate()
+        pool.join()
+        raise RuntimeError(
+            f"❌ LayoutLM 워커 풀 시작 시간 초과 ({LAYOUTLM_WORKER_START_TIMEOUT:.0f}s 안에 준비되지 않은 워커가 있음)"
+        )
+    _POOL_STARTUP_MS = (time.perf_counter() - started) * 1000
+    print(f"  ✅ 워커 준비 완료 ({_POOL_STARTUP_MS:.0f}ms)")
+
+    _POOL, _POOL_KEY = pool, key
+    return pool
+
+
+def shutdown_worker_pool():
+    """워커 풀 종료"""
+    global _POOL, _POOL_KEY
+    if _POOL is not None:
+        _POOL.close()
+        _POOL.join()
+    _POOL, _POOL_KEY = None, None
+
+
+atexit.register(shutdown_worker_pool)
+
+
+def run_sharded_inference(
+    inputs: Dict[str, torch.Tensor],
+    label_list: List[str],
+    tokenizer=None,
+    batch_size: int = LAYOUTLM_BATCH_SIZE,
+    num_workers: int = LAYOUTLM_NUM_WORKERS,
+    threads: int = LAYOUTLM_WORKER_THREADS,
+    model_factory: Optional[Callable] = None,
+    bucketing: bool = LAYOUTLM_LENGTH_BUCKETING
+) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    run_batched_inference와 같은 배치 계획으로 배치를 워커 프로세스에 나눠 추론
+
+    입력 텐서는 공유 메모리로 옮긴다 (share_memory_, 제자리 변경). 워커의 모델은 model_factory()
+    (피클 가능한 최상위 함수/partial) 또는 각 워커의 load_model()로 만든다.
+
+    Returns:
+        (페이지별 토큰 예측 결과, 배치별 {pages, size, seq_len, latency_ms, worker}) — 배치 계획 순서
+    """
+    threads = worker_threads(num_workers, threads)
+    pool = get_worker_pool(num_workers, threads, model_factory)
+
+    tensors = {k: inputs[k].share_memory_() for k in MODEL_INPUT_KEYS if k in inputs}
+    input_ids = tensors["input_ids"]
+    num_windows, max_len = input_ids.shape
+    attention_mask = tensors.get("attention_mask", torch.ones_like(input_ids))
+    window_page = inputs.get("window_page")
+    if window_page is None:
+        window_page = torch.arange(num_windows)
+
+    # 잘린 뒤쪽(패딩) 위치는 0으로 남음 (run_batched_inference와 같음)
+    predictions = torch.zeros((num_windows, max_len), dtype=torch.long).share_memory_()
+    batches = plan_batches(attention_mask, max(1, batch_size), bucketing)
+    pending = [
+        pool.apply_async(_run_batch, (tensors, predictions, windows, seq_len))
+        for windows, seq_len in batches
+    ]
+
+    batch_stats: List[Dict[str, Any]] = []
+    for (windows, seq_len), result in zip(batches, pending):
+        worker_id, latency_ms = result.get()
+        pages = sorted({int(p) + 1 for p in window_page[torch.tensor(windows)].tolist()})
+        batch_stats.append({
+            "pages": pages,
+            "size": len(windows),
+            "seq_len": seq_len,
+            "latency_ms": round(latency_ms, 2),
+            "worker": worker_id,
+        })
+        print(f"  ⏱️ 배치 {len(batch_stats)} (워커 {worker_id}, 윈도우 {len(windows)}개, 길이 {seq_len}, "
+              f"페이지 {len(pages)}장): {latency_ms:.0f}ms")
+
+    return collect_page_results(inputs, predictions, label_list, tokenizer), batch_stats
+
+
+def pool_startup_ms() -> float:
+    """현재 워커 풀을 띄우고 모델을 로딩하는 데 걸린 시간 (ms)"""
+    return _POOL_STARTUP_MS
@@ -3,9 +3,18 @@
 LayoutLM 전처리 및 라벨 정의
 """
 
-from typing import Dict, List, Tuple
-from pdf2image import convert_from_path
-from src.utils.io_utils import read_json
+import os
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import torch
+from src.docs_analysis.layoutlm.config import (
+    LAYOUTLM_MAX_LENGTH, LAYOUTLM_STRIDE, LAYOUTLM_RENDER_PAGES, LAYOUTLM_PAGE_CACHE_ENABLED
+)
+from src.docs_analysis.layoutlm.page_cache import get_page_cache
+from src.docs_analysis.layoutlm.raster import iter_page_pixels, render_size
+from src.docs_analysis.document_ai.document import load_document
+from src.docs_analysis.document_ai.token_table import TokenTable
+from src.utils.io_utils import shard_artifact_path
 
 
 # 공고문 라벨 (17개)
@@ -174,149 +183,213 @@ def get_label_info(doc_type: str = None) -> Dict:
     return info
 
 
-def load_docai_json(path: str) -> Dict:
-    """Document AI JSON 로드"""
-    return read_json(path)
+def load_docai_json(path: str) -> Mapping:
+    """
+    Document AI 결과 로드 (병합 결과 같은 샤드 산출물은 pages를 접근할 때 한 페이지씩 읽는 Document)
 
+    청크 병합 결과는 *.pkas로 저장되므로, *.json 경로가 없고 같은 이름의 .pkas가 있으면 그 파일을 읽는다.
+    """
+    if not os.path.exists(path) and os.path.exists(shard_artifact_path(path)):
+        path = shard_artifact_path(path)
+    return load_document(path)
 
-def convert_bounding_poly(bounding_poly: Dict, width: int, height: int) -> List[int]:
-    """Document AI boundingPoly → LayoutLM normalized bbox (0-1000)"""
-    
-    if "normalizedVertices" in bounding_poly:
-        verts = bounding_poly["normalizedVertices"]
-        xs = [v.get("x", 0) * 1000 for v in verts]
-        ys = [v.get("y", 0) * 1000 for v in verts]
-    elif "vertices" in bounding_poly:
-        verts = bounding_poly["vertices"]
-        xs = [v.get("x", 0) / width * 1000 for v in verts]
-        ys = [v.get("y", 0) / height * 1000 for v in verts]
-    else:
-        return [0, 0, 0, 0]
-    
-    return [
-        int(min(xs)),
-        int(min(ys)),
-        int(max(xs)),
-        int(max(ys)),
-    ]
 
+def _page_word_rows(token_table: TokenTable, page_idx: int) -> Tuple[List[List[str]], np.ndarray]:
+    """
+    한 페이지에서 단어를 내는 행들의 단어 리스트와 LayoutLM bbox (0-1000, int64 (행 수, 4))
 
-def extract_text_from_segment(full_text: str, segment: Dict) -> str:
-    """textAnchor segment에서 실제 텍스트 추출"""
+    - boundingPoly가 없는 블록은 건너뜀
+    - 블록 안에 paragraph가 있으면 paragraph 단위 bbox, 없으면 블록 bbox 사용
+    블록/단위 행 선택과 bbox 정규화는 페이지의 모든 행에 대한 배열 연산으로 한 번에 하고,
+    선택된 행의 텍스트만 잘라 단어로 나눈다.
+    """
+    rows = token_table.page_rows(page_idx)
+    block_ids = token_table.block[rows]
+    n_rows = len(block_ids)
+    if not n_rows:
+        return [], np.zeros((0, 4), dtype=np.int64)
+    
+    is_para = token_table.paragraph[rows] != -1
+    bboxes = token_table.bbox[rows]
+    has_bbox = ~np.isnan(bboxes[:, 0])
+    
+    # 연속된 같은 block id가 블록 하나 (블록 행(paragraph = -1)이 항상 블록의 첫 행)
+    new_block = np.empty(n_rows, dtype=bool)
+    new_block[0] = True
+    np.not_equal(block_ids[1:], block_ids[:-1], out=new_block[1:])
+    block_starts = np.flatnonzero(new_block)
+    block_of_row = np.cumsum(new_block) - 1
+    block_has_para = np.logical_or.reduceat(is_para, block_starts)
+    selected = np.flatnonzero(
+        has_bbox[block_starts][block_of_row]
+        & (is_para == block_has_para[block_of_row])
+        & has_bbox
+    )
+    
+    full_text = token_table.text
+    starts = token_table.start[rows][selected].tolist()
+    ends = token_table.end[rows][selected].tolist()
+    row_words = [full_text[start:end].split() for start, end in zip(starts, ends)]
     
-    start = int(segment.get("startIndex", 0))
-    end = int(segment.get("endIndex", 0))
-    return full_text[start:end].strip()
+    # astype는 int()처럼 0 방향으로 버림
+    return row_words, (bboxes[selected] * 1000).astype(np.int64)
+
+
+def extract_page_words(token_table: TokenTable, page_idx: int) -> Tuple[List[str], List[List[int]]]:
+    """
+    토큰 테이블에서 한 페이지의 단어와 bbox 추출 (토크나이저 입력용 리스트, _page_word_rows 참고)
+    같은 행의 단어들은 bbox 리스트 하나를 함께 참조한다.
+    """
+    row_words, row_boxes = _page_word_rows(token_table, page_idx)
+    page_tokens = [word for words in row_words for word in words]
+    page_boxes = [box for words, box in zip(row_words, row_boxes.tolist()) for _ in words]
+    return page_tokens, page_boxes
+
+
+def encode_pages(
+    processor,
+    images: Optional[List],
+    page_tokens: List[List[str]],
+    page_boxes: List[List[List[int]]],
+    max_length: int = LAYOUTLM_MAX_LENGTH,
+    stride: Optional[int] = LAYOUTLM_STRIDE,
+    pixel_values: Optional[torch.Tensor] = None
+) -> Dict:
+    """
+    페이지별 단어/bbox/이미지 → LayoutLMv3 입력 텐서 (max_length 토큰 윈도우 단위)
+
+    stride가 있으면 max_length를 넘는 페이지를 stride 토큰씩 겹치는 윈도우 여러 개로 나눠
+    뒤쪽 단어도 빠짐없이 인코딩한다 (None 또는 음수면 이전처럼 max_length에서 잘라냄).
+    pixel_values (페이지 수, 3, H, W)를 넘기면 images 대신 그대로 쓴다 (이미 정규화된 캐시 값).
+    첫 번째 차원은 페이지가 아니라 윈도우이며 다음 키가 추가된다.
+    - window_page: 윈도우별 페이지 인덱스 (0부터)
+    - word_ids: 토큰별 페이지 내 단어 인덱스 (특수/패딩 토큰은 -1)
+    """
+    use_windows = stride is not None and stride >= 0
+    if pixel_values is None:
+        pixel_values = processor.image_processor(images=images, return_tensors="pt")["pixel_values"]
+    # processor(...)와 같은 토크나이저 호출 (이미지는 윈도우별 페이지로 따로 매핑)
+    encoding = processor.tokenizer(
+        text=page_tokens,
+        boxes=page_boxes,
+        return_tensors="pt",
+        padding="max_length",
+        truncation=True,
+        max_length=max_length,
+        stride=stride if use_windows else 0,
+        return_overflowing_tokens=use_windows,
+    )
+
+    num_windows = encoding["input_ids"].shape[0]
+    if use_windows:
+        window_page = encoding.pop("overflow_to_sample_mapping")
+        window_page = torch.as_tensor(window_page, dtype=torch.long)
+    else:
+        window_page = torch.arange(num_windows)
+    encoding["pixel_values"] = pixel_values[window_page]
+    encoding["window_page"] = window_page
+    encoding["word_ids"] = torch.tensor(
+        [[-1 if w is None else w for w in encoding.word_ids(i)] for i in range(num_windows)],
+        dtype=torch.long,
+    )
+    return encoding
+
+
+def concat_encodings(encodings: List[Dict], page_offsets: List[int]) -> Dict:
+    """
+    페이지 묶음별 encode_pages 결과를 하나로 합침
+
+    모든 묶음이 max_length까지 패딩되어 있으므로 텐서를 첫 번째 차원으로 이어 붙이고,
+    window_page는 묶음의 첫 페이지 인덱스(page_offsets)만큼 더해 전체 페이지 기준으로 바꾼다.
+    """
+    if len(encodings) == 1:
+        return encodings[0]
+    merged = {}
+    for key in encodings[0].keys():
+        if key == "window_page":
+            merged[key] = torch.cat([e[key] + offset for e, offset in zip(encodings, page_offsets)])
+        else:
+            merged[key] = torch.cat([e[key] for e in encodings])
+    return merged
 
 
 def prepare_layoutlm_input(
-    doc_json: Dict,
+    doc_json: Optional[Mapping],
     pdf_path: str,
     processor,
-    max_length: int = 512
+    max_length: int = LAYOUTLM_MAX_LENGTH,
+    token_table: Optional[TokenTable] = None,
+    stride: Optional[int] = LAYOUTLM_STRIDE,
+    render_pages: int = LAYOUTLM_RENDER_PAGES,
+    use_page_cache: bool = LAYOUTLM_PAGE_CACHE_ENABLED
 ) -> Dict:
-    """Document AI JSON + PDF → LayoutLMv3 입력 텐서"""
-    
-    pages = doc_json.get("pages", [])
-    if not pages:
-        raise ValueError("❌ OCR JSON에 pages가 없습니다.")
+    """
+    Document AI 결과(또는 토큰 테이블) + PDF → LayoutLMv3 입력 텐서 (encode_pages 참고)
+    (doc_json이 지연 로딩 Document면 토큰 테이블을 만들 때 페이지를 한 장씩 읽음)
+
+    PDF는 render_pages장씩 모델 입력 크기로 렌더링/정규화해 바로 인코딩하므로 (raster.iter_page_pixels)
+    전체 해상도 페이지 이미지를 한꺼번에 메모리에 올리지 않는다.
+    use_page_cache면 같은 PDF의 페이지는 디스크 캐시에서 pixel_values를 읽어 렌더링을 건너뛴다.
+    결과에는 페이지별 이미지 준비 시간(render_ms)이 추가된다.
+    """
     
-    full_text = doc_json.get("text", "")
+    if token_table is None:
+        token_table = TokenTable.from_document(doc_json or {})
     
-    print(f"📄 PDF → 이미지 변환 중...")
-    images = convert_from_path(pdf_path)
+    num_pages = token_table.num_pages
+    if not num_pages:
+        raise ValueError("❌ OCR JSON에 pages가 없습니다.")
     
-    if len(images) != len(pages):
-        print(f"⚠️ 경고: PDF 페이지 수({len(images)})와 OCR 페이지 수({len(pages)})가 다릅니다.")
+    size = render_size(processor.image_processor)
+    cache = get_page_cache() if use_page_cache else None
+    print(f"📄 PDF → 이미지 변환 + 인코딩 중 ({render_pages}페이지씩, {size[0]}x{size[1]})...")
     
-    all_page_tokens: List[List[str]] = []
-    all_page_boxes: List[List[List[int]]] = []
-    all_page_images: List = []
+    encodings: List[Dict] = []
+    page_offsets: List[int] = []
+    render_ms: List[float] = []
+    total_tokens = 0
     
-    for idx, page in enumerate(pages):
-        dim = page.get("dimension", {})
-        width = dim.get("width", 1)
-        height = dim.get("height", 1)
-        
-        page_tokens = []
-        page_boxes = []
-        
-        for block in page.get("blocks", []):
-            block_layout = block.get("layout", {})
-            block_text_anchor = block_layout.get("textAnchor", {})
-            block_bbox = block_layout.get("boundingPoly")
-            
-            if not block_bbox:
-                continue
-            
-            if "paragraphs" in block and block.get("paragraphs"):
-                for paragraph in block.get("paragraphs", []):
-                    para_layout = paragraph.get("layout", {})
-                    para_text_anchor = para_layout.get("textAnchor", {})
-                    para_bbox = para_layout.get("boundingPoly")
-                    
-                    if not para_bbox:
-                        continue
-                    
-                    for segment in para_text_anchor.get("textSegments", []):
-                        text = extract_text_from_segment(full_text, segment)
-                        
-                        if not text or text.isspace():
-                            continue
-                        
-                        words = text.split()
-                        norm_bbox = convert_bounding_poly(para_bbox, width, height)
-                        
-                        for word in words:
-                            if word.strip():
-                                page_tokens.append(word)
-                                page_boxes.append(norm_bbox)
-            else:
-                for segment in block_text_anchor.get("textSegments", []):
-                    text = extract_text_from_segment(full_text, segment)
-                    
-                    if not text or text.isspace():
-                        continue
-                    
-                    words = text.split()
-                    norm_bbox = convert_bounding_poly(block_bbox, width, height)
-                    
-                    for word in words:
-                        if word.strip():
-                            page_tokens.append(word)
-                            page_boxes.append(norm_bbox)
+    page_chunks = iter_page_pixels(
+        pdf_path, num_pages, processor.image_processor, batch_pages=render_pages, cache=cache
+    )
+    for start, pixel_values, timings in page_chunks:
+        page_tokens: List[List[str]] = []
+        page_boxes: List[List[List[int]]] = []
+        for idx in range(start, start + len(pixel_values)):
+            tokens, boxes = extract_page_words(token_table, idx)
+            page_tokens.append(tokens)
+            page_boxes.append(boxes)
         
-        all_page_tokens.append(page_tokens)
-        all_page_boxes.append(page_boxes)
+        if start == 0 and page_tokens[0]:
+            print(f"  - 첫 페이지 토큰 샘플: {page_tokens[0][:10]}")
+            print(f"  - 첫 페이지 bbox 샘플: {page_boxes[0][:2]}")
+        total_tokens += sum(len(t) for t in page_tokens)
         
-        if idx < len(images):
-            all_page_images.append(images[idx])
-        else:
-            all_page_images.append(images[-1])
-    
-    total_tokens = sum(len(t) for t in all_page_tokens)
+        encodings.append(encode_pages(
+            processor,
+            None,
+            page_tokens,
+            page_boxes,
+            max_length=max_length,
+            stride=stride,
+            pixel_values=pixel_values,
+        ))
+        page_offsets.append(start)
+        render_ms.extend(timings)
+    
+    encoding = concat_encodings(encodings, page_offsets)
+    encoding["render_ms"] = render_ms
+    
+    num_windows = encoding["input_ids"].shape[0]
     print(f"\n🔍 전처리 결과:")
-    print(f"  - 페이지 수: {len(all_page_images)}")
+    print(f"  - 페이지 수: {num_pages}")
     print(f"  - 총 토큰 수: {total_tokens}")
-    
-    if total_tokens > 0:
-        print(f"  - 첫 페이지 토큰 샘플: {all_page_tokens[0][:10]}")
-        print(f"  - 첫 페이지 bbox 샘플: {all_page_boxes[0][:2]}")
-    else:
+    if total_tokens == 0:
         print("  ⚠️ 경고: 추출된 토큰이 없습니다!")
-    
-    print(f"\n🤖 LayoutLM Processor 인코딩 중...")
-    encoding = processor(
-        images=all_page_images,
-        text=all_page_tokens,
-        boxes=all_page_boxes,
-        return_tensors="pt",
-        padding="max_length",
-        truncation=True,
-        max_length=max_length,
-    )
-    
-    print(f"  ✅ 인코딩 완료")
+    print(f"  - 이미지 준비: {sum(render_ms):.0f}ms ({sum(render_ms) / num_pages:.0f}ms/page)")
+    if cache is not None:
+        print(f"  - 페이지 캐시: {cache.stats()}")
+    print(f"  - 윈도우 수: {num_windows} (긴 페이지 추가 윈도우 {num_windows - num_pages}개)")
     print(f"  - input_ids shape: {encoding['input_ids'].shape}")
     print(f"  - bbox shape: {encoding['bbox'].shape}")
     print(f"  - pixel_values shape: {encoding['pixel_values'].shape}\n")
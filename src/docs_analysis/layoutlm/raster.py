@@ -0,0 +1,112 @@
+# src/layoutlm/raster.py
+"""
+LayoutLM 입력용 PDF 페이지 래스터화 (스트리밍)
+
+이미지 프로세서는 페이지 이미지를 어차피 모델 입력 크기(224×224)로 줄이므로
+기본 200 DPI 전체 해상도로 모든 페이지를 한꺼번에 렌더링해 메모리에 올리지 않고,
+페이지 범위를 차례로 모델 입력 크기에 맞춰 바로 렌더링/정규화해 묶음 단위로 넘긴다.
+메모리에는 한 묶음의 작은 이미지만 남는다.
+페이지 캐시(page_cache.PageCache)를 넘기면 이미 처리한 페이지는 렌더링과 정규화를 건너뛴다.
+"""
+
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import torch
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from src.utils.disk_cache import sha256_file
+from src.docs_analysis.layoutlm.config import LAYOUTLM_RENDER_PAGES, LAYOUTLM_RENDER_THREADS, available_cpus
+from src.docs_analysis.layoutlm.page_cache import PageCache, image_processor_fingerprint, page_cache_key
+
+# 이미지 프로세서 설정을 알 수 없을 때의 렌더링 크기 (LayoutLMv3 입력 크기)
+DEFAULT_RENDER_SIZE = (224, 224)
+
+
+def pdf_page_count(pdf_path: str) -> int:
+    """PDF 페이지 수 (렌더링 없이 pdfinfo로 확인)"""
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def render_size(image_processor) -> Tuple[int, int]:
+    """이미지 프로세서가 리사이즈하는 (width, height)"""
+    size = getattr(image_processor, "size", None) or {}
+    if "height" in size and "width" in size:
+        return int(size["width"]), int(size["height"])
+    if "shortest_edge" in size:
+        return int(size["shortest_edge"]), int(size["shortest_edge"])
+    return DEFAULT_RENDER_SIZE
+
+
+def iter_page_pixels(
+    pdf_path: str,
+    num_pages: int,
+    image_processor,
+    batch_pages: int = LAYOUTLM_RENDER_PAGES,
+    thread_count: int = LAYOUTLM_RENDER_THREADS,
+    cache: Optional[PageCache] = None
+) -> Iterator[Tuple[int, torch.Tensor, List[float]]]:
+    """
+    페이지 0..num_pages-1을 batch_pages장씩 이미지 프로세서 입력 크기로 렌더링해 정규화
+
+    PDF 페이지가 num_pages보다 적으면 남은 페이지에는 마지막 PDF 페이지를 재사용한다 (이전 동작과 같음).
+    cache가 있으면 묶음의 페이지를 먼저 캐시에서 찾고, 없는 페이지가 속한 범위만 렌더링해 저장한다
+    (모두 적중하면 poppler를 호출하지 않음).
+
+    Yields:
+        (묶음 첫 페이지 인덱스, pixel_values (페이지 수, 3, H, W),
+         페이지별 처리 시간 ms — 묶음의 캐시 조회/렌더링/정규화 시간을 페이지 수로 나눈 값)
+    """
+    size = render_size(image_processor)
+    batch_pages = max(1, batch_pages)
+    if thread_count <= 0:
+        thread_count = available_cpus()
+
+    pdf_hash = sha256_file(pdf_path) if cache is not None else None
+    fingerprint = image_processor_fingerprint(image_processor) if cache is not None else None
+    pdf_pages: Optional[int] = None
+
+    def pdf_index(idx: int) -> int:
+        return idx if pdf_pages is None else min(idx, pdf_pages - 1)
+
+    for start in range(0, num_pages, batch_pages):
+        end = min(start + batch_pages, num_pages)
+        started = time.perf_counter()
+
+        arrays: List[Optional[np.ndarray]] = [None] * (end - start)
+        if cache is not None:
+            arrays = [cache.get(page_cache_key(pdf_hash, pdf_index(idx), size, fingerprint)) for idx in range(start, end)]
+        missing = [j for j, array in enumerate(arrays) if array is None]
+
+        if missing:
+            if pdf_pages is None:
+                pdf_pages = pdf_page_count(pdf_path)
+                if pdf_pages <= 0:
+                    raise ValueError(f"❌ PDF에 페이지가 없습니다: {pdf_path}")
+                if pdf_pages != num_pages:
+                    print(f"⚠️ 경고: PDF 페이지 수({pdf_pages})와 OCR 페이지 수({num_pages})가 다릅니다.")
+
+            targets = [pdf_index(start + j) for j in missing]
+            first, last = min(targets), max(targets)
+            images = convert_from_path(
+                pdf_path,
+                first_page=first + 1,
+                last_page=last + 1,
+                size=size,
+                # pdf2image는 범위를 스레드 수만큼 나눠 pdftoppm을 띄우므로 페이지 수보다 많을 필요 없음
+                thread_count=min(thread_count, last - first + 1),
+            )
+            pixels = image_processor(images, return_tensors="np")["pixel_values"]
+            for j, target in zip(missing, targets):
+                arrays[j] = pixels[target - first]
+            if cache is not None:
+                for offset, page_pixels in enumerate(pixels):
+                    cache.put(page_cache_key(pdf_hash, first + offset, size, fingerprint), page_pixels)
+
+        pixel_values = torch.from_numpy(np.stack(arrays))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        hits = end - start - len(missing)
+        print(f"  🖼️ 페이지 {start + 1}-{end} ({size[0]}x{size[1]}, 캐시 {hits}/{end - start}): "
+              f"{elapsed_ms:.0f}ms ({elapsed_ms / (end - start):.0f}ms/page)")
+        yield start, pixel_values, [elapsed_ms / (end - start)] * (end - start)
@@ -1,7 +1,8 @@
 import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence
 from src.docs_analysis.llm.gemini_client import GeminiAnalyst
+from src.docs_analysis.document_ai.token_table import TokenTable
 
 # 기본 필수 섹션 (LLM이 실패했을 때 사용)
 DEFAULT_REQUIRED_SECTIONS = {
@@ -55,27 +56,31 @@ def generate_voice_guide(text_len: int, duration: int) -> Dict:
         "pacing_advice": advice
     }
 
-def extract_slide_contents(docai_result: Dict, pages: List[Dict]) -> List[Dict]:
-    """각 슬라이드의 텍스트와 이미지 정보 추출"""
+def extract_slide_contents(
+    docai_result: Mapping,
+    pages: Sequence[Dict],
+    token_table: Optional[TokenTable] = None
+) -> List[Dict]:
+    """
+    각 슬라이드의 텍스트와 이미지 정보 추출 (토큰 테이블 기반)
+    (pages가 지연 로딩 Document의 페이지 뷰면 토큰 테이블을 만들 때 한 페이지씩 읽음)
+    """
     slides_data = []
     detected_sections = docai_result.get("detected_sections", [])
     section_map = {s['page']: s['section'] for s in detected_sections}
     
-    for idx, page in enumerate(pages):
+    if token_table is None:
+        token_table = TokenTable.from_document({"text": docai_result.get("text", ""), "pages": pages})
+    
+    for idx in range(token_table.num_pages):
         page_num = idx + 1
         section_type = section_map.get(page_num, "unknown")
         
         # 텍스트 추출
-        full_text = ""
-        for block in page.get("blocks", []):
-            layout = block.get("layout", {})
-            for segment in layout.get("textAnchor", {}).get("textSegments", []):
-                start = int(segment.get("startIndex", 0))
-                end = int(segment.get("endIndex", 0))
-                full_text += docai_result.get("text", "")[start:end]
+        full_text = token_table.page_text(idx)
         
         text_len = len(full_text)
-        image_count = len(page.get("image", []))
+        image_count = int(token_table.page_image_count[idx])
         
         est_duration = estimate_speech_duration(full_text)
         visual_analysis = analyze_visual_balance(text_len, image_count)
@@ -284,10 +289,11 @@ def merge_llm_feedback_to_slides(slides_data: List[Dict], slide_feedback: List[D
 
 # 🔥 메인 함수
 def export_final_json(
-    docai_result: Dict, 
+    docai_result: Mapping, 
     layoutlm_result: Dict, 
     output_path: str,
-    pitch_strategy: Optional[Dict] = None
+    pitch_strategy: Optional[Dict] = None,
+    token_table: Optional[TokenTable] = None
 ) -> Dict:
     """
     [V4 - LLM Powered] Gemini를 활용한 범용 문서 분석 시스템
@@ -304,7 +310,7 @@ def export_final_json(
     doc_type = layoutlm_result.get("doc_type", "unknown")
     
     # 3. 슬라이드별 기본 정보 추출
-    slides_data = extract_slide_contents(docai_result, pages)
+    slides_data = extract_slide_contents(docai_result, pages, token_table)
     
     # 4. 🔥 Gemini로 심층 분석
     llm_analysis = analyze_with_gemini(gemini, slides_data, pitch_strategy, doc_type)
@@ -340,6 +346,7 @@ def export_final_json(
             "pitch_strategy": strategy_info,
             "total_slides": len(slides_data),
             "total_duration_est": total_duration,
+            "number_summary": docai_result.get("number_summary", {}),
             "analysis_method": "LLM-Powered (Gemini)" if gemini.model else "Rule-Based"
         },
         "diagnosis": llm_analysis.get("diagnosis", {}),
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+def sha256_bytes(data: bytes) -> str:
+    """바이트 내용의 SHA-256 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str, block_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 해시 (블록 단위로 읽음)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 깨진 파일이 남지 않도록 저장"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class DiskLRUCache:
+    """
+    키 → 바이트를 디렉토리에 저장하는 크기 제한 LRU 캐시
+
+    - 항목은 root/<key 앞 2글자>/<key><suffix> 에 원자적으로 저장
+    - 조회 시 mtime을 갱신해 최근 사용 순서를 기록
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    - 여러 스레드에서 동시에 사용해도 안전
+
+    열 때 한 번 디렉토리를 훑어 (경로 → (마지막 사용 시각, 크기)) LRU 인덱스와 전체 크기를 만들고,
+    저장/적중 시 인덱스만 갱신한다. 디렉토리는 전체 크기가 max_bytes를 넘을 때만 다시 훑어
+    (다른 프로세스가 같은 디렉토리에 쓴 항목까지 반영) 오래된 항목을 지운다.
+    사용 시각은 파일 mtime과 이 프로세스가 기록한 시각 중 늦은 값 (mtime 해상도가 낮아도 순서 유지).
+    """
+
+    def __init__(self, root: str, max_bytes: int, suffix: str = ""):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()  # 오래 사용하지 않은 순
+        self._total = 0
+        with self._lock:
+            self._scan_locked()
+
+    def _scan_locked(self):
+        """디렉토리를 훑어 사용 시각 순 인덱스와 전체 크기를 다시 만듦"""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                known = self._index.get(path)
+                used = max(st.st_mtime, known[0]) if known else st.st_mtime
+                entries.append((used, path, st.st_size))
+        entries.sort()
+        self._index = OrderedDict((path, (used, size)) for used, path, size in entries)
+        self._total = sum(size for _, size in self._index.values())
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}{self.suffix}")
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def touch(self, key: str) -> Optional[str]:
+        """항목이 있으면 사용 기록을 갱신하고 경로 반환 (적중/실패 카운트 반영)"""
+        path = self.path_for(key)
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self._total -= self._index.pop(path, (0, 0))[1]
+            return None
+        with self._lock:
+            self.hits += 1
+            if path in self._index:
+                self._index[path] = (time.time(), self._index[path][1])
+                self._index.move_to_end(path)
+            else:
+                # 다른 프로세스가 저장한 항목
+                try:
+                    size = os.path.getsize(path)
+                except FileNotFoundError:
+                    size = None
+                if size is not None:
+                    self._index[path] = (time.time(), size)
+                    self._total += size
+        return path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        path = self.touch(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # 조회 직후 다른 스레드가 삭제한 경우
+            return None
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        path = self.path_for(key)
+        atomic_write_bytes(path, data)
+        with self._lock:
+            self._total += len(data) - self._index.pop(path, (0, 0))[1]
+            self._index[path] = (time.time(), len(data))
+        self.evict()
+        return path
+
+    def evict(self):
+        """max_bytes 이하가 될 때까지 오래된 항목 삭제 (넘었을 때만 디렉토리를 다시 훑음)"""
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return
+            self._scan_locked()
+
+            while self._total > self.max_bytes and self._index:
+                path, (_, size) = self._index.popitem(last=False)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                self._total -= size
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
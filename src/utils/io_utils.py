@@ -1,5 +1,55 @@
+"""
+파일 입출력 유틸 + 파이프라인 중간 산출물(artifact) 코덱
+
+OCR 결과/청크 결과/병합 결과/캐시 항목 같은 중간 산출물은 사람이 읽을 일보다
+다음 단계가 다시 읽는 일이 훨씬 많다. indent=2 JSON은 C 인코더를 쓰지 못해 느리고
+공백 때문에 크기도 커서, 산출물은 코덱(json / msgpack) + 압축(none / gzip / zstd)으로 저장한다.
+
+파일 형식: 7바이트 헤더(b"PKAF" + 버전 + 코덱 id + 압축 id) + (압축된) 본문
+단, 기본값(json + 압축 없음)은 헤더 없이 그대로 JSON으로 저장해 .json 산출물을 외부 도구로도 읽을 수 있게 한다.
+읽을 때는 헤더로 형식을 판별하고, 헤더가 없으면 JSON 파일(또는 gzip JSON)로 읽는다.
+
+큰 문서는 샤드 형식(b"PKAS")으로도 저장할 수 있다. {key: [항목...], 나머지 키}를
+항목마다 별도 레코드로 기록해 항목 하나만 읽거나 나머지 키(헤더)만 읽을 수 있다 (ShardedArtifact).
+샤드 파일은 JSON이 아니므로 확장자 .pkas를 쓴다 (shard_artifact_path).
+
+기본 형식은 환경 변수로 정함 (호출 시점에 읽으므로 .env 로드 순서와 무관)
+- ARTIFACT_FORMAT: json(기본) / msgpack
+- ARTIFACT_COMPRESSION: none(기본) / gzip / zstd
+"""
+
+import gzip
+import io
 import json
 import os
+import struct
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # msgpack 형식을 쓰지 않으면 필요 없음
+    msgpack = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # zstd 압축을 쓰지 않으면 필요 없음
+    zstandard = None
+
+ARTIFACT_MAGIC = b"PKAF"
+ARTIFACT_VERSION = 1
+_HEADER = struct.Struct(">4sBBB")
+
+SHARD_MAGIC = b"PKAS"
+SHARD_EXTENSION = ".pkas"
+# 샤드 파일 끝: 색인 레코드 오프셋 + 매직
+_SHARD_FOOTER = struct.Struct(">Q4s")
+
+ARTIFACT_CODECS = {"json": 1, "msgpack": 2}
+ARTIFACT_COMPRESSIONS = {"none": 0, "gzip": 1, "zstd": 2}
+
+GZIP_LEVEL = 3
+ZSTD_LEVEL = 3
 
 
 def read_bytes(path: str) -> bytes:
@@ -9,8 +59,8 @@ def read_bytes(path: str) -> bytes:
 
 
 def save_json(data, path: str):
-    """JSON 파일 저장"""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    """사람이 읽는 JSON 파일 저장 (최종 결과물용, 중간 산출물은 save_artifact 사용)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
@@ -19,3 +69,237 @@ def read_json(path: str):
     """JSON 파일 읽기"""
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
+
+
+# ----------------------------------------------------------------------
+# 코덱 / 압축
+# ----------------------------------------------------------------------
+def _resolve(fmt: Optional[str], compression: Optional[str]):
+    fmt = fmt or os.getenv("ARTIFACT_FORMAT", "json")
+    compression = compression or os.getenv("ARTIFACT_COMPRESSION", "none")
+    if fmt not in ARTIFACT_CODECS:
+        raise ValueError(f"❌ 알 수 없는 산출물 형식: {fmt} (사용 가능: {', '.join(ARTIFACT_CODECS)})")
+    if compression not in ARTIFACT_COMPRESSIONS:
+        raise ValueError(f"❌ 알 수 없는 압축 방식: {compression} (사용 가능: {', '.join(ARTIFACT_COMPRESSIONS)})")
+    if fmt == "msgpack" and msgpack is None:
+        raise ImportError("❌ msgpack 형식을 쓰려면 msgpack 패키지가 필요합니다 (pip install msgpack)")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("❌ zstd 압축을 쓰려면 zstandard 패키지가 필요합니다 (pip install zstandard)")
+    return fmt, compression
+
+
+def _encode(data, fmt: str) -> bytes:
+    if fmt == "msgpack":
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(body: bytes, fmt: str):
+    if fmt == "msgpack":
+        if msgpack is None:
+            raise ImportError("❌ msgpack 산출물을 읽으려면 msgpack 패키지가 필요합니다 (pip install msgpack)")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    return json.loads(body)
+
+
+def _compressor(raw, compression: str):
+    """raw 파일 객체 위에 압축 스트림을 씌움 (none이면 그대로)"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return None
+
+
+def _decompress(body: bytes, compression: str) -> bytes:
+    if compression == "gzip":
+        return gzip.decompress(body)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("❌ zstd 산출물을 읽으려면 zstandard 패키지가 필요합니다 (pip install zstandard)")
+        # 스트림으로 쓴 프레임은 원본 크기가 헤더에 없으므로 스트림으로 읽음
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)) as reader:
+            return reader.read()
+    return body
+
+
+def encode_artifact(data, fmt: Optional[str] = None, compression: Optional[str] = None) -> bytes:
+    """데이터 → 산출물 바이트 (json + 압축 없음이면 헤더 없는 JSON, 그 외에는 헤더 포함)"""
+    fmt, compression = _resolve(fmt, compression)
+    if fmt == "json" and compression == "none":
+        return _encode(data, fmt)
+    raw = io.BytesIO()
+    raw.write(_HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, ARTIFACT_CODECS[fmt], ARTIFACT_COMPRESSIONS[compression]))
+    body = _encode(data, fmt)
+    stream = _compressor(raw, compression)
+    if stream is None:
+        raw.write(body)
+    else:
+        with stream:
+            stream.write(body)
+    return raw.getvalue()
+
+
+def decode_artifact(data: bytes):
+    """산출물 바이트 → 데이터 (헤더가 없으면 기존 JSON / gzip JSON으로 처리)"""
+    if data[:4] != ARTIFACT_MAGIC:
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    _, version, codec_id, compression_id = _HEADER.unpack_from(data)
+    if version > ARTIFACT_VERSION:
+        raise ValueError(f"❌ 지원하지 않는 산출물 버전: {version}")
+    fmt = next(name for name, i in ARTIFACT_CODECS.items() if i == codec_id)
+    compression = next(name for name, i in ARTIFACT_COMPRESSIONS.items() if i == compression_id)
+    return _decode(_decompress(data[_HEADER.size:], compression), fmt)
+
+
+def artifact_format(path: str) -> Dict[str, str]:
+    """파일 헤더만 읽어 {format, compression} 반환 (헤더 없는 파일은 json/none 또는 json/gzip, 샤드는 첫 레코드 기준)"""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        if head[:4] == SHARD_MAGIC:
+            f.seek(len(SHARD_MAGIC) + 1)
+            head = f.read(_HEADER.size)
+    if head[:4] != ARTIFACT_MAGIC:
+        return {"format": "json", "compression": "gzip" if head[:2] == b"\x1f\x8b" else "none"}
+    _, _, codec_id, compression_id = _HEADER.unpack(head)
+    return {
+        "format": next(name for name, i in ARTIFACT_CODECS.items() if i == codec_id),
+        "compression": next(name for name, i in ARTIFACT_COMPRESSIONS.items() if i == compression_id),
+    }
+
+
+# ----------------------------------------------------------------------
+# 파일 저장 / 읽기
+# ----------------------------------------------------------------------
+def _atomic_write(path: str, write: Callable):
+    """임시 파일에 write(f)로 쓴 뒤 교체 (중간에 끊겨도 깨진 산출물이 남지 않도록)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_artifact(data, path: str, fmt: Optional[str] = None, compression: Optional[str] = None) -> int:
+    """
+    중간 산출물 저장 (헤더 + 코덱 + 압축, 원자적 교체, 기본 형식은 헤더 없는 JSON)
+
+    Returns:
+        저장한 파일 크기(바이트)
+    """
+    payload = encode_artifact(data, fmt, compression)
+    _atomic_write(path, lambda f: f.write(payload))
+    return len(payload)
+
+
+def read_artifact(path: str):
+    """중간 산출물 읽기 (형식 자동 판별, 기존 JSON 파일도 그대로 읽음, 샤드 파일은 전체를 dict로 복원)"""
+    if is_sharded_artifact(path):
+        return ShardedArtifact(path).to_dict()
+    return decode_artifact(read_bytes(path))
+
+
+# ----------------------------------------------------------------------
+# 샤드 형식 (항목 단위로 읽을 수 있는 큰 산출물)
+# ----------------------------------------------------------------------
+def shard_artifact_path(path: str) -> str:
+    """같은 이름의 샤드 산출물 경로 (확장자를 .pkas로 바꿈)"""
+    return f"{os.path.splitext(path)[0]}{SHARD_EXTENSION}"
+
+
+def is_sharded_artifact(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(SHARD_MAGIC)) == SHARD_MAGIC
+
+
+def save_artifact_shards(
+    path: str,
+    key: str,
+    items: Iterable,
+    tail: Callable[[], Dict],
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None
+) -> int:
+    """
+    {key: [items...], **tail()} 형태의 큰 산출물을 항목별 레코드로 나눠 저장
+
+    항목을 하나씩 인코딩해 바로 기록하므로 메모리는 항목 1개 분량만 쓴다.
+    items를 모두 소비한 뒤 tail()을 호출하므로, 항목을 순회하면서 집계한 값을 tail에 담을 수 있다.
+
+    파일: b"PKAS" + 버전 | 항목 레코드... | 헤더 레코드(tail) | 색인 레코드 | 색인 오프셋 + b"PKAS"
+    각 레코드는 encode_artifact 바이트라 레코드마다 형식/압축을 판별해 읽는다.
+
+    Returns:
+        저장한 파일 크기(바이트)
+    """
+    fmt, compression = _resolve(fmt, compression)
+
+    def _write(f):
+        f.write(SHARD_MAGIC + bytes([ARTIFACT_VERSION]))
+        offsets = []
+        for item in items:
+            offsets.append(f.tell())
+            f.write(encode_artifact(item, fmt, compression))
+        header_offset = f.tell()
+        f.write(encode_artifact(tail(), fmt, compression))
+        index_offset = f.tell()
+        f.write(encode_artifact({"key": key, "items": offsets, "header": header_offset}, "json", "none"))
+        f.write(_SHARD_FOOTER.pack(index_offset, SHARD_MAGIC))
+
+    _atomic_write(path, _write)
+    return os.path.getsize(path)
+
+
+class ShardedArtifact:
+    """
+    샤드 파일 읽기 (색인과 헤더만 메모리에 두고 항목은 요청할 때마다 파일에서 읽음)
+
+    읽은 항목을 보관하지 않으므로 항목을 하나씩 순회하면 메모리는 항목 1개 분량만 쓴다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            f.seek(-_SHARD_FOOTER.size, os.SEEK_END)
+            footer_offset = f.tell()
+            index_offset, magic = _SHARD_FOOTER.unpack(f.read(_SHARD_FOOTER.size))
+            if magic != SHARD_MAGIC:
+                raise ValueError(f"❌ 샤드 산출물이 아니거나 손상됨: {path}")
+            f.seek(index_offset)
+            index = decode_artifact(f.read(footer_offset - index_offset))
+
+        self.key = index["key"]
+        # 레코드 i는 [bounds[i], bounds[i + 1]) (마지막 레코드는 헤더)
+        self._bounds: List[int] = index["items"] + [index["header"], index_offset]
+        self.header = self._read_record(len(self))
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 2
+
+    def _read_record(self, i: int):
+        start, end = self._bounds[i], self._bounds[i + 1]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return decode_artifact(f.read(end - start))
+
+    def read_item(self, i: int):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return self._read_record(i % len(self))
+
+    def iter_items(self):
+        for i in range(len(self)):
+            yield self._read_record(i)
+
+    def to_dict(self) -> Dict:
+        """전체를 메모리에 복원 ({key: [...], **header})"""
+        return {self.key: list(self.iter_items()), **self.header}
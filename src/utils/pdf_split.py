@@ -1,7 +1,174 @@
 # src/utils/pdf_split.py
+import io
 import os
 from PyPDF2 import PdfReader, PdfWriter
-from typing import List
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+def count_pdf_pages(input_pdf: str) -> int:
+    """PDF 페이지 수"""
+    return len(PdfReader(input_pdf).pages)
+
+
+def chunk_page_ranges(total_pages: int, chunk_size: int = 15) -> List[Tuple[int, int]]:
+    """
+    페이지를 chunk_size 단위로 나눈 구간 리스트.
+    반환값: [(start, end), ...] (0부터 시작, end는 포함하지 않음)
+    """
+    return [
+        (start, min(start + chunk_size, total_pages))
+        for start in range(0, total_pages, chunk_size)
+    ]
+
+
+# 페이지 리소스를 따라갈 때 다른 페이지/문서 구조로 번지는 키는 제외
+_SKIP_KEYS = {"/Parent", "/P", "/B", "/Dest", "/Prev", "/Next", "/First", "/Last"}
+
+# 스트림이 아닌 객체와 객체 헤더의 대략적인 크기
+_OBJECT_OVERHEAD = 64
+
+# 청크 PDF 하나의 고정 오버헤드 (헤더, 카탈로그, xref, trailer)
+_PDF_OVERHEAD = 1024
+
+
+def measure_page_objects(input_pdf: str) -> List[Dict[Tuple[int, int], int]]:
+    """
+    페이지별로 참조하는 간접 객체(콘텐츠 스트림, 이미지, 폰트 등)와 그 바이트 크기.
+    여러 페이지가 공유하는 폰트/이미지는 같은 객체 id로 나타나므로
+    청크 크기를 계산할 때 한 번만 셀 수 있음
+    """
+    reader = PdfReader(input_pdf)
+    pages = []
+
+    for page in reader.pages:
+        sizes: Dict[Tuple[int, int], int] = {}
+        stack = [page]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, IndirectObject):
+                key = (obj.idnum, obj.generation)
+                if key in sizes:
+                    continue
+                resolved = obj.get_object()
+                data = getattr(resolved, "_data", None) if isinstance(resolved, StreamObject) else None
+                sizes[key] = (len(data) if data else 0) + _OBJECT_OVERHEAD
+                stack.append(resolved)
+            elif isinstance(obj, DictionaryObject):
+                stack.extend(v for k, v in obj.items() if k not in _SKIP_KEYS)
+            elif isinstance(obj, ArrayObject):
+                stack.extend(obj)
+        pages.append(sizes)
+
+    return pages
+
+
+def plan_chunks(
+    page_objects: Sequence[Dict[Tuple[int, int], int]],
+    max_pages: int,
+    max_bytes: int,
+    uploaded: Optional[Sequence[bool]] = None
+) -> List[Dict]:
+    """
+    페이지 순서를 유지하면서 요청 한도(페이지 수, 바이트) 안에서 페이지를 최대한 채워 담는 청크 계획.
+    청크 크기 = 청크 안 페이지들이 참조하는 객체 합집합의 크기 (공유 리소스는 한 번만 계산).
+    순서를 유지하는 구간 분할에서는 탐욕적으로 채우는 것이 요청 수를 최소화함.
+    한 페이지만으로 max_bytes를 넘으면 그 페이지 단독 청크로 두고 oversized로 표시.
+    uploaded[i]가 False인 페이지(로컬 처리 페이지)는 업로드하지 않으므로 한도에 포함하지 않음.
+
+    반환값: [{"start_page": 0, "end_page": 12, "pages": 12, "local_pages": 0,
+              "bytes": 1234567, "oversized": False}, ...]
+    """
+    plan = []
+    start = 0
+    total_pages = len(page_objects)
+    if uploaded is None:
+        uploaded = [True] * total_pages
+
+    while start < total_pages:
+        end = start
+        count = 0
+        seen: Dict[Tuple[int, int], int] = {}
+        size = 0
+        while end < total_pages:
+            if uploaded[end]:
+                if count >= max_pages:
+                    break
+                added = sum(v for k, v in page_objects[end].items() if k not in seen)
+                if count and _PDF_OVERHEAD + size + added > max_bytes:
+                    break
+                seen.update(page_objects[end])
+                size += added
+                count += 1
+            end += 1
+
+        size = _PDF_OVERHEAD + size if count else 0
+        plan.append({
+            "start_page": start,
+            "end_page": end,
+            "pages": count,
+            "local_pages": end - start - count,
+            "bytes": size,
+            "oversized": size > max_bytes,
+        })
+        start = end
+
+    return plan
+
+
+def plan_pdf_chunks(
+    input_pdf: str,
+    max_pages: int,
+    max_bytes: int,
+    pages: Optional[Sequence[int]] = None,
+    local_pages: Optional[Set[int]] = None
+) -> List[Dict]:
+    """
+    PDF의 페이지별 리소스 크기를 측정해 청크 계획 생성.
+    pages(원본 페이지 인덱스, 오름차순)를 주면 그 페이지들만 청크로 묶음 (중복 제거 후 고유 페이지 등).
+    local_pages(원본 페이지 인덱스)는 업로드하지 않는 페이지로 보고 요청 한도에서 제외.
+    각 청크의 page_indices = 청크에 담을 원본 페이지,
+    start_page/end_page = 청크가 대표하는 원본 페이지 구간 (다음 청크 첫 페이지 전까지)
+    """
+    page_objects = measure_page_objects(input_pdf)
+    total_pages = len(page_objects)
+    if pages is None:
+        pages = list(range(total_pages))
+    local_pages = local_pages or set()
+
+    plan = plan_chunks(
+        [page_objects[i] for i in pages],
+        max_pages,
+        max_bytes,
+        uploaded=[i not in local_pages for i in pages],
+    )
+    for chunk in plan:
+        start, end = chunk["start_page"], chunk["end_page"]
+        chunk["page_indices"] = list(pages[start:end])
+        chunk["start_page"] = pages[start]
+        chunk["end_page"] = pages[end] if end < len(pages) else total_pages
+    return plan
+
+
+def print_chunk_plan(plan: List[Dict], max_pages: int, max_bytes: int):
+    """API 호출 전에 청크 계획 출력"""
+    total_pages = sum(c["pages"] for c in plan)
+    total_bytes = sum(c["bytes"] for c in plan)
+    requests = sum(1 for c in plan if c["pages"])
+    print(f"  📐 청크 계획: {total_pages}페이지 → {requests}개 요청 "
+          f"(한도 {max_pages}페이지 / {max_bytes / 1024 ** 2:.1f}MB, 총 {total_bytes / 1024 ** 2:.1f}MB)")
+    for idx, chunk in enumerate(plan, 1):
+        warn = " ⚠️ 한도 초과 페이지" if chunk["oversized"] else ""
+        local = f" + 텍스트 레이어 {chunk['local_pages']}페이지" if chunk.get("local_pages") else ""
+        print(f"     - 청크 {idx}: p{chunk['start_page'] + 1}-{chunk['end_page']} "
+              f"({chunk['pages']}페이지, {chunk['bytes'] / 1024:.0f}KB{local}){warn}")
+
+
+def chunk_file_name(input_pdf: str, part: int) -> str:
+    """청크 파일명 형식: 원본파일명_chunk_1.pdf"""
+    base_name = os.path.splitext(os.path.basename(input_pdf))[0]
+    return f"{base_name}_chunk_{part}.pdf"
+
 
 def split_pdf(input_pdf: str, output_dir: str, chunk_size: int = 15) -> List[str]:
     """
@@ -11,34 +178,53 @@ def split_pdf(input_pdf: str, output_dir: str, chunk_size: int = 15) -> List[str
     if not os.path.exists(input_pdf):
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_pdf}")
 
-    reader = PdfReader(input_pdf)
-    total_pages = len(reader.pages)
-
     os.makedirs(output_dir, exist_ok=True)
+    ranges = chunk_page_ranges(count_pdf_pages(input_pdf), chunk_size)
+
     chunks = []
+    for part, _ in iter_pdf_chunks(
+        input_pdf,
+        [(part, range(start, end)) for part, (start, end) in enumerate(ranges, 1)],
+        keep_dir=output_dir,
+    ):
+        chunks.append(os.path.join(output_dir, chunk_file_name(input_pdf, part)))
 
-    start = 0
-    part = 1
-    
-    # 원본 파일명 가져오기 (확장자 제외)
-    base_name = os.path.splitext(os.path.basename(input_pdf))[0]
+    return chunks
 
-    while start < total_pages:
-        end = min(start + chunk_size, total_pages)
 
+def iter_pdf_chunks(
+    input_pdf: str,
+    chunks: Sequence[Tuple[int, Sequence[int]]],
+    keep_dir: Optional[str] = None
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    PDF를 디스크에 쓰지 않고 메모리에서 청크별로 분할하여 하나씩 생성.
+    제너레이터이므로 다음 청크는 꺼낼 때 만들어짐 → 앞 청크 업로드와 겹쳐서 실행 가능
+
+    Args:
+        chunks: [(청크 번호, 페이지 인덱스 목록), ...] (페이지는 0부터, 연속하지 않아도 됨)
+        keep_dir: 지정하면 디버깅용으로 청크 PDF도 저장 (원본파일명_chunk_N.pdf)
+
+    반환값: (청크 번호, 청크 PDF bytes)
+    """
+    if not os.path.exists(input_pdf):
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {input_pdf}")
+
+    reader = PdfReader(input_pdf)
+    if keep_dir:
+        os.makedirs(keep_dir, exist_ok=True)
+
+    for part, page_indices in chunks:
         writer = PdfWriter()
-        for i in range(start, end):
+        for i in page_indices:
             writer.add_page(reader.pages[i])
 
-        # 파일명 형식: 원본파일명_chunk_1.pdf
-        chunk_filename = f"{base_name}_chunk_{part}.pdf"
-        chunk_path = os.path.join(output_dir, chunk_filename)
-        
-        with open(chunk_path, "wb") as f:
-            writer.write(f)
+        with io.BytesIO() as buffer:
+            writer.write(buffer)
+            data = buffer.getvalue()
 
-        chunks.append(chunk_path)
-        start = end
-        part += 1
+        if keep_dir:
+            with open(os.path.join(keep_dir, chunk_file_name(input_pdf, part)), "wb") as f:
+                f.write(data)
 
-    return chunks
\ No newline at end of file
+        yield part, data